@@ -1,13 +1,28 @@
 # mock_exam_simulator/app.py
 import tkinter as tk
-from tkinter import filedialog, messagebox, Toplevel, ttk
+from tkinter import filedialog, messagebox, simpledialog, Toplevel, ttk
+import getpass
 import platform
+import random
 from typing import Optional
 from .ui.ui_manager import UIManager
-from .core.question_bank import QuestionBank
-from .core.exam_state import ExamState
+from .ui.feedback_window import FeedbackWindow
+from .core.question_bank import PHASE_DUPLICATES, PHASE_INDEX, QuestionBank, ImportProgress
+from .core.blueprint import blueprint_from_config
+from .core.background_import import BackgroundImport, EVENT_PROGRESS, EVENT_DONE, EVENT_DUPLICATES, EVENT_ERROR
+from .core.exam_descriptor import ExamDescriptor, create_exam, regenerate
+from .core.dedup import duplicate_summary
+from .core.session import MODE_ADAPTIVE, MODE_EXAM, MODE_PRACTICE, MODE_WEAKNESS, ExamSession
+from .core.adaptive import AdaptiveSession
+from .core.attempt_history import AttemptHistory
+from .core.irt import ItemPool, item_pool
+from .core.spaced_repetition import SpacedRepetition
+from .core.weakness import WeaknessModel
 from .core.translator import Translator
-from .config.config_loader import load_config
+from .core.errors import ConfigError, ConfigNotFoundError, ExamEngineError, HistoryError, QuestionImportError, \
+    SessionError, TranslationError
+from .core.scoring import ExamResult, VIEW_INCORRECT, VIEW_FLAGGED, VIEW_FLAGGED_AND_INCORRECT
+from .config.config_loader import default_config, load_config
 try:
     if platform.system() == "Darwin":
         from tkmacosx import Button as MacButton
@@ -16,21 +31,45 @@ try:
 except ImportError:
     MacButton = None
 
+IMPORT_POLL_MS = 100
+MAX_REJECTIONS_SHOWN = 10
+MAX_SEARCH_RESULTS = 50
+
 class MockExamApp:
     def __init__(self, root: tk.Tk):
         self.root = root
-        self.config = load_config()
+        self.config = self.load_config()
         self.is_macos = platform.system() == "Darwin" and MacButton is not None
         self.ui = UIManager(root, self.config)
         self.question_bank = QuestionBank()
-        self.exam_state = ExamState(self.config)
-        self.translator = Translator(
-            source_lang=self.config['translator']['from_lang'], 
-            target_lang=self.config['translator']['to_lang'])
+        self.background_import: Optional[BackgroundImport] = None
+        self.session: Optional[ExamSession] = None
+        self.timer_id: Optional[str] = None
+        self.history: Optional[AttemptHistory] = None
+        self.spaced_repetition: Optional[SpacedRepetition] = None
+        self.weakness: Optional[WeaknessModel] = None
+        self.item_pool: Optional[ItemPool] = None
+        try:
+            self.translator = Translator(
+                source_lang=self.config['translator']['from_lang'], 
+                target_lang=self.config['translator']['to_lang'])
+        except TranslationError as e:
+            messagebox.showerror("Error", str(e))
+            raise
         self.setup_controls()
         self.root.bind("<<UpdateQuestionDisplay>>", lambda e: self.display_question())
         self.root.bind("<<TranslateQuestion>>", self.handle_translate_question)
 
+    def load_config(self):
+        try:
+            return load_config()
+        except ConfigNotFoundError as e:
+            messagebox.showerror("Error", str(e))
+            return default_config()
+        except ConfigError as e:
+            messagebox.showerror("Error", str(e))
+            raise
+
     def setup_controls(self):
         style_config = self.config['styles']
         
@@ -71,6 +110,135 @@ class MockExamApp:
                                          command=self.start_exam, 
                                          state="disabled")
         self.start_button.pack(pady=10)
+
+        if self.is_macos:
+            self.practice_button = MacButton(self.ui.main_frame, 
+                                           text="Start Practice (Spaced Repetition)",
+                                           command=lambda: self.start_exam(MODE_PRACTICE),
+                                           state="disabled",
+                                           font=tuple(style_config['button']['font']),
+                                           background=style_config['button']['default_background'],
+                                           foreground=style_config['button']['default_foreground'],
+                                           activebackground=style_config['button']['active_background'],
+                                           activeforeground=style_config['button']['active_foreground'],
+                                           disabledbackground=style_config['button']['disabled_background'],
+                                           disabledforeground=style_config['button']['disabled_foreground'],
+                                           borderwidth=style_config['button']['borderwidth'],
+                                           relief=style_config['button']['relief'])
+        else:
+            self.practice_button = ttk.Button(self.ui.main_frame, 
+                                            text="Start Practice (Spaced Repetition)", 
+                                            command=lambda: self.start_exam(MODE_PRACTICE), 
+                                            state="disabled")
+        self.practice_button.pack(pady=10)
+
+        if self.is_macos:
+            self.weakness_button = MacButton(self.ui.main_frame, 
+                                           text="Start Weakness Exam",
+                                           command=lambda: self.start_exam(MODE_WEAKNESS),
+                                           state="disabled",
+                                           font=tuple(style_config['button']['font']),
+                                           background=style_config['button']['default_background'],
+                                           foreground=style_config['button']['default_foreground'],
+                                           activebackground=style_config['button']['active_background'],
+                                           activeforeground=style_config['button']['active_foreground'],
+                                           disabledbackground=style_config['button']['disabled_background'],
+                                           disabledforeground=style_config['button']['disabled_foreground'],
+                                           borderwidth=style_config['button']['borderwidth'],
+                                           relief=style_config['button']['relief'])
+        else:
+            self.weakness_button = ttk.Button(self.ui.main_frame, 
+                                            text="Start Weakness Exam", 
+                                            command=lambda: self.start_exam(MODE_WEAKNESS), 
+                                            state="disabled")
+        self.weakness_button.pack(pady=10)
+
+        if self.is_macos:
+            self.adaptive_button = MacButton(self.ui.main_frame, 
+                                           text="Start Adaptive Exam",
+                                           command=lambda: self.start_exam(MODE_ADAPTIVE),
+                                           state="disabled",
+                                           font=tuple(style_config['button']['font']),
+                                           background=style_config['button']['default_background'],
+                                           foreground=style_config['button']['default_foreground'],
+                                           activebackground=style_config['button']['active_background'],
+                                           activeforeground=style_config['button']['active_foreground'],
+                                           disabledbackground=style_config['button']['disabled_background'],
+                                           disabledforeground=style_config['button']['disabled_foreground'],
+                                           borderwidth=style_config['button']['borderwidth'],
+                                           relief=style_config['button']['relief'])
+        else:
+            self.adaptive_button = ttk.Button(self.ui.main_frame, 
+                                            text="Start Adaptive Exam", 
+                                            command=lambda: self.start_exam(MODE_ADAPTIVE), 
+                                            state="disabled")
+        self.adaptive_button.pack(pady=10)
+
+        if self.is_macos:
+            self.code_button = MacButton(self.ui.main_frame, 
+                                           text="Start Exam from Code",
+                                           command=self.start_exam_from_code,
+                                           state="disabled",
+                                           font=tuple(style_config['button']['font']),
+                                           background=style_config['button']['default_background'],
+                                           foreground=style_config['button']['default_foreground'],
+                                           activebackground=style_config['button']['active_background'],
+                                           activeforeground=style_config['button']['active_foreground'],
+                                           disabledbackground=style_config['button']['disabled_background'],
+                                           disabledforeground=style_config['button']['disabled_foreground'],
+                                           borderwidth=style_config['button']['borderwidth'],
+                                           relief=style_config['button']['relief'])
+        else:
+            self.code_button = ttk.Button(self.ui.main_frame, 
+                                            text="Start Exam from Code", 
+                                            command=self.start_exam_from_code, 
+                                            state="disabled")
+        self.code_button.pack(pady=10)
+
+        self.search_frame = tk.Frame(self.ui.main_frame, bg=self.config['window']['background'])
+        self.search_entry = ttk.Entry(self.search_frame, width=40, font=("Segoe UI", 12))
+        self.search_entry.pack(side="left", padx=10)
+        self.search_entry.bind("<Return>", lambda e: self.search_questions())
+        if self.is_macos:
+            self.search_button = MacButton(self.search_frame, 
+                                         text="Search Questions",
+                                         command=self.search_questions,
+                                         font=tuple(style_config['button']['font']),
+                                         background=style_config['button']['default_background'],
+                                         foreground=style_config['button']['default_foreground'],
+                                         activebackground=style_config['button']['active_background'],
+                                         activeforeground=style_config['button']['active_foreground'],
+                                         borderwidth=style_config['button']['borderwidth'],
+                                         relief=style_config['button']['relief'])
+        else:
+            self.search_button = ttk.Button(self.search_frame, 
+                                          text="Search Questions", 
+                                          command=self.search_questions)
+        self.search_button.pack(side="left", padx=10)
+        self.search_frame.pack(pady=10)
+
+        self.import_frame = tk.Frame(self.ui.main_frame, bg=self.config['window']['background'])
+        self.import_progress = ttk.Progressbar(self.import_frame, orient="horizontal", mode="determinate", length=300)
+        self.import_progress.pack(side="left", padx=10)
+        self.import_status_label = tk.Label(self.import_frame, text="", font=("Segoe UI", 11),
+                                            bg=self.config['window']['background'], fg="#2d2d2d")
+        self.import_status_label.pack(side="left", padx=10)
+        if self.is_macos:
+            self.cancel_import_button = MacButton(self.import_frame, 
+                                                text="Cancel",
+                                                command=self.cancel_import,
+                                                font=tuple(style_config['button']['font']),
+                                                background=style_config['button']['default_background'],
+                                                foreground=style_config['button']['default_foreground'],
+                                                activebackground=style_config['button']['active_background'],
+                                                activeforeground=style_config['button']['active_foreground'],
+                                                borderwidth=style_config['button']['borderwidth'],
+                                                relief=style_config['button']['relief'])
+        else:
+            self.cancel_import_button = ttk.Button(self.import_frame, 
+                                                 text="Cancel", 
+                                                 command=self.cancel_import)
+        self.cancel_import_button.pack(side="left", padx=10)
         
         self.button_frame = tk.Frame(self.ui.quiz_frame, bg=self.config['window']['background'])
         self.button_frame.pack(pady=20, side="bottom")
@@ -223,12 +391,146 @@ class MockExamApp:
         self.submit_button.pack(side="left", padx=8)
 
     def import_questions(self):
-        file_path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv")])
-        if file_path and self.question_bank.load_from_csv(file_path):
-            messagebox.showinfo("Success", f"Imported {len(self.question_bank.questions)} questions!")
-            self.start_button.config(state="normal")
+        if self.background_import and self.background_import.running:
+            return
+        file_paths = filedialog.askopenfilenames(filetypes=[("Question files", "*.csv *.bank"),
+                                                            ("CSV files", "*.csv"),
+                                                            ("Compiled banks", "*.bank")])
+        if not file_paths:
+            return
+        self.background_import = BackgroundImport(file_paths, self.config['duplicates']['mode'],
+                                                  self.config['duplicates']['threshold'])
+        self.import_button.config(state="disabled")
+        self.set_exam_buttons_state("disabled")
+        self.import_progress["value"] = 0
+        self.import_status_label.config(text="Reading questions...")
+        self.import_frame.pack(pady=10)
+        self.background_import.start()
+        self.root.after(IMPORT_POLL_MS, self.poll_import)
+
+    def set_exam_buttons_state(self, state: str):
+        for button in [self.start_button, self.practice_button, self.weakness_button,
+                       self.adaptive_button, self.code_button]:
+            button.config(state=state)
+
+    def cancel_import(self):
+        if self.background_import:
+            self.background_import.cancel()
+            self.import_status_label.config(text="Cancelling...")
+
+    def poll_import(self):
+        for event, payload in self.background_import.drain():
+            if event == EVENT_PROGRESS:
+                self.show_import_progress(payload)
+            elif event == EVENT_DUPLICATES:
+                self.background_import.decide(messagebox.askyesno(
+                    "Near-duplicate Questions",
+                    f"Found {duplicate_summary(payload)}.\n\nKeep only the first question of each group?"))
+            else:
+                self.finish_import(event, payload)
+                return
+        self.root.after(IMPORT_POLL_MS, self.poll_import)
+
+    def show_import_progress(self, progress: ImportProgress):
+        self.import_progress["maximum"] = max(progress.rows_total, 1)
+        if progress.phase == PHASE_INDEX:
+            self.import_progress["value"] = progress.rows_total
+            self.import_status_label.config(text=f"Building the search index for {progress.rows_total} questions...")
+            return
+        self.import_progress["value"] = progress.rows_parsed
+        if progress.phase == PHASE_DUPLICATES:
+            status = f"Checking for near-duplicates: {progress.rows_parsed}/{progress.rows_total} questions"
+        else:
+            status = f"{progress.rows_parsed}/{progress.rows_total} rows, {progress.rows_rejected} rejected"
+        if progress.eta is not None:
+            status += f", ~{int(progress.eta) + 1}s left"
+        self.import_status_label.config(text=status)
+
+    def finish_import(self, event: str, payload):
+        self.background_import = None
+        self.import_frame.pack_forget()
+        self.import_button.config(state="normal")
+
+        if event == EVENT_DONE:
+            questions, duplicates_note = payload.questions, ""
+            if payload.exact_duplicates:
+                duplicates_note += f"\n\nDropped {payload.exact_duplicates} exact duplicate questions."
+            if payload.duplicates:
+                duplicates_note += (f"\n\n{'Collapsed' if payload.collapsed else 'Found'} "
+                                    f"{duplicate_summary(payload.duplicates)}.")
+            # The index was built in the background for exactly these questions
+            self.question_bank.replace(questions, payload.index)
+        # A cancelled or failed import keeps the bank loaded before it
+        self.set_exam_buttons_state("normal" if self.question_bank.questions else "disabled")
+
+        if event == EVENT_DONE:
+            message = f"Imported {len(questions)} questions!" + duplicates_note
+            if payload.rejected:
+                message += f"\n\nRejected {len(payload.rejected)} rows:\n" + "\n".join(payload.rejected[:MAX_REJECTIONS_SHOWN])
+                if len(payload.rejected) > MAX_REJECTIONS_SHOWN:
+                    message += "\n..."
+            messagebox.showinfo("Success", message)
+        elif event == EVENT_ERROR:
+            messagebox.showerror("Error", str(payload) if isinstance(payload, QuestionImportError)
+                                 else f"Unexpected error while importing questions: {str(payload)}")
+        else:
+            messagebox.showinfo("Import Cancelled", "Question import was cancelled.")
+
+    def search_questions(self):
+        query = self.search_entry.get().strip()
+        if not query:
+            return
+        if not self.question_bank.questions:
+            messagebox.showerror("Error", "No questions imported!")
+            return
+        if self.question_bank.index is None:
+            # Building the index here would block the window; imports always build it
+            messagebox.showerror("Error", "The search index is not ready yet")
+            return
+        hits = self.question_bank.search(query, MAX_SEARCH_RESULTS)
+        if not hits:
+            messagebox.showinfo("Search", f"No questions match \"{query}\".")
+            return
+
+        search_window = Toplevel(self.root)
+        search_window.title(f"Search: {query}")
+        search_window.geometry("700x650")
+        search_window.configure(bg=self.config['window']['background'])
+
+        listbox = tk.Listbox(search_window, width=90, height=12, font=("Segoe UI", 12),
+                             bg=self.config['window']['background'], fg="#2d2d2d", selectbackground="#007bff")
+        listbox.pack(pady=15, padx=15)
+        for hit in hits:
+            listbox.insert(tk.END, f"Q{hit.index + 1}: {self.question_bank.questions[hit.index].text[:80]}")
+
+        details = tk.Text(search_window, wrap="word", width=90, height=15, font=("Segoe UI", 11),
+                          bg=self.config['window']['background'], fg="#2d2d2d")
+        details.pack(pady=10, padx=15, fill="both", expand=True)
+
+        def show_question(event):
+            if selection := listbox.curselection():
+                q = self.question_bank.questions[hits[selection[0]].index]
+                lines = [q.text, ""]
+                lines.extend(f"{chr(65 + i)}. {opt}" for i, opt in enumerate(q.options))
+                lines.extend(["", f"Correct Answers: {', '.join(q.correct_answers)}"])
+                if q.explanation:
+                    lines.extend(["", f"Explanation: {q.explanation}"])
+                details.config(state="normal")
+                details.delete("1.0", tk.END)
+                details.insert(tk.END, "\n".join(lines))
+                details.config(state="disabled")
+
+        listbox.bind("<<ListboxSelect>>", show_question)
+        listbox.selection_set(0)
+        show_question(None)
 
-    def start_exam(self):
+    def start_exam_from_code(self):
+        exam_code = simpledialog.askstring("Exam Code", "Enter the exam code to take that exam again:",
+                                           parent=self.root)
+        if exam_code:
+            self.start_exam(MODE_EXAM, exam_code)
+
+    def start_exam(self, mode: str = MODE_EXAM, exam_code: Optional[str] = None):
         try:
             num_questions = int(self.ui.num_questions_entry.get())
             time_limit = int(self.ui.time_limit_entry.get())
@@ -241,10 +543,16 @@ class MockExamApp:
         if not self.question_bank.questions:
             messagebox.showerror("Error", "No questions imported!")
             return
-            
-        self.exam_state.reset()
-        self.exam_state.questions = self.question_bank.get_random_questions(num_questions)
-        self.exam_state.time_remaining = time_limit * 60
+
+        try:
+            if mode in (MODE_PRACTICE, MODE_WEAKNESS) and not self.config['history']['enabled']:
+                messagebox.showerror("Error", f"{mode.capitalize()} mode needs the attempt history "
+                                              "(history.enabled in config.yaml)")
+                return
+            self.session = self.new_session(mode, num_questions, time_limit * 60, exam_code)
+        except ExamEngineError as e:
+            messagebox.showerror("Error", str(e))
+            return
         
         self.ui.show_quiz_frame()
         
@@ -252,87 +560,65 @@ class MockExamApp:
                    self.submit_button, self.view_answer_button, self.flag_button]:
             btn.config(state="normal")
             
-        self.ui.create_navigation_buttons(len(self.exam_state.questions), self.go_to_question)
+        self.ui.create_navigation_buttons(self.session.total, self.go_to_question)
         self.display_question()
         self.start_timer()
 
     def start_timer(self):
-        if self.exam_state.time_remaining > 0:
-            self.ui.update_timer_display(self.exam_state.time_remaining)
-            self.exam_state.time_remaining -= 1
-            self.exam_state.timer_id = self.root.after(1000, self.start_timer)
+        if self.session.time_remaining > 0:
+            self.ui.update_timer_display(self.session.time_remaining)
+            self.session.tick()
+            self.timer_id = self.root.after(1000, self.start_timer)
         else:
             messagebox.showinfo("Time's Up", "Time limit reached! Submitting exam...")
             self.submit_exam()
 
     def stop_timer(self):
-        if self.exam_state.timer_id:
-            self.root.after_cancel(self.exam_state.timer_id)
-            self.exam_state.timer_id = None
+        if self.timer_id:
+            self.root.after_cancel(self.timer_id)
+            self.timer_id = None
 
     def handle_translate_question(self, event):
-        question = self.exam_state.questions[self.exam_state.current_index]
-        if not question.translated_text or not question.translated_options:
-            try:
-                question.translated_text = self.translator.translate(question.text)
-                question.translated_options = [self.translator.translate(opt) for opt in question.options]
-                if not question.translated_options or None in question.translated_options or len(question.translated_options) != len(question.options):
-                    raise ValueError("Incomplete or invalid translation of options")
-            except Exception as e:
-                messagebox.showerror("Translation Error", f"Failed to translate: {str(e)}")
-                question.translated_text = question.text
-                question.translated_options = question.options.copy()
+        try:
+            self.session.translate(self.translator)
+        except TranslationError as e:
+            messagebox.showerror("Translation Error", f"Failed to translate: {str(e)}")
         self.display_question()
 
     def display_question(self):
-        question = self.exam_state.questions[self.exam_state.current_index]
-        self.ui.display_question(question, self.exam_state.current_index)
+        self.ui.display_question(self.session.current_question, self.session.current_state, self.session.current_index)
 
-        self.prev_button.config(state="normal" if self.exam_state.current_index > 0 else "disabled")
-        self.next_button.config(state="normal" if self.exam_state.current_index < len(self.exam_state.questions) - 1 else "disabled")
+        self.prev_button.config(state="normal" if not self.session.is_first else "disabled")
+        self.next_button.config(state="normal" if not self.session.is_last else "disabled")
         self.skip_button.config(state="normal")
-        self.ui.update_progress(self.exam_state.current_index, len(self.exam_state.questions))
-        self.ui.update_navigation_buttons(self.exam_state.questions, self.exam_state.current_index)
+        self.ui.update_progress(self.session.current_index, self.session.length)
+        if len(self.ui.nav_buttons) != self.session.total:
+            # Adaptive exams add their questions one at a time
+            self.ui.create_navigation_buttons(self.session.total, self.go_to_question)
+        self.ui.update_navigation_buttons(self.session.states, self.session.current_index)
 
-        self.flag_button.config(text="Unflag Question" if question.flagged else "Flag Question")
+        self.flag_button.config(text="Unflag Question" if self.session.current_state.flagged else "Flag Question")
 
     def save_current_answer(self):
-        question = self.exam_state.questions[self.exam_state.current_index]
-        selected = []
-
-        if question.is_multiple_choice:
-            selected = [opt for opt, var in self.ui.selected_answers.items() if var.get()]
-        else:
-            answer = self.ui.selected_answer.get()
-            selected = [answer] if answer else []
-
-        if self.ui.is_translated and question.translated_options:
-            english_selections = []
-            for sel in selected:
-                try:
-                    idx = question.translated_options.index(sel)
-                    english_selections.append(question.options[idx])
-                except (ValueError, IndexError):
-                    continue
-            selected = english_selections
-
-        question.user_answers = selected if selected else None
+        self.session.answer(self.ui.get_selected_indices(self.session.current_question))
 
     def go_to_question(self, index: Optional[int] = None):
         self.save_current_answer()
-        self.ui.update_navigation_buttons(self.exam_state.questions, self.exam_state.current_index)
+        self.ui.update_navigation_buttons(self.session.states, self.session.current_index)
         if index is None:
             self.submit_exam()
-        else:
-            self.exam_state.current_index = index
-            self.display_question()
+            return
+        try:
+            self.session.go_to(index)
+        except SessionError as e:
+            messagebox.showinfo("Info", str(e))
+        self.display_question()
 
     def next_question(self):
         self.save_current_answer()
-        self.ui.update_navigation_buttons(self.exam_state.questions, self.exam_state.current_index)
+        self.ui.update_navigation_buttons(self.session.states, self.session.current_index)
         
-        if self.exam_state.current_index < len(self.exam_state.questions) - 1:
-            self.exam_state.current_index += 1
+        if self.session.next():
             self.display_question()
         else:
             self.next_button.config(state="disabled")
@@ -341,34 +627,28 @@ class MockExamApp:
 
     def prev_question(self):
         self.save_current_answer()
-        self.ui.update_navigation_buttons(self.exam_state.questions, self.exam_state.current_index)
-        self.exam_state.current_index -= 1
+        self.ui.update_navigation_buttons(self.session.states, self.session.current_index)
+        self.session.prev()
         self.display_question()
 
     def skip_question(self):
-        self.exam_state.questions[self.exam_state.current_index].user_answers = None
-        self.ui.update_navigation_buttons(self.exam_state.questions, self.exam_state.current_index)
+        self.session.skip()
+        self.ui.update_navigation_buttons(self.session.states, self.session.current_index)
         self.next_question()
 
     def flag_question(self):
-        question = self.exam_state.questions[self.exam_state.current_index]
         self.save_current_answer()
-        question.flagged = not question.flagged
+        self.session.toggle_flag()
         self.display_question()
-        self.ui.update_navigation_buttons(self.exam_state.questions, self.exam_state.current_index)
+        self.ui.update_navigation_buttons(self.session.states, self.session.current_index)
 
     def view_answer(self):
-        question = self.exam_state.questions[self.exam_state.current_index]
-        if not question.answer_viewed:
-            question.answer_viewed = True
-            self.exam_state.penalties += 1
-        question.user_answers = []
-        correct_answers = ", ".join(question.correct_answers)
+        correct_answers = ", ".join(self.session.view_answer())
         messagebox.showinfo(
             "Correct Answer",
             f"Correct Answer(s):\n{correct_answers}\n\nNote: This question is marked as incorrect, and 1 point has been deducted from your score."
         )
-        self.ui.update_navigation_buttons(self.exam_state.questions, self.exam_state.current_index)
+        self.ui.update_navigation_buttons(self.session.states, self.session.current_index)
 
     def review_answers(self):
         self.stop_timer()
@@ -381,17 +661,20 @@ class MockExamApp:
                              bg=self.config['window']['background'], fg="#2d2d2d", selectbackground="#007bff")
         listbox.pack(pady=15, padx=15)
         
-        for i, q in enumerate(self.exam_state.questions):
-            status = ", ".join(q.user_answers) if q.user_answers else "Skipped or Viewed"
-            if q.answer_viewed:
+        for i, (q, state) in enumerate(zip(self.session.questions, self.session.states)):
+            status = self.session.answer_summary(i)
+            if state.answer_viewed:
                 status += " (Marked incorrect; 1 point deducted)"
-            if q.flagged:
+            if state.flagged:
                 status += " ⚑"
             listbox.insert(tk.END, f"Q{i+1}: {q.text[:50]}... -> {status}")
         
         def go_to_question(event):
             if selection := listbox.curselection():
-                self.exam_state.current_index = selection[0]
+                try:
+                    self.session.go_to(selection[0])
+                except SessionError as e:
+                    messagebox.showinfo("Info", str(e))
                 self.display_question()
                 review_window.destroy()
                 self.start_timer()
@@ -419,106 +702,31 @@ class MockExamApp:
     def submit_exam(self):
         self.stop_timer()
         self.save_current_answer()
-        self.ui.update_navigation_buttons(self.exam_state.questions, self.exam_state.current_index)
+        self.ui.update_navigation_buttons(self.session.states, self.session.current_index)
         
-        unanswered = [i for i, q in enumerate(self.exam_state.questions) if not q.user_answers and not q.answer_viewed]
+        unanswered = self.session.unanswered()
         if unanswered:
             if messagebox.askyesno("Unanswered Questions", 
                                  f"You have {len(unanswered)} unanswered questions. Review them now?"):
                 self.review_answers()
                 return
         
-        correct_count = sum(
-            1 for q in self.exam_state.questions
-            if q.user_answers and sorted(q.user_answers) == sorted(q.correct_answers)
-        )
-        
-        self.exam_state.score = correct_count - self.exam_state.penalties
-        if self.exam_state.score < 0:
-            self.exam_state.score = 0
-        
-        flagged_questions = [
-            {
-                'question': q.text,
-                'your_answers': ", ".join(q.user_answers) if q.user_answers else "Skipped or Viewed",
-                'correct_answers': ", ".join(q.correct_answers),
-                'answer_viewed': q.answer_viewed,
-                'is_correct': q.user_answers and sorted(q.user_answers) == sorted(q.correct_answers)
-            } for q in self.exam_state.questions if q.flagged
-        ]
-        
-        incorrect_questions = [
-            {
-                'question': q.text,
-                'your_answers': ", ".join(q.user_answers) if q.user_answers else "Skipped or Viewed",
-                'correct_answers': ", ".join(q.correct_answers),
-                'answer_viewed': q.answer_viewed,
-                'flagged': q.flagged
-            } for q in self.exam_state.questions
-            if not q.user_answers or sorted(q.user_answers) != sorted(q.correct_answers)
-        ]
-        
-        flagged_and_incorrect_questions = [
-            {
-                'question': q.text,
-                'your_answers': ", ".join(q.user_answers) if q.user_answers else "Skipped or Viewed",
-                'correct_answers': ", ".join(q.correct_answers),
-                'answer_viewed': q.answer_viewed
-            } for q in self.exam_state.questions
-            if q.flagged and (not q.user_answers or sorted(q.user_answers) != sorted(q.correct_answers))
-        ]
+        result = self.session.submit()
+        self.record_attempt(result)
         
-        total = len(self.exam_state.questions)
-        percentage = (self.exam_state.score / total) * 100 if total > 0 else 0
         messagebox.showinfo("Results", 
                           f"Exam Completed!\n"
-                          f"Correct Answers: {correct_count}/{total}\n"
-                          f"Penalties for Viewing Answers: {self.exam_state.penalties}\n"
-                          f"Final Score: {self.exam_state.score}/{total}\n"
-                          f"Percentage: {percentage:.2f}%")
+                          f"Correct Answers: {result.correct_count}/{result.total}\n"
+                          f"Penalties for Viewing Answers: {result.penalties}\n"
+                          f"Final Score: {result.score}/{result.total}\n"
+                          f"Percentage: {result.percentage:.2f}%" +
+                          (f"\nEstimated Ability: {self.session.ability.theta:+.2f} "
+                           f"(± {self.session.ability.standard_error:.2f})"
+                           if isinstance(self.session, AdaptiveSession) else "") +
+                          (f"\nExam Code: {self.session.descriptor}" if self.session.descriptor else ""))
         
-        if incorrect_questions or flagged_questions:
-            feedback_window = Toplevel(self.root)
-            feedback_window.title("Feedback: Incorrect/Skipped Questions")
-            feedback_window.geometry("800x700")
-            feedback_window.configure(bg=self.config['window']['background'])
-            
-            listbox = tk.Listbox(feedback_window, width=100, height=30, font=("Segoe UI", 12),
-                               bg=self.config['window']['background'], fg="#2d2d2d")
-            listbox.pack(pady=15, padx=15)
-            
-            for i, item in enumerate(incorrect_questions, 1):
-                listbox.insert(tk.END, f"Q{i}: {item['question'][:100]}...")
-                listbox.insert(tk.END, f"  Your Answers: {item['your_answers']}")
-                if item['answer_viewed']:
-                    listbox.insert(tk.END, f"  (Marked incorrect because answer was viewed; 1 point deducted)")
-                if item['flagged']:
-                    listbox.insert(tk.END, f"  (Flagged)")
-                listbox.insert(tk.END, f"  Correct Answers: {item['correct_answers']}")
-                listbox.insert(tk.END, "")
-            
-            scrollbar = tk.Scrollbar(feedback_window, orient="vertical")
-            scrollbar.config(command=listbox.yview)
-            scrollbar.pack(side="right", fill="y")
-            listbox.config(yscrollcommand=scrollbar.set)
-            
-            style_config = self.config['styles']
-            if self.is_macos:
-                close_button = MacButton(feedback_window, 
-                                       text="Close",
-                                       command=feedback_window.destroy,
-                                       font=tuple(style_config['button']['font']),
-                                       background=style_config['button']['default_background'],
-                                       foreground=style_config['button']['default_foreground'],
-                                       activebackground=style_config['button']['active_background'],
-                                       activeforeground=style_config['button']['active_foreground'],
-                                       borderwidth=style_config['button']['borderwidth'],
-                                       relief=style_config['button']['relief'])
-            else:
-                close_button = ttk.Button(feedback_window, 
-                                        text="Close", 
-                                        command=feedback_window.destroy)
-            close_button.pack(pady=10)
+        if result.view_size(VIEW_INCORRECT) or result.view_size(VIEW_FLAGGED):
+            FeedbackWindow(self.root, self.config, result)
         else:
             messagebox.showinfo("Feedback", "Congratulations! You answered all questions correctly!")
         
@@ -527,56 +735,7 @@ class MockExamApp:
                                                   filetypes=[("Markdown files", "*.md")])
             if file_path:
                 try:
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(f"# Mock Exam Feedback\n\n")
-                        f.write(f"**Correct Answers**: {correct_count}/{total}\n")
-                        f.write(f"**Penalties for Viewing Answers**: {self.exam_state.penalties}\n")
-                        f.write(f"**Final Score**: {self.exam_state.score}/{total}\n")
-                        f.write(f"**Percentage**: {percentage:.2f}%\n\n")
-
-                        f.write("## Flagged Questions\n\n")
-                        if flagged_questions:
-                            for i, item in enumerate(flagged_questions, 1):
-                                f.write(f"### Question {i} (Flagged)\n")
-                                f.write(f"- **Question**: {item['question']}\n")
-                                f.write(f"- **Your Answers**: {item['your_answers']}\n")
-                                if item['answer_viewed']:
-                                    f.write(f"- **Note**: Marked incorrect because answer was viewed; 1 point deducted\n")
-                                f.write(f"- **Correct Answers**: {item['correct_answers']}\n")
-                                f.write(f"- **Status**: {'Correct' if item['is_correct'] else 'Incorrect'}\n\n")
-                        else:
-                            f.write("No questions were flagged.\n\n")
-
-                        f.write("## Incorrect or Skipped Questions\n\n")
-                        if incorrect_questions:
-                            for i, item in enumerate(incorrect_questions, 1):
-                                f.write(f"### Question {i} (Incorrect or Skipped)\n")
-                                f.write(f"- **Question**: {item['question']}\n")
-                                f.write(f"- **Your Answers**: {item['your_answers']}\n")
-                                if item['answer_viewed']:
-                                    f.write(f"- **Note**: Marked incorrect because answer was viewed; 1 point deducted\n")
-                                if item['flagged']:
-                                    f.write(f"- **Note**: This question was flagged\n")
-                                f.write(f"- **Correct Answers**: {item['correct_answers']}\n\n")
-                        else:
-                            f.write("No incorrect or skipped questions.\n\n")
-
-                        f.write("## Flagged and Incorrect Questions\n\n")
-                        if flagged_and_incorrect_questions:
-                            for i, item in enumerate(flagged_and_incorrect_questions, 1):
-                                f.write(f"### Question {i} (Flagged and Incorrect)\n")
-                                f.write(f"- **Question**: {item['question']}\n")
-                                f.write(f"- **Your Answers**: {item['your_answers']}\n")
-                                if item['answer_viewed']:
-                                    f.write(f"- **Note**: Marked incorrect because answer was viewed; 1 point deducted\n")
-                                f.write(f"- **Correct Answers**: {item['correct_answers']}\n\n")
-                        else:
-                            f.write("No questions were both flagged and incorrect.\n\n")
-
-                        f.write("## Notes\n")
-                        f.write("- Questions marked as 'Flagged' were highlighted by you during the exam for review.\n")
-                        f.write("- Incorrect questions include those with wrong answers, skipped, or where the answer was viewed.\n")
-                        f.write("- The 'Flagged and Incorrect' section lists questions that meet both criteria.\n")
+                    self.save_feedback(file_path, result)
                     messagebox.showinfo("Success", f"Feedback saved to {file_path}")
                 except Exception as e:
                     messagebox.showerror("Error", f"Failed to save feedback: {str(e)}")
@@ -584,4 +743,124 @@ class MockExamApp:
         self.ui.show_main_frame()
         for btn in [self.prev_button, self.next_button, self.skip_button, 
                    self.review_button, self.submit_button, self.view_answer_button, self.flag_button]:
-            btn.config(state="disabled")
\ No newline at end of file
+            btn.config(state="disabled")
+
+    def new_session(self, mode: str, count: int, seconds: int, exam_code: Optional[str] = None) -> ExamSession:
+        if mode == MODE_ADAPTIVE:
+            return AdaptiveSession(self.adaptive_pool(), count, seconds, option_rng=self.option_rng())
+        if mode == MODE_PRACTICE:
+            return ExamSession(self.review_state().practice_questions(self.question_bank, count, self.candidate_name()),
+                               seconds, option_rng=self.option_rng())
+        if mode == MODE_WEAKNESS:
+            return ExamSession(self.weakness_state().weak_questions(self.question_bank, count, self.candidate_name()),
+                               seconds, option_rng=self.option_rng())
+        blueprint = blueprint_from_config(self.config['blueprint'])
+        if exam_code is not None:
+            descriptor = ExamDescriptor.decode(exam_code)
+            questions = regenerate(self.question_bank, descriptor, blueprint)
+        else:
+            descriptor, questions = create_exam(self.question_bank, count, blueprint)
+        return ExamSession(questions, seconds, descriptor=descriptor.encode(),
+                           option_rng=self.option_rng(descriptor))
+
+    def option_rng(self, descriptor: Optional[ExamDescriptor] = None):
+        # Exams from a code show their options in the same order every time
+        if not self.config['exam']['shuffle_options']:
+            return None
+        return random if descriptor is None else descriptor.option_rng()
+
+    def candidate_name(self) -> str:
+        return self.config['history']['candidate'] or getpass.getuser()
+
+    def review_state(self) -> SpacedRepetition:
+        if self.spaced_repetition is None:
+            self.spaced_repetition = SpacedRepetition(self.config['history']['path'])
+        return self.spaced_repetition
+
+    def weakness_state(self) -> WeaknessModel:
+        if self.weakness is None:
+            self.weakness = WeaknessModel(self.config['history']['path'])
+        return self.weakness
+
+    def attempt_history(self) -> AttemptHistory:
+        if self.history is None:
+            self.history = AttemptHistory(self.config['history']['path'])
+        return self.history
+
+    def adaptive_pool(self) -> ItemPool:
+        # Built once per imported bank, calibrated from the attempt history when it is on
+        if self.item_pool is None or self.item_pool.questions is not self.question_bank.questions:
+            history = self.attempt_history() if self.config['history']['enabled'] else None
+            self.item_pool = item_pool(self.question_bank, history)
+        return self.item_pool
+
+    def record_attempt(self, result: ExamResult):
+        if not self.config['history']['enabled']:
+            return
+        try:
+            self.attempt_history().record(result, self.candidate_name(), exam=self.session.descriptor)
+            # Every answered exam counts as a review, not only practice sessions
+            self.review_state().review(result, self.candidate_name())
+            self.weakness_state().update(result, self.candidate_name())
+        except HistoryError as e:
+            messagebox.showerror("Error", f"Failed to record attempt: {str(e)}")
+
+    def save_feedback(self, file_path: str, result: ExamResult):
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(f"# Mock Exam Feedback\n\n")
+            f.write(f"**Correct Answers**: {result.correct_count}/{result.total}\n")
+            f.write(f"**Penalties for Viewing Answers**: {result.penalties}\n")
+            f.write(f"**Final Score**: {result.score}/{result.total}\n")
+            f.write(f"**Percentage**: {result.percentage:.2f}%\n\n")
+
+            f.write("## Flagged Questions\n\n")
+            if result.view_size(VIEW_FLAGGED):
+                for item in result.iter_items(VIEW_FLAGGED):
+                    f.write(f"### Question {item.number} (Flagged)\n")
+                    f.write(f"- **Question**: {item.question}\n")
+                    f.write(f"- **Your Answers**: {item.your_answers}\n")
+                    if item.answer_viewed:
+                        f.write(f"- **Note**: Marked incorrect because answer was viewed; 1 point deducted\n")
+                    f.write(f"- **Correct Answers**: {item.correct_answers}\n")
+                    if item.explanation:
+                        f.write(f"- **Explanation**: {item.explanation}\n")
+                    f.write(f"- **Status**: {'Correct' if item.is_correct else 'Incorrect'}\n\n")
+            else:
+                f.write("No questions were flagged.\n\n")
+
+            f.write("## Incorrect or Skipped Questions\n\n")
+            if result.view_size(VIEW_INCORRECT):
+                for item in result.iter_items(VIEW_INCORRECT):
+                    f.write(f"### Question {item.number} (Incorrect or Skipped)\n")
+                    f.write(f"- **Question**: {item.question}\n")
+                    f.write(f"- **Your Answers**: {item.your_answers}\n")
+                    if item.answer_viewed:
+                        f.write(f"- **Note**: Marked incorrect because answer was viewed; 1 point deducted\n")
+                    if item.flagged:
+                        f.write(f"- **Note**: This question was flagged\n")
+                    f.write(f"- **Correct Answers**: {item.correct_answers}\n")
+                    if item.explanation:
+                        f.write(f"- **Explanation**: {item.explanation}\n")
+                    f.write("\n")
+            else:
+                f.write("No incorrect or skipped questions.\n\n")
+
+            f.write("## Flagged and Incorrect Questions\n\n")
+            if result.view_size(VIEW_FLAGGED_AND_INCORRECT):
+                for item in result.iter_items(VIEW_FLAGGED_AND_INCORRECT):
+                    f.write(f"### Question {item.number} (Flagged and Incorrect)\n")
+                    f.write(f"- **Question**: {item.question}\n")
+                    f.write(f"- **Your Answers**: {item.your_answers}\n")
+                    if item.answer_viewed:
+                        f.write(f"- **Note**: Marked incorrect because answer was viewed; 1 point deducted\n")
+                    f.write(f"- **Correct Answers**: {item.correct_answers}\n")
+                    if item.explanation:
+                        f.write(f"- **Explanation**: {item.explanation}\n")
+                    f.write("\n")
+            else:
+                f.write("No questions were both flagged and incorrect.\n\n")
+
+            f.write("## Notes\n")
+            f.write("- Questions marked as 'Flagged' were highlighted by you during the exam for review.\n")
+            f.write("- Incorrect questions include those with wrong answers, skipped, or where the answer was viewed.\n")
+            f.write("- The 'Flagged and Incorrect' section lists questions that meet both criteria.\n")
@@ -0,0 +1,155 @@
+# mock_exam_simulator/bench/__main__.py
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import List
+from ..core.question_bank import QuestionBank, parse_csv
+from .simulator import simulate
+from .synthetic import generate_bank, write_csv
+
+# (path into the results, True when larger is better)
+TRACKED_METRICS = [
+    (("import", "rows_per_s"), True),
+    (("import", "peak_memory_mb"), False),
+    (("simulation", "exams_per_s"), True),
+    (("simulation", "operations_per_s"), True),
+    (("simulation", "peak_memory_mb"), False),
+]
+
+
+def package_version() -> str:
+    try:
+        from importlib.metadata import version
+        return version("mock-exam-simulator")
+    except Exception:
+        return "unknown"
+
+
+def bench_import(file_path: str) -> dict:
+    started = time.perf_counter()
+    result = parse_csv(file_path)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    try:
+        parse_csv(file_path)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "rows": len(result.questions),
+        "elapsed_s": round(elapsed, 4),
+        "rows_per_s": round(len(result.questions) / elapsed, 1) if elapsed else 0.0,
+        "peak_memory_mb": round(peak / (1024 * 1024), 3),
+    }
+
+
+def run_suite(args) -> dict:
+    questions = generate_bank(args.bank_size, args.min_options, args.max_options, args.multi_ratio, args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "synthetic_bank.csv")
+        write_csv(questions, csv_path)
+        import_results = bench_import(csv_path)
+
+    question_bank = QuestionBank()
+    question_bank.replace(questions)
+    simulation = simulate(question_bank, args.candidates, args.questions, args.seed)
+
+    return {
+        "version": package_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "parameters": {
+            "bank_size": args.bank_size,
+            "min_options": args.min_options,
+            "max_options": args.max_options,
+            "multi_ratio": args.multi_ratio,
+            "candidates": args.candidates,
+            "questions_per_exam": args.questions,
+            "seed": args.seed,
+        },
+        "results": {
+            "import": import_results,
+            "simulation": simulation.summary(),
+        },
+    }
+
+
+def lookup(results: dict, path) -> float:
+    value = results
+    for key in path:
+        value = value[key]
+    return value
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> List[str]:
+    regressions = []
+    metrics = list(TRACKED_METRICS)
+    for op in current["results"]["simulation"]["latency_us"]:
+        if op in baseline["results"]["simulation"]["latency_us"]:
+            metrics.append((("simulation", "latency_us", op, "p99"), False))
+
+    for path, higher_is_better in metrics:
+        try:
+            new = lookup(current["results"], path)
+            old = lookup(baseline["results"], path)
+        except KeyError:
+            continue
+        if not old:
+            continue
+        change = (new - old) / old
+        if (higher_is_better and change < -tolerance) or (not higher_is_better and change > tolerance):
+            regressions.append(f"{'.'.join(path)}: {old} -> {new} ({change:+.1%})")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Synthetic candidate simulator and throughput benchmark")
+    parser.add_argument("--bank-size", type=int, default=10000)
+    parser.add_argument("--min-options", type=int, default=4)
+    parser.add_argument("--max-options", type=int, default=6)
+    parser.add_argument("--multi-ratio", type=float, default=0.2)
+    parser.add_argument("--candidates", type=int, default=200)
+    parser.add_argument("--questions", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the results as a JSON baseline to this path")
+    parser.add_argument("--compare", help="Baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed relative regression before failing (default 0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    if args.min_options < 2 or args.max_options < args.min_options:
+        parser.error("--min-options must be at least 2 and not above --max-options")
+
+    results = run_suite(args)
+
+    if args.output:
+        output_dir = os.path.dirname(os.path.abspath(args.output))
+        os.makedirs(output_dir, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    print(json.dumps(results, indent=2))
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("parameters") != results["parameters"]:
+            print("Warning: baseline was recorded with different parameters", file=sys.stderr)
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"Regression: {line}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+# mock_exam_simulator/bench/shared_memory.py
+import argparse
+import json
+import multiprocessing
+import random
+import sys
+import time
+from ..core.scoring import grade
+from ..core.shared_bank import SharedQuestionBank
+from ..models.question import QuestionState
+from .synthetic import generate_bank
+
+
+def private_memory_kb() -> int:
+    # Private (unshared) pages are what each extra worker really costs; Linux only.
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            return sum(int(line.split()[1]) for line in f
+                       if line.startswith(("Private_Clean:", "Private_Dirty:")))
+    except OSError:
+        return 0
+
+
+def worker(name: str, exams: int, questions: int, seed: int, results):
+    baseline = private_memory_kb()
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    with SharedQuestionBank.attach(name) as bank:
+        for _ in range(exams):
+            selected = bank.get_random_questions(questions)
+            states = [QuestionState(user_answers=[rng.randrange(len(q.options))]) for q in selected]
+            grade(selected, states, 0)
+        results.put({
+            "elapsed_s": time.perf_counter() - started,
+            "private_kb_delta": private_memory_kb() - baseline,
+        })
+
+
+def run(bank_size: int, workers: int, exams: int, questions: int, seed: int) -> dict:
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    with SharedQuestionBank.create(generate_bank(bank_size, seed=seed)) as bank:
+        processes = [context.Process(target=worker, args=(bank.name, exams, questions, seed + n, results))
+                     for n in range(workers)]
+        for process in processes:
+            process.start()
+        samples = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+        segment_mb = bank.shm.size / (1024 * 1024)
+    return {
+        "workers": workers,
+        "shared_segment_mb": round(segment_mb, 2),
+        "max_worker_private_mb": round(max(s["private_kb_delta"] for s in samples) / 1024, 2),
+        "total_worker_private_mb": round(sum(s["private_kb_delta"] for s in samples) / 1024, 2),
+        "exams_per_s": round(workers * exams / max(s["elapsed_s"] for s in samples), 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure worker memory over a shared-memory question bank")
+    parser.add_argument("--bank-size", type=int, default=100000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--exams", type=int, default=200)
+    parser.add_argument("--questions", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    report = [run(args.bank_size, n, args.exams, args.questions, args.seed) for n in args.workers]
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
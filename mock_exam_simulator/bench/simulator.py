@@ -0,0 +1,125 @@
+# mock_exam_simulator/bench/simulator.py
+import random
+import time
+import tracemalloc
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+from ..core.question_bank import QuestionBank
+from ..core.session import ExamSession
+
+OPERATIONS = ("start", "navigate", "answer", "flag", "view_answer", "translate", "submit")
+
+
+class StubTranslator:
+    def translate(self, text: str) -> str:
+        return f"[xx] {text}"
+
+    def translate_question(self, text: str, options: List[str]) -> Tuple[str, List[str]]:
+        return self.translate(text), [self.translate(opt) for opt in options]
+
+
+@dataclass
+class SimulationReport:
+    candidates: int
+    questions_per_exam: int
+    elapsed: float = 0.0
+    latencies: Dict[str, List[float]] = field(default_factory=lambda: defaultdict(list))
+    peak_memory_bytes: int = 0
+
+    @property
+    def operations(self) -> int:
+        return sum(len(samples) for samples in self.latencies.values())
+
+    @staticmethod
+    def percentile(samples: List[float], pct: float) -> float:
+        if not samples:
+            return 0.0
+        ordered = sorted(samples)
+        return ordered[min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)]
+
+    def summary(self) -> dict:
+        return {
+            "candidates": self.candidates,
+            "questions_per_exam": self.questions_per_exam,
+            "elapsed_s": round(self.elapsed, 4),
+            "exams_per_s": round(self.candidates / self.elapsed, 2) if self.elapsed else 0.0,
+            "operations_per_s": round(self.operations / self.elapsed, 1) if self.elapsed else 0.0,
+            "peak_memory_mb": round(self.peak_memory_bytes / (1024 * 1024), 3),
+            "latency_us": {
+                op: {
+                    "count": len(samples),
+                    "p50": round(self.percentile(samples, 50) * 1e6, 2),
+                    "p95": round(self.percentile(samples, 95) * 1e6, 2),
+                    "p99": round(self.percentile(samples, 99) * 1e6, 2),
+                }
+                for op, samples in sorted(self.latencies.items())
+            },
+        }
+
+
+def run_candidate(question_bank: QuestionBank, questions_per_exam: int, rng: random.Random,
+                  translator, latencies: Dict[str, List[float]]):
+    clock = time.perf_counter
+
+    started = clock()
+    session = ExamSession(question_bank.get_random_questions(questions_per_exam, rng=rng), 60 * 60)
+    latencies["start"].append(clock() - started)
+
+    for index in range(session.total):
+        started = clock()
+        session.go_to(index)
+        latencies["navigate"].append(clock() - started)
+
+        question = session.current_question
+        roll = rng.random()
+        if roll < 0.05:
+            started = clock()
+            session.view_answer()
+            latencies["view_answer"].append(clock() - started)
+        elif roll < 0.95:
+            if question.is_multiple_choice:
+                picks = rng.sample(range(len(question.options)), len(question.correct_indices))
+            else:
+                picks = [rng.randrange(len(question.options))]
+            started = clock()
+            session.answer(picks)
+            latencies["answer"].append(clock() - started)
+
+        if rng.random() < 0.1:
+            started = clock()
+            session.toggle_flag()
+            latencies["flag"].append(clock() - started)
+        if rng.random() < 0.1:
+            started = clock()
+            session.translate(translator)
+            latencies["translate"].append(clock() - started)
+
+    started = clock()
+    session.submit()
+    latencies["submit"].append(clock() - started)
+
+
+def simulate(question_bank: QuestionBank, candidates: int, questions_per_exam: int,
+             seed: int = 0, measure_memory: bool = True) -> SimulationReport:
+    report = SimulationReport(candidates=candidates, questions_per_exam=questions_per_exam)
+    translator = StubTranslator()
+
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    for _ in range(candidates):
+        run_candidate(question_bank, questions_per_exam, rng, translator, report.latencies)
+    report.elapsed = time.perf_counter() - started
+
+    if measure_memory:
+        # Separate pass: tracemalloc slows allocation-heavy code enough to skew the timings above.
+        rng = random.Random(seed)
+        scratch = defaultdict(list)
+        tracemalloc.start()
+        try:
+            for _ in range(candidates):
+                run_candidate(question_bank, questions_per_exam, rng, translator, scratch)
+            report.peak_memory_bytes = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return report
@@ -0,0 +1,46 @@
+# mock_exam_simulator/bench/synthetic.py
+import csv
+import random
+from typing import List
+from ..models.question import Question
+
+WORDS = ("instance", "bucket", "policy", "region", "cluster", "subnet", "gateway", "volume",
+         "snapshot", "queue", "topic", "function", "table", "index", "role", "key", "stream",
+         "cache", "endpoint", "certificate", "replica", "lifecycle", "quota", "alarm")
+TOPICS = ("compute", "storage", "networking", "security", "databases", "monitoring")
+DIFFICULTIES = ("easy", "medium", "hard")
+
+
+def sentence(rng: random.Random, length: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(length)).capitalize()
+
+
+def generate_bank(size: int, min_options: int = 4, max_options: int = 6,
+                  multi_ratio: float = 0.2, seed: int = 0) -> List[Question]:
+    rng = random.Random(seed)
+    questions = []
+    for number in range(size):
+        option_count = rng.randint(min_options, max_options)
+        options = [f"{sentence(rng, rng.randint(2, 8))} ({number}.{idx})" for idx in range(option_count)]
+        if option_count > 2 and rng.random() < multi_ratio:
+            correct = sorted(rng.sample(range(option_count), rng.randint(2, min(option_count - 1, 6))))
+        else:
+            correct = [rng.randrange(option_count)]
+        questions.append(Question(
+            text=f"Q{number}: {sentence(rng, rng.randint(8, 30))}?",
+            options=options,
+            correct_indices=correct,
+            is_multiple_choice=len(correct) > 1,
+            topic=rng.choice(TOPICS),
+            difficulty=rng.choice(DIFFICULTIES)
+        ))
+    return questions
+
+
+def write_csv(questions: List[Question], file_path: str):
+    with open(file_path, "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.writer(csvfile, quoting=csv.QUOTE_ALL)
+        writer.writerow(["question", "options", "correct", "topic", "difficulty"])
+        for q in questions:
+            writer.writerow([q.text, repr(q.options), ",".join(str(idx) for idx in q.correct_indices),
+                             q.topic or "", q.difficulty or ""])
@@ -1,64 +1,105 @@
+import copy
 import os
 import yaml
-from tkinter import messagebox
+from ..core.errors import ConfigError, ConfigNotFoundError
 
-def load_config():
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../../config.yaml')
+
+DEFAULT_CONFIG = {
+    'window': {
+        'title': 'Mock Exam Simulator',
+        'width': 800,
+        'height': 600,
+        'background': '#ffffff'
+    },
+    'exam': {
+        'default_questions': 10,
+        'default_time_limit_minutes': 60,
+        'shuffle_options': True
+    },
+    'translator': {
+        'from_lang': 'en',
+        'to_lang': 'es'
+    },
+    'styles': {
+        'button': {
+            'font': ['Segoe UI', 12],
+            'padding': 5,
+            'borderwidth': 1,
+            'relief': 'flat',
+            'default_background': '#007bff',
+            'default_foreground': '#ffffff',
+            'active_background': '#0056b3',
+            'active_foreground': '#ffffff',
+            'disabled_background': '#cccccc',
+            'disabled_foreground': '#666666'
+        },
+        'label': {'background': '#ffffff', 'font': ['Segoe UI', 14]},
+        'entry': {'padding': 5, 'bordercolor': '#ced4da', 'relief': 'flat', 'borderwidth': 1},
+        'radiobutton': {'background': '#ffffff', 'font': ['Segoe UI', 12]},
+        'checkbutton': {'background': '#ffffff', 'font': ['Segoe UI', 12]},
+        'progressbar': {'thickness': 20, 'background': '#007bff', 'troughcolor': '#dee2e6'},
+        'active_button': {'background': '#007bff'},
+        'viewed_button': {'background': '#6c757d'},
+        'answered_button': {'background': '#a3e635'},
+        'flagged_button': {'background': '#ff9500'}
+    },
+    'navigation': {
+        'background': '#ffffff',
+        'canvas_height': 50,
+        'default_visible': True
+    },
+    'question_bar': {'height': 100, 'font_size': 16},
+    'option_display': {'font_size': 12},
+    'feedback': {'page_size': 25},
+    'blueprint': {'enabled': False, 'domains': {}, 'multiple_choice': None, 'difficulty': {}},
+    'duplicates': {'mode': 'ask', 'threshold': 0.8},
+    'history': {'enabled': True, 'path': 'attempt_history.db', 'candidate': ''},
+    'server': {
+        'host': '127.0.0.1',
+        'port': 8765,
+        'max_sessions': 1000,
+        'results_retention_minutes': 10,
+        'loadgen': {
+            'candidates': 200,
+            'questions': 50,
+            'target_requests_per_second': 2000,
+            'target_p99_ms': 50
+        }
+    }
+}
+
+def default_config():
+    return copy.deepcopy(DEFAULT_CONFIG)
+
+def merge_config(defaults: dict, overrides: dict) -> dict:
+    # Sections and keys missing from config.yaml keep their defaults, so a config written
+    # for an older version still has every section the code reads
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(defaults.get(key), dict):
+            merge_config(defaults[key], value)
+        else:
+            defaults[key] = value
+    return defaults
+
+def load_config(config_path: str = CONFIG_PATH):
     try:
-        config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../../config.yaml')
         with open(config_path, 'r') as file:
-            return yaml.safe_load(file)
-    except FileNotFoundError:
-        messagebox.showerror("Error", "Configuration file 'config.yaml' not found!")
-        # Return a default configuration as fallback
-        return {
-            'window': {
-                'title': 'Mock Exam Simulator',
-                'width': 800,
-                'height': 600,
-                'background': '#ffffff'
-            },
-            'exam': {
-                'default_questions': 10,
-                'default_time_limit_minutes': 60
-            },
-            'translator': {
-                'from_lang': 'en',
-                'to_lang': 'es'
-            },
-            'styles': {
-                'button': {
-                    'font': ['Segoe UI', 12],
-                    'padding': 5,
-                    'borderwidth': 1,
-                    'relief': 'flat',
-                    'default_background': '#007bff',
-                    'default_foreground': '#ffffff',
-                    'active_background': '#0056b3',
-                    'active_foreground': '#ffffff',
-                    'disabled_background': '#cccccc',
-                    'disabled_foreground': '#666666'
-                },
-                'label': {'background': '#ffffff', 'font': ['Segoe UI', 14]},
-                'entry': {'padding': 5, 'bordercolor': '#ced4da', 'relief': 'flat', 'borderwidth': 1},
-                'radiobutton': {'background': '#ffffff', 'font': ['Segoe UI', 12]},
-                'checkbutton': {'background': '#ffffff', 'font': ['Segoe UI', 12]},
-                'progressbar': {'thickness': 20, 'background': '#007bff', 'troughcolor': '#dee2e6'},
-                'active_button': {'background': '#007bff'},
-                'viewed_button': {'background': '#6c757d'},
-                'answered_button': {'background': '#a3e635'},
-                'flagged_button': {'background': '#ff9500'}
-            },
-            'navigation': {
-                'background': '#ffffff',
-                'canvas_height': 50,
-                'default_visible': True
-            },
-            'question_bar': {'height': 100, 'font_size': 16},
-            'option_display': {'font_size': 12}
-        }
+            loaded = yaml.safe_load(file)
+    except FileNotFoundError as e:
+        raise ConfigNotFoundError("Configuration file 'config.yaml' not found!") from e
     except yaml.YAMLError as e:
-        messagebox.showerror("Error", f"Failed to parse config.yaml: {str(e)}")
-        raise
+        raise ConfigError(f"Failed to parse config.yaml: {str(e)}") from e
     except Exception as e:
-        messagebox.showerror("Error", f"Unexpected error loading configuration: {str(e)}")
-        raise
\ No newline at end of file
+        raise ConfigError(f"Unexpected error loading configuration: {str(e)}") from e
+    if loaded is None:
+        return default_config()
+    if not isinstance(loaded, dict):
+        raise ConfigError("Failed to parse config.yaml: the top level must be a mapping")
+    return merge_config(default_config(), loaded)
+
+def load_config_or_default(config_path: str = CONFIG_PATH):
+    try:
+        return load_config(config_path)
+    except ConfigNotFoundError:
+        return default_config()
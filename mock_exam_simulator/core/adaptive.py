@@ -0,0 +1,96 @@
+# mock_exam_simulator/core/adaptive.py
+import random
+import time
+from typing import Callable, List, Optional
+from .errors import QuestionSelectionError, SessionError
+from .irt import AbilityEstimate, ItemPool
+from .scoring import ExamResult, is_correct
+from .session import ExamSession
+
+
+class AdaptiveSession(ExamSession):
+    # Each question is chosen for the ability estimated from the answers so far, so earlier
+    # questions are locked once the candidate moves on: their answers shaped what followed.
+    def __init__(self, pool: ItemPool, length: int, time_limit_seconds: int = 0,
+                 clock: Callable[[], float] = time.monotonic, rng=random, option_rng=None):
+        self.planned = min(length, len(pool))
+        if self.planned < 1:
+            raise QuestionSelectionError("Cannot select questions: No questions available or invalid count")
+        self.pool = pool
+        self.rng = rng
+        self.ability = AbilityEstimate()
+        first = pool.select(self.ability.theta, set(), rng)
+        self.positions: List[int] = [first]
+        self.used = {first}
+        self.scored = 0
+        super().__init__([pool.questions[first]], time_limit_seconds, clock, option_rng=option_rng)
+
+    @property
+    def length(self) -> int:
+        return self.planned
+
+    @property
+    def is_first(self) -> bool:
+        return True
+
+    @property
+    def is_last(self) -> bool:
+        return self.total == self.planned
+
+    def _score(self):
+        for index in range(self.scored, self.total):
+            position = self.positions[index]
+            self.ability.update(self.pool.discrimination[position], self.pool.difficulty[position],
+                                is_correct(self.questions[index], self.states[index]))
+        self.scored = self.total
+
+    def _check_current(self, index: Optional[int]):
+        if index is not None and index != self.current_index:
+            raise SessionError(f"Question {index + 1} is not the current question of this adaptive exam")
+
+    def go_to(self, index: int):
+        # Moving to the question after the last one shown chooses it
+        if index == self.current_index:
+            return
+        if index == self.total and self.next():
+            return
+        if 0 <= index < self.total:
+            raise SessionError("Earlier questions of an adaptive exam cannot be revisited")
+        raise SessionError(f"Question index {index} out of range")
+
+    def next(self) -> bool:
+        if self.is_last or self.submitted:
+            return False
+        self._leave()
+        self._score()
+        position = self.pool.select(self.ability.theta, self.used, self.rng)
+        self.positions.append(position)
+        self.used.add(position)
+        self.questions.append(self.pool.questions[position])
+        self.states.append(self._new_state(self.questions[-1]))
+        self.current_index = self.total - 1
+        return True
+
+    def prev(self) -> bool:
+        return False
+
+    def answer(self, indices: List[int], index: Optional[int] = None):
+        self._check_current(index)
+        super().answer(indices)
+
+    def skip(self, index: Optional[int] = None):
+        self._check_current(index)
+        super().skip()
+
+    def toggle_flag(self, index: Optional[int] = None) -> bool:
+        self._check_current(index)
+        return super().toggle_flag()
+
+    def view_answer(self, index: Optional[int] = None) -> List[str]:
+        self._check_current(index)
+        return super().view_answer()
+
+    def submit(self) -> ExamResult:
+        if self.result is None:
+            self._score()
+        return super().submit()
@@ -0,0 +1,344 @@
+# mock_exam_simulator/core/attempt_history.py
+import json
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from .errors import HistoryError
+from .item_analysis import ItemStats, attempt_item_rows, chosen_options, item_sums, point_biserial
+from .scoring import ExamResult
+
+SCHEMA_VERSION = 3
+# attempts and responses are only ever appended to. question_totals, topic_days, item_stats
+# and item_options are running totals updated in the same transaction, so aggregates never
+# scan the responses.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS attempts (
+    id INTEGER PRIMARY KEY,
+    candidate TEXT NOT NULL,
+    finished_at REAL NOT NULL,
+    total INTEGER NOT NULL,
+    correct INTEGER NOT NULL,
+    penalties INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    percentage REAL NOT NULL,
+    time_spent REAL NOT NULL,
+    exam TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_attempts_candidate ON attempts (candidate, finished_at);
+CREATE TABLE IF NOT EXISTS responses (
+    attempt_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    question_id TEXT NOT NULL,
+    topic TEXT,
+    difficulty TEXT,
+    chosen TEXT,
+    correct INTEGER NOT NULL,
+    flagged INTEGER NOT NULL,
+    answer_viewed INTEGER NOT NULL,
+    time_spent REAL NOT NULL,
+    PRIMARY KEY (attempt_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_responses_question ON responses (question_id);
+CREATE TABLE IF NOT EXISTS question_totals (
+    question_id TEXT PRIMARY KEY,
+    answers INTEGER NOT NULL,
+    correct INTEGER NOT NULL,
+    flagged INTEGER NOT NULL,
+    viewed INTEGER NOT NULL,
+    time_spent REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS topic_days (
+    topic TEXT NOT NULL,
+    day TEXT NOT NULL,
+    answers INTEGER NOT NULL,
+    correct INTEGER NOT NULL,
+    PRIMARY KEY (topic, day)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS item_stats (
+    question_id TEXT PRIMARY KEY,
+    answers INTEGER NOT NULL,
+    correct INTEGER NOT NULL,
+    skipped INTEGER NOT NULL,
+    sum_rest REAL NOT NULL,
+    sum_rest_squares REAL NOT NULL,
+    sum_correct_rest REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS item_options (
+    question_id TEXT NOT NULL,
+    option_index INTEGER NOT NULL,
+    chosen INTEGER NOT NULL,
+    PRIMARY KEY (question_id, option_index)
+) WITHOUT ROWID;
+"""
+ITEM_COLUMNS = "question_id, answers, correct, skipped, sum_rest, sum_rest_squares, sum_correct_rest"
+QUESTION_COLUMNS = "question_id, answers, correct, flagged, viewed, time_spent"
+ATTEMPT_COLUMNS = "id, candidate, finished_at, total, correct, penalties, score, percentage, time_spent, exam"
+# Questions without a topic are totalled under this key
+NO_TOPIC = ""
+FETCH_CHUNK = 500
+# Responses read per step when item statistics are rebuilt
+REBUILD_CHUNK = 1000000
+
+
+@dataclass
+class QuestionStats:
+    question_id: str
+    answers: int
+    correct: int
+    flagged: int
+    viewed: int
+    time_spent: float
+
+    @property
+    def accuracy(self) -> float:
+        return self.correct / self.answers if self.answers else 0.0
+
+    @property
+    def mean_time(self) -> float:
+        return self.time_spent / self.answers if self.answers else 0.0
+
+
+@dataclass
+class TopicDay:
+    topic: Optional[str]
+    day: str
+    answers: int
+    correct: int
+
+    @property
+    def accuracy(self) -> float:
+        return self.correct / self.answers if self.answers else 0.0
+
+
+@dataclass
+class AttemptSummary:
+    attempt_id: int
+    candidate: str
+    finished_at: float
+    total: int
+    correct: int
+    penalties: int
+    score: int
+    percentage: float
+    time_spent: float
+    exam: Optional[str] = None
+
+
+def day_of(timestamp: float) -> str:
+    return time.strftime("%Y-%m-%d", time.localtime(timestamp))
+
+
+class AttemptHistory:
+    def __init__(self, path: str):
+        self.path = path
+        try:
+            # The exam server uses each store from a single worker thread
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+            if version > SCHEMA_VERSION:
+                raise HistoryError(f"Unsupported attempt history version: {version}")
+            # WAL lets the aggregate queries read while an attempt is being written
+            self.conn.execute("PRAGMA journal_mode = WAL")
+            self.conn.execute("PRAGMA synchronous = NORMAL")
+            self.conn.executescript(SCHEMA)
+            if version in (1, 2):
+                # Exam codes arrived with version 3
+                self.conn.execute("ALTER TABLE attempts ADD COLUMN exam TEXT")
+            if version == 1:
+                # Item statistics arrived with version 2; derive them from the recorded responses
+                self.rebuild_item_stats()
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        except sqlite3.DatabaseError as e:
+            raise HistoryError(f"Cannot open attempt history {path}: {e}")
+
+    def record(self, result: ExamResult, candidate: str = "", finished_at: Optional[float] = None,
+               exam: Optional[str] = None) -> int:
+        finished_at = time.time() if finished_at is None else finished_at
+        question_ids = [q.question_id for q in result.questions]
+        rows = [(position, question_id, q.topic, q.difficulty,
+                 json.dumps(state.user_answers) if state.user_answers else None,
+                 int(correct), int(state.flagged), int(state.answer_viewed), state.time_spent)
+                for position, (question_id, q, state, correct)
+                in enumerate(zip(question_ids, result.questions, result.states, result.correct))]
+        try:
+            with self.conn:
+                attempt_id = self.conn.execute(
+                    "INSERT INTO attempts (candidate, finished_at, total, correct, penalties, score, percentage, "
+                    "time_spent, exam) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (candidate, finished_at, result.total, result.correct_count, result.penalties, result.score,
+                     result.percentage, sum(row[-1] for row in rows), exam)).lastrowid
+                self.conn.executemany(
+                    "INSERT INTO responses (attempt_id, position, question_id, topic, difficulty, chosen, correct, "
+                    "flagged, answer_viewed, time_spent) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(attempt_id, *row) for row in rows])
+                self.conn.execute(
+                    f"INSERT INTO question_totals ({QUESTION_COLUMNS}) "
+                    "SELECT question_id, COUNT(*), SUM(correct), SUM(flagged), SUM(answer_viewed), SUM(time_spent) "
+                    "FROM responses WHERE attempt_id = ? GROUP BY question_id "
+                    "ON CONFLICT (question_id) DO UPDATE SET answers = answers + excluded.answers, "
+                    "correct = correct + excluded.correct, flagged = flagged + excluded.flagged, "
+                    "viewed = viewed + excluded.viewed, time_spent = time_spent + excluded.time_spent",
+                    (attempt_id,))
+                self.conn.execute(
+                    "INSERT INTO topic_days (topic, day, answers, correct) "
+                    "SELECT COALESCE(topic, ?), ?, COUNT(*), SUM(correct) "
+                    "FROM responses WHERE attempt_id = ? GROUP BY COALESCE(topic, ?) "
+                    "ON CONFLICT (topic, day) DO UPDATE SET answers = answers + excluded.answers, "
+                    "correct = correct + excluded.correct",
+                    (NO_TOPIC, day_of(finished_at), attempt_id, NO_TOPIC))
+                self._add_item_stats(*attempt_item_rows(result, question_ids))
+        except sqlite3.DatabaseError as e:
+            raise HistoryError(f"Cannot record attempt in {self.path}: {e}")
+        return attempt_id
+
+    def _add_item_stats(self, item_rows, option_rows):
+        self.conn.executemany(
+            f"INSERT INTO item_stats ({ITEM_COLUMNS}) VALUES (?, 1, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (question_id) DO UPDATE SET answers = answers + excluded.answers, "
+            "correct = correct + excluded.correct, skipped = skipped + excluded.skipped, "
+            "sum_rest = sum_rest + excluded.sum_rest, "
+            "sum_rest_squares = sum_rest_squares + excluded.sum_rest_squares, "
+            "sum_correct_rest = sum_correct_rest + excluded.sum_correct_rest", item_rows)
+        self.conn.executemany(
+            "INSERT INTO item_options (question_id, option_index, chosen) VALUES (?, ?, 1) "
+            "ON CONFLICT (question_id, option_index) DO UPDATE SET chosen = chosen + 1", option_rows)
+
+    def rebuild_item_stats(self):
+        # Recomputes item_stats and item_options from every recorded response with NumPy,
+        # reading the responses in chunks so the working set stays bounded.
+        attempts = pd.read_sql_query("SELECT id, correct, total FROM attempts ORDER BY id", self.conn)
+        attempt_ids = attempts["id"].to_numpy()
+        question_ids = pd.Index([], dtype=object)
+        sums, options = np.zeros((0, 6)), []
+        query = "SELECT attempt_id, question_id, correct, chosen FROM responses"
+        for chunk in pd.read_sql_query(query, self.conn, chunksize=REBUILD_CHUNK):
+            codes = question_ids.get_indexer(chunk["question_id"])
+            new_ids = pd.unique(chunk["question_id"].to_numpy()[codes < 0])
+            if len(new_ids):
+                question_ids = question_ids.append(pd.Index(new_ids, dtype=object))
+                codes = question_ids.get_indexer(chunk["question_id"])
+                sums = np.vstack([sums, np.zeros((len(new_ids), 6))])
+            rows = np.searchsorted(attempt_ids, chunk["attempt_id"].to_numpy())
+            chosen = chunk["chosen"].to_numpy(dtype=object)
+            sums += item_sums(codes, chunk["correct"].to_numpy(), pd.isna(chosen),
+                              attempts["correct"].to_numpy()[rows], attempts["total"].to_numpy()[rows],
+                              len(question_ids))
+            options.append(np.column_stack(chosen_options(codes, chosen)))
+
+        pairs = np.concatenate(options) if options else np.empty((0, 2), dtype=np.int64)
+        width = int(pairs[:, 1].max()) + 1 if len(pairs) else 1
+        counts = np.bincount(pairs[:, 0] * width + pairs[:, 1], minlength=len(question_ids) * width)
+        keys = np.flatnonzero(counts)
+        ids = question_ids.to_numpy(dtype=object)
+        with self.conn:
+            self.conn.execute("DELETE FROM item_stats")
+            self.conn.execute("DELETE FROM item_options")
+            self.conn.executemany(
+                f"INSERT INTO item_stats ({ITEM_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                zip(ids, *(sums[:, :3].astype(np.int64).T.tolist()), *sums[:, 3:].T.tolist()))
+            self.conn.executemany(
+                "INSERT INTO item_options (question_id, option_index, chosen) VALUES (?, ?, ?)",
+                zip(ids[keys // width], (keys % width).tolist(), counts[keys].tolist()))
+
+    def _item_stats(self, rows) -> List[ItemStats]:
+        if not rows:
+            return []
+        question_ids = [row[0] for row in rows]
+        sums = np.array([row[1:] for row in rows], dtype=float)
+        discrimination = point_biserial(sums[:, 0], sums[:, 1], sums[:, 3], sums[:, 4], sums[:, 5])
+        option_counts = {question_id: [] for question_id in question_ids}
+        for start in range(0, len(question_ids), FETCH_CHUNK):
+            chunk = question_ids[start:start + FETCH_CHUNK]
+            placeholders = ", ".join("?" * len(chunk))
+            for question_id, option, chosen in self.conn.execute(
+                    "SELECT question_id, option_index, chosen FROM item_options "
+                    f"WHERE question_id IN ({placeholders}) ORDER BY question_id, option_index", chunk):
+                counts = option_counts[question_id]
+                counts.extend([0] * (option + 1 - len(counts)))
+                counts[option] = chosen
+        return [ItemStats(question_id, int(row[1]), int(row[2]), int(row[3]), float(r), option_counts[question_id])
+                for question_id, row, r in zip(question_ids, rows, discrimination.tolist())]
+
+    def item_stats(self, question_ids: Sequence[str]) -> Dict[str, ItemStats]:
+        rows = []
+        for start in range(0, len(question_ids), FETCH_CHUNK):
+            chunk = list(question_ids[start:start + FETCH_CHUNK])
+            placeholders = ", ".join("?" * len(chunk))
+            rows.extend(self.conn.execute(
+                f"SELECT {ITEM_COLUMNS} FROM item_stats WHERE question_id IN ({placeholders})", chunk))
+        return {stats.question_id: stats for stats in self._item_stats(rows)}
+
+    def least_discriminating(self, limit: int = 20, min_answers: int = 1) -> List[ItemStats]:
+        rows = self.conn.execute(f"SELECT {ITEM_COLUMNS} FROM item_stats WHERE answers >= ?",
+                                 (min_answers,)).fetchall()
+        if not rows:
+            return []
+        sums = np.array([row[1:] for row in rows], dtype=float)
+        discrimination = point_biserial(sums[:, 0], sums[:, 1], sums[:, 3], sums[:, 4], sums[:, 5])
+        order = np.argsort(discrimination, kind="stable")[:limit]
+        return self._item_stats([rows[i] for i in order])
+
+    def classical_parameters(self, min_answers: int = 1) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        # Share answered correctly and point-biserial discrimination of every question with
+        # at least min_answers answers, without the option counts
+        rows = self.conn.execute(f"SELECT {ITEM_COLUMNS} FROM item_stats WHERE answers >= ?",
+                                 (min_answers,)).fetchall()
+        if not rows:
+            return [], np.empty(0), np.empty(0)
+        sums = np.array([row[1:] for row in rows], dtype=float)
+        discrimination = point_biserial(sums[:, 0], sums[:, 1], sums[:, 3], sums[:, 4], sums[:, 5])
+        return [row[0] for row in rows], sums[:, 1] / sums[:, 0], discrimination
+
+    def question_stats(self, question_ids: Sequence[str]) -> Dict[str, QuestionStats]:
+        found = {}
+        for start in range(0, len(question_ids), FETCH_CHUNK):
+            chunk = list(question_ids[start:start + FETCH_CHUNK])
+            placeholders = ", ".join("?" * len(chunk))
+            for row in self.conn.execute(
+                    f"SELECT {QUESTION_COLUMNS} FROM question_totals WHERE question_id IN ({placeholders})", chunk):
+                found[row[0]] = QuestionStats(*row)
+        return found
+
+    def weakest_questions(self, limit: int = 20, min_answers: int = 1) -> List[QuestionStats]:
+        # One row per question ever answered, however many times it was answered
+        rows = self.conn.execute(
+            f"SELECT {QUESTION_COLUMNS} FROM question_totals WHERE answers >= ? "
+            "ORDER BY CAST(correct AS REAL) / answers, answers DESC LIMIT ?", (min_answers, limit))
+        return [QuestionStats(*row) for row in rows]
+
+    def topic_trend(self, topic: Optional[str] = None, since: Optional[str] = None) -> List[TopicDay]:
+        clauses, params = [], []
+        if topic is not None:
+            clauses.append("topic = ?")
+            params.append(topic)
+        if since is not None:
+            clauses.append("day >= ?")
+            params.append(since)
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        rows = self.conn.execute(f"SELECT topic, day, answers, correct FROM topic_days{where} ORDER BY topic, day",
+                                 params)
+        return [TopicDay(topic if topic != NO_TOPIC else None, day, answers, correct)
+                for topic, day, answers, correct in rows]
+
+    def candidate_progress(self, candidate: str, limit: Optional[int] = None) -> List[AttemptSummary]:
+        # The newest attempts, returned oldest first
+        rows = self.conn.execute(
+            f"SELECT {ATTEMPT_COLUMNS} FROM attempts WHERE candidate = ? ORDER BY finished_at DESC LIMIT ?",
+            (candidate, -1 if limit is None else limit)).fetchall()
+        return [AttemptSummary(*row) for row in reversed(rows)]
+
+    def candidates(self) -> List[tuple]:
+        return self.conn.execute(
+            "SELECT candidate, COUNT(*), MAX(finished_at) FROM attempts GROUP BY candidate ORDER BY candidate").fetchall()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
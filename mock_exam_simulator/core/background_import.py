@@ -0,0 +1,104 @@
+# mock_exam_simulator/core/background_import.py
+import queue
+import threading
+import time
+from typing import List, Sequence, Tuple
+from .dedup import DEFAULT_THRESHOLD, DUPLICATES_ASK, DUPLICATES_COLLAPSE, DUPLICATES_OFF, collapse_duplicates, \
+    find_near_duplicates
+from .errors import ImportCancelled
+from .question_bank import PHASE_DUPLICATES, PHASE_INDEX, ImportProgress, merge_results, parse_file
+from .search_index import SearchIndex
+
+EVENT_PROGRESS = "progress"
+EVENT_DONE = "done"
+EVENT_ERROR = "error"
+EVENT_CANCELLED = "cancelled"
+# Near-duplicates were found in ask mode; the import waits for decide()
+EVENT_DUPLICATES = "duplicates"
+DECISION_POLL_SECONDS = 0.1
+
+
+class BackgroundImport:
+    def __init__(self, file_paths: Sequence[str], duplicate_mode: str = DUPLICATES_OFF,
+                 duplicate_threshold: float = DEFAULT_THRESHOLD):
+        self.file_paths = list(file_paths)
+        self.duplicate_mode = duplicate_mode
+        self.duplicate_threshold = duplicate_threshold
+        self.cancel_event = threading.Event()
+        self.events: "queue.Queue[Tuple[str, object]]" = queue.Queue()
+        self.decisions: "queue.Queue[bool]" = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name="question-import", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def decide(self, collapse: bool):
+        # Answers EVENT_DUPLICATES: keep only the first question of each group or all of them
+        self.decisions.put(collapse)
+
+    @property
+    def running(self) -> bool:
+        return self.thread.is_alive()
+
+    def _report(self, progress: ImportProgress):
+        self.events.put((EVENT_PROGRESS, ImportProgress(**vars(progress))))
+
+    def _check_cancelled(self):
+        if self.cancel_event.is_set():
+            raise ImportCancelled()
+
+    def _find_duplicates(self, questions) -> List[List[int]]:
+        state = ImportProgress(rows_total=len(questions), phase=PHASE_DUPLICATES)
+        started = time.monotonic()
+
+        def progress(checked: int):
+            state.rows_parsed = checked
+            state.elapsed = time.monotonic() - started
+            self._report(state)
+
+        progress(0)
+        return find_near_duplicates(questions, self.duplicate_threshold, progress, self.cancel_event)
+
+    def _wait_for_decision(self) -> bool:
+        while True:
+            try:
+                return self.decisions.get(timeout=DECISION_POLL_SECONDS)
+            except queue.Empty:
+                self._check_cancelled()
+
+    def _run(self):
+        try:
+            result = merge_results([(file_path, parse_file(file_path, self._report, self.cancel_event))
+                                    for file_path in self.file_paths])
+            if self.duplicate_mode != DUPLICATES_OFF:
+                result.duplicates = self._find_duplicates(result.questions)
+                if result.duplicates and self.duplicate_mode == DUPLICATES_ASK:
+                    # The index is built once, for the questions that are kept
+                    self.events.put((EVENT_DUPLICATES, result.duplicates))
+                    result.collapsed = self._wait_for_decision()
+                else:
+                    result.collapsed = bool(result.duplicates) and self.duplicate_mode == DUPLICATES_COLLAPSE
+                if result.collapsed:
+                    result.questions = collapse_duplicates(result.questions, result.duplicates)
+                    result.index = None
+            if result.index is None:
+                self._check_cancelled()
+                self._report(ImportProgress(rows_total=len(result.questions), phase=PHASE_INDEX))
+                result.index = SearchIndex.build(result.questions)
+        except ImportCancelled:
+            self.events.put((EVENT_CANCELLED, None))
+        except Exception as e:
+            self.events.put((EVENT_ERROR, e))
+        else:
+            self.events.put((EVENT_DONE, result))
+
+    def drain(self) -> List[Tuple[str, object]]:
+        drained = []
+        while True:
+            try:
+                drained.append(self.events.get_nowait())
+            except queue.Empty:
+                return drained
@@ -0,0 +1,195 @@
+# mock_exam_simulator/core/blueprint.py
+import random
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+import pandas as pd
+from ..models.question import Question
+from .errors import ConfigError, QuestionSelectionError
+
+
+@dataclass
+class Blueprint:
+    # Shares of an exam's questions; empty or None leaves that dimension unconstrained
+    domains: Dict[str, float] = field(default_factory=dict)
+    multiple_choice: Optional[float] = None
+    difficulty: Dict[str, float] = field(default_factory=dict)
+
+
+def _shares(section, key: str) -> Dict[str, float]:
+    return {str(name): float(share) for name, share in (section.get(key) or {}).items()}
+
+
+def blueprint_from_config(section) -> Optional[Blueprint]:
+    if not section or not section.get('enabled'):
+        return None
+    try:
+        domains, difficulty = _shares(section, 'domains'), _shares(section, 'difficulty')
+        multiple_choice = section.get('multiple_choice')
+        multiple_choice = None if multiple_choice is None else float(multiple_choice)
+    except (AttributeError, TypeError, ValueError) as e:
+        raise ConfigError(f"Invalid exam blueprint: {str(e)}")
+    for name, shares in (("domains", domains), ("difficulty", difficulty)):
+        if any(share < 0 for share in shares.values()) or (shares and not sum(shares.values()) > 0):
+            raise ConfigError(f"Invalid exam blueprint: {name} shares must be non-negative and not all zero")
+    if multiple_choice is not None and not 0 <= multiple_choice <= 1:
+        raise ConfigError("Invalid exam blueprint: multiple_choice must be between 0 and 1")
+    return Blueprint(domains, multiple_choice, difficulty)
+
+
+def quotas(count: int, shares: Sequence[float]) -> List[int]:
+    # Largest remainder rounding, so the quotas always add up to count
+    total = sum(shares)
+    exact = [share / total * count for share in shares]
+    result = [int(value) for value in exact]
+    for i in sorted(range(len(exact)), key=lambda i: result[i] - exact[i])[:count - sum(result)]:
+        result[i] += 1
+    return result
+
+
+class StrataIndex:
+    # Question positions grouped by (topic, difficulty, multiple choice). Built once per bank
+    # in O(n); an exam then only touches the few strata and the questions it draws.
+    def __init__(self, questions: List[Question]):
+        columns = [[q.topic for q in questions], [q.difficulty for q in questions]]
+        codes, values = [], []
+        for column in columns:
+            column_codes, uniques = pd.factorize(pd.Series(column, dtype=object))
+            codes.append(column_codes.astype(np.int64))
+            # factorize marks missing values with -1, which picks the trailing None
+            values.append(list(uniques) + [None])
+        multiple_choice = np.fromiter((q.is_multiple_choice for q in questions), dtype=np.int64, count=len(questions))
+        combined = ((codes[0] + 1) * (len(values[1]) + 1) + codes[1] + 1) * 2 + multiple_choice
+        order = np.argsort(combined, kind="stable")
+        _, starts, sizes = np.unique(combined[order], return_index=True, return_counts=True)
+        self.keys = [(values[0][codes[0][i]], values[1][codes[1][i]], bool(multiple_choice[i]))
+                     for i in order[starts]]
+        # Stratum i holds the positions order[starts[i]:starts[i] + sizes[i]]
+        self.order, self.starts, self.sizes = order, starts, sizes
+
+
+def _lookup(categories: Optional[list]) -> Optional[dict]:
+    return None if categories is None else {value: i for i, value in enumerate(categories)}
+
+
+def _move_gain(needed, moves) -> int:
+    # How much moving one question along each (source, target) cell pair brings the
+    # difficulty and type counts closer to their quotas
+    change = {}
+    for source, target in moves:
+        for dimension in (1, 2):
+            change[dimension, source[dimension]] = change.get((dimension, source[dimension]), 0) + 1
+            change[dimension, target[dimension]] = change.get((dimension, target[dimension]), 0) - 1
+    return sum(abs(needed[d][c]) - abs(needed[d][c] + delta) for (d, c), delta in change.items())
+
+
+def _feasible(taken: Dict[tuple, int], capacity: Dict[tuple, int], moves) -> bool:
+    change = {}
+    for source, target in moves:
+        change[source] = change.get(source, 0) - 1
+        change[target] = change.get(target, 0) + 1
+    return all(0 <= taken[cell] + delta <= capacity[cell] for cell, delta in change.items())
+
+
+def _rebalance(taken: Dict[tuple, int], capacity: Dict[tuple, int], needed: List[List[int]]):
+    # Local search for the rare banks where the greedy pass misses a quota: move questions
+    # between cells of the same domain, one move or a pair of moves at a time, while that
+    # brings the counts closer to the quotas.
+    while any(needed[1]) or any(needed[2]):
+        moves = [(source, target) for source in taken if taken[source]
+                 for target in taken if target[0] == source[0] and target != source
+                 and taken[target] < capacity[target]]
+        best = max(([move] for move in moves), key=lambda chosen: _move_gain(needed, chosen), default=None)
+        if best is None or _move_gain(needed, best) <= 0:
+            best = next(([first, second] for i, first in enumerate(moves) for second in moves[i + 1:]
+                         if _feasible(taken, capacity, [first, second]) and _move_gain(needed, [first, second]) > 0),
+                        None)
+            if best is None:
+                return
+        for source, target in best:
+            taken[source] -= 1
+            taken[target] += 1
+            for dimension in (1, 2):
+                needed[dimension][source[dimension]] += 1
+                needed[dimension][target[dimension]] -= 1
+
+
+def generate(strata: StrataIndex, count: int, blueprint: Blueprint, rng=random) -> List[int]:
+    # Positions of count questions meeting the blueprint. Domain quotas are exact; the
+    # multiple-choice and difficulty quotas are met exactly whenever the strata left over
+    # allow it and as closely as they allow otherwise.
+    if count < 1:
+        raise QuestionSelectionError("Cannot select questions: No questions available or invalid count")
+    dimensions = [(list(blueprint.domains) or None, list(blueprint.domains.values())),
+                  (list(blueprint.difficulty) or None, list(blueprint.difficulty.values())),
+                  (None, []) if blueprint.multiple_choice is None else
+                  ([False, True], [1 - blueprint.multiple_choice, blueprint.multiple_choice])]
+    lookups = [_lookup(categories) for categories, _ in dimensions]
+    cells: Dict[tuple, List[int]] = {}
+    for stratum, key in enumerate(strata.keys):
+        cell = tuple(0 if lookup is None else lookup.get(value) for lookup, value in zip(lookups, key))
+        if None not in cell:
+            cells.setdefault(cell, []).append(stratum)
+    sizes = strata.sizes.tolist()
+    capacity = {cell: sum(sizes[stratum] for stratum in members) for cell, members in cells.items()}
+
+    needed = [quotas(count, shares) if categories else [count] for categories, shares in dimensions]
+    available = [0] * len(needed[0])
+    for cell, size in capacity.items():
+        available[cell[0]] += size
+    for domain, (quota, size) in enumerate(zip(needed[0], available)):
+        if quota > size:
+            name = f"domain {dimensions[0][0][domain]}" if dimensions[0][0] else "the exam"
+            raise QuestionSelectionError(f"Cannot select questions: {name} needs {quota} questions, "
+                                         f"the bank has {size}")
+
+    # Each domain first takes the rounded-down share of its quota that the difficulty and
+    # type quotas imply. Domains with the least slack then place their remaining few
+    # questions one at a time in the cell whose difficulty and type are still needed most.
+    shares = [[quota / count for quota in dimension] for dimension in needed]
+    taken = dict.fromkeys(capacity, 0)
+    left = list(needed[0])
+    for cell in capacity:
+        d, k, m = cell
+        draws = min(int(needed[0][d] * shares[1][k] * shares[2][m]), capacity[cell], needed[1][k], needed[2][m])
+        taken[cell] = draws
+        left[d] -= draws
+        needed[1][k] -= draws
+        needed[2][m] -= draws
+    for domain in sorted(range(len(left)), key=lambda d: available[d] - needed[0][d]):
+        own = [cell for cell in capacity if cell[0] == domain]
+        for _ in range(left[domain]):
+            cell = max((cell for cell in own if taken[cell] < capacity[cell]),
+                       key=lambda c: (min(needed[1][c[1]], needed[2][c[2]]) > 0, needed[1][c[1]] + needed[2][c[2]]))
+            taken[cell] += 1
+            needed[1][cell[1]] -= 1
+            needed[2][cell[2]] -= 1
+    if any(needed[1]) or any(needed[2]):
+        _rebalance(taken, capacity, needed)
+
+    # All draws at once: each is an offset into its cell's strata laid end to end, and the
+    # rare repeated offsets are drawn again. Cells drawn more than half use an exact sample.
+    drawn = [(cells[cell], draws) for cell, draws in taken.items() if draws]
+    members = np.array([stratum for group, _ in drawn for stratum in group])
+    ends = np.cumsum(strata.sizes[members])
+    group_ends = ends[np.cumsum([len(group) for group, _ in drawn]) - 1]
+    bases = np.r_[0, group_ends[:-1]]
+    totals = group_ends - bases
+    draw_counts = np.array([draws for _, draws in drawn])
+    slot_bases, slot_totals = np.repeat(bases, draw_counts), np.repeat(totals, draw_counts)
+    offsets = np.empty(count, dtype=np.int64)
+    dense = 2 * draw_counts > totals
+    for group, first in zip(np.flatnonzero(dense).tolist(), (np.cumsum(draw_counts) - draw_counts)[dense].tolist()):
+        offsets[first:first + draw_counts[group]] = bases[group] + np.array(
+            rng.sample(range(int(totals[group])), int(draw_counts[group])))
+    pending = np.flatnonzero(~np.repeat(dense, draw_counts))
+    while len(pending):
+        uniform = np.array([rng.random() for _ in range(len(pending))])
+        offsets[pending] = slot_bases[pending] + (uniform * slot_totals[pending]).astype(np.int64)
+        _, first = np.unique(offsets, return_index=True)
+        pending = np.setdiff1d(np.arange(count), first, assume_unique=True)
+
+    member = np.searchsorted(ends, offsets, side="right")
+    local = offsets - (ends[member] - strata.sizes[members[member]])
+    positions = strata.order[strata.starts[members[member]] + local]
+    return positions[np.argsort([rng.random() for _ in range(count)])].tolist()
@@ -0,0 +1,154 @@
+# mock_exam_simulator/core/dedup.py
+import threading
+from itertools import chain
+from typing import Callable, List, Optional, Sequence, TypeVar
+import numpy as np
+import pandas as pd
+from ..models.question import Question
+from .errors import ImportCancelled
+from .search_index import encoded_tokens
+
+T = TypeVar("T")
+
+DUPLICATES_ASK = "ask"
+DUPLICATES_COLLAPSE = "collapse"
+DUPLICATES_REPORT = "report"
+DUPLICATES_OFF = "off"
+DUPLICATE_MODES = (DUPLICATES_ASK, DUPLICATES_COLLAPSE, DUPLICATES_REPORT, DUPLICATES_OFF)
+
+DEFAULT_THRESHOLD = 0.8
+NUM_PERMUTATIONS = 64
+# 16 bands of 4 rows: pairs at 0.8 similarity share a band with probability > 0.999
+BANDS = 16
+SEED = 20240501
+EMPTY = np.iinfo(np.uint32).max
+MIX = np.uint64(0x9E3779B97F4A7C15)
+# Questions shingled at once, bounding the working memory on large banks
+BATCH_QUESTIONS = 20000
+CHUNK_PAIRS = 1 << 16
+
+
+def shingles(questions: Sequence[Question]):
+    # Tokens drop whitespace and case. The question text is shingled as word bigrams and
+    # the options as single words, so the order of the options does not matter.
+    text_tokens = [encoded_tokens(q.text) for q in questions]
+    option_tokens = [encoded_tokens("\n".join(q.options)) for q in questions]
+    lengths = np.column_stack([np.fromiter(map(len, text_tokens), dtype=np.int64, count=len(questions)),
+                               np.fromiter(map(len, option_tokens), dtype=np.int64, count=len(questions))])
+    flat = chain.from_iterable(chain.from_iterable(zip(text_tokens, option_tokens)))
+    hashes = pd.util.hash_array(np.fromiter(flat, dtype=object, count=lengths.sum()))
+    del text_tokens, option_tokens
+
+    segments = lengths.ravel()
+    in_text = np.repeat(np.tile([True, False], len(questions)), segments)
+    text_last = np.zeros(len(hashes), dtype=bool)
+    text_ends = np.cumsum(segments)[0::2]
+    text_last[text_ends[lengths[:, 0] > 0] - 1] = True
+    bigram = in_text & ~text_last
+    positions = np.flatnonzero(bigram | ~in_text | (text_last & np.repeat(lengths[:, 0] == 1, lengths.sum(axis=1))))
+    bigram = bigram[positions]
+    values = hashes[positions]
+    values[bigram] = values[bigram] * MIX ^ hashes[positions[bigram] + 1]
+    docs = np.repeat(np.arange(len(questions)), lengths.sum(axis=1))[positions]
+    return docs, (values ^ (values >> np.uint64(32))).astype(np.uint32)
+
+
+def _check_cancelled(cancel_event: Optional[threading.Event]):
+    if cancel_event is not None and cancel_event.is_set():
+        raise ImportCancelled()
+
+
+def minhash_signatures(questions: Sequence[Question], progress: Optional[Callable[[int], None]] = None,
+                       cancel_event: Optional[threading.Event] = None) -> np.ndarray:
+    # progress gets the number of questions signed after every batch
+    rng = np.random.default_rng(SEED)
+    # Odd multipliers make each a*x + b (mod 2**32) a permutation of the hash space
+    multipliers = rng.integers(0, EMPTY, NUM_PERMUTATIONS, dtype=np.uint32, endpoint=True) | np.uint32(1)
+    offsets = rng.integers(0, EMPTY, NUM_PERMUTATIONS, dtype=np.uint32, endpoint=True)
+    signatures = np.full((len(questions), NUM_PERMUTATIONS), EMPTY, dtype=np.uint32)
+    for first in range(0, len(questions), BATCH_QUESTIONS):
+        _check_cancelled(cancel_event)
+        if progress and first:
+            progress(first)
+        batch = questions[first:first + BATCH_QUESTIONS]
+        docs, values = shingles(batch)
+        starts = np.searchsorted(docs, np.arange(len(batch)))
+        present = starts < np.r_[starts[1:], len(docs)]
+        if not present.any():
+            continue
+        rows = first + np.flatnonzero(present)
+        segments = starts[present]
+        permuted = np.empty_like(values)
+        # One permutation at a time keeps every reduction one-dimensional and contiguous
+        for column in range(NUM_PERMUTATIONS):
+            np.multiply(values, multipliers[column], out=permuted)
+            permuted += offsets[column]
+            signatures[rows, column] = np.minimum.reduceat(permuted, segments)
+    return signatures
+
+
+def candidate_pairs(signatures: np.ndarray, ids: np.ndarray) -> np.ndarray:
+    rows = NUM_PERMUTATIONS // BANDS
+    found = []
+    for band in range(BANDS):
+        block = signatures[ids, band * rows:(band + 1) * rows]
+        keys = block[:, 0].astype(np.uint64)
+        for column in range(1, rows):
+            keys = keys * MIX ^ block[:, column]
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        starts = np.r_[True, sorted_keys[1:] != sorted_keys[:-1]]
+        # Pair every member of a bucket with the bucket's first member
+        leaders = order[np.maximum.accumulate(np.where(starts, np.arange(len(order)), 0))]
+        found.append(np.stack([ids[leaders[~starts]], ids[order[~starts]]], axis=1))
+    pairs = np.concatenate(found) if found else np.empty((0, 2), dtype=np.int64)
+    return np.unique(pairs, axis=0)
+
+
+def connected_clusters(count: int, pairs: np.ndarray) -> List[List[int]]:
+    labels = np.arange(count)
+    left, right = pairs[:, 0], pairs[:, 1]
+    while True:
+        low = np.minimum(labels[left], labels[right])
+        if np.array_equal(low, labels[left]) and np.array_equal(low, labels[right]):
+            break
+        np.minimum.at(labels, left, low)
+        np.minimum.at(labels, right, low)
+        labels = labels[labels]
+    sizes = np.bincount(labels, minlength=count)
+    members = np.flatnonzero(sizes[labels] > 1)
+    members = members[np.argsort(labels[members], kind="stable")]
+    boundaries = np.flatnonzero(np.diff(labels[members])) + 1
+    return [cluster.tolist() for cluster in np.split(members, boundaries)] if len(members) else []
+
+
+def find_near_duplicates(questions: Sequence[Question], threshold: float = DEFAULT_THRESHOLD,
+                         progress: Optional[Callable[[int], None]] = None,
+                         cancel_event: Optional[threading.Event] = None) -> List[List[int]]:
+    if len(questions) < 2:
+        return []
+    signatures = minhash_signatures(questions, progress, cancel_event)
+    _check_cancelled(cancel_event)
+    if progress:
+        progress(len(questions))
+    ids = np.flatnonzero((signatures != EMPTY).any(axis=1))
+    pairs = candidate_pairs(signatures, ids)
+    # LSH only proposes pairs; keep those whose signatures agree often enough
+    keep = np.zeros(len(pairs), dtype=bool)
+    for start in range(0, len(pairs), CHUNK_PAIRS):
+        chunk = pairs[start:start + CHUNK_PAIRS]
+        keep[start:start + CHUNK_PAIRS] = \
+            (signatures[chunk[:, 0]] == signatures[chunk[:, 1]]).mean(axis=1) >= threshold
+    return connected_clusters(len(questions), pairs[keep])
+
+
+def collapse_duplicates(items: Sequence[T], clusters: List[List[int]]) -> List[T]:
+    # Each cluster keeps its first question, in the bank's original order. Works on any
+    # list parallel to the questions, such as their IDs.
+    dropped = {index for cluster in clusters for index in cluster[1:]}
+    return [item for i, item in enumerate(items) if i not in dropped]
+
+
+def duplicate_summary(clusters: List[List[int]]) -> str:
+    extra = sum(len(cluster) - 1 for cluster in clusters)
+    return f"{len(clusters)} groups of near-duplicate questions ({extra} redundant copies)"
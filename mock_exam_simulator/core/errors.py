@@ -0,0 +1,31 @@
+# mock_exam_simulator/core/errors.py
+
+class ExamEngineError(Exception):
+    pass
+
+class ConfigError(ExamEngineError):
+    pass
+
+class ConfigNotFoundError(ConfigError):
+    pass
+
+class QuestionImportError(ExamEngineError):
+    pass
+
+class ImportCancelled(ExamEngineError):
+    pass
+
+class QuestionSelectionError(ExamEngineError):
+    pass
+
+class TranslationError(ExamEngineError):
+    pass
+
+class SessionError(ExamEngineError):
+    pass
+
+class HistoryError(ExamEngineError):
+    pass
+
+class DescriptorError(ExamEngineError):
+    pass
@@ -0,0 +1,88 @@
+# mock_exam_simulator/core/exam_descriptor.py
+import base64
+import binascii
+import hashlib
+import json
+import random
+import secrets
+import struct
+from dataclasses import asdict, dataclass
+from typing import List, Optional, Tuple
+from ..models.question import Question
+from .blueprint import Blueprint
+from .errors import DescriptorError
+
+# An exam is fully determined by the bank it was drawn from, the blueprint and a seed:
+#   version u8, question count u16, seed u64, bank version 8 bytes, blueprint digest 4 bytes
+# 23 bytes, shared as a 31-character URL-safe code.
+DESCRIPTOR_VERSION = 1
+LAYOUT = struct.Struct(">BHQ8s4s")
+BANK_VERSION_BYTES = 8
+NO_BLUEPRINT = bytes(4)
+MAX_QUESTIONS = 0xFFFF
+# Option orders come from their own stream of the seed, independent of the question draws
+OPTION_STREAM = 0x9E3779B97F4A7C15
+
+
+def blueprint_digest(blueprint: Optional[Blueprint]) -> bytes:
+    if blueprint is None:
+        return NO_BLUEPRINT
+    return hashlib.sha256(json.dumps(asdict(blueprint), sort_keys=True).encode("utf-8")).digest()[:4]
+
+
+@dataclass(frozen=True)
+class ExamDescriptor:
+    count: int
+    seed: int
+    bank_version: bytes
+    blueprint: bytes = NO_BLUEPRINT
+
+    def encode(self) -> str:
+        data = LAYOUT.pack(DESCRIPTOR_VERSION, self.count, self.seed, self.bank_version, self.blueprint)
+        return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+    @classmethod
+    def decode(cls, code: str) -> "ExamDescriptor":
+        try:
+            code = code.strip()
+            data = base64.urlsafe_b64decode((code + "=" * (-len(code) % 4)).encode("ascii"))
+        except (binascii.Error, UnicodeEncodeError, ValueError):
+            raise DescriptorError(f"Invalid exam code: {code}")
+        if len(data) != LAYOUT.size:
+            raise DescriptorError(f"Invalid exam code: {code}")
+        version, count, seed, bank_version, blueprint = LAYOUT.unpack(data)
+        if version != DESCRIPTOR_VERSION:
+            raise DescriptorError(f"Unsupported exam code version {version}")
+        return cls(count, seed, bank_version, blueprint)
+
+    def rng(self) -> random.Random:
+        return random.Random(self.seed)
+
+    def option_rng(self) -> random.Random:
+        return random.Random(self.seed ^ OPTION_STREAM)
+
+
+def _draw(question_bank, count: int, blueprint: Optional[Blueprint], rng: random.Random) -> List[Question]:
+    if blueprint is not None:
+        return question_bank.get_blueprint_questions(count, blueprint, rng)
+    return question_bank.get_random_questions(count, rng=rng)
+
+
+def create_exam(question_bank, count: int, blueprint: Optional[Blueprint] = None,
+                seed: Optional[int] = None) -> Tuple[ExamDescriptor, List[Question]]:
+    if count < 1:
+        raise DescriptorError("An exam needs at least one question")
+    # The code records the count actually drawn, so it replays the same exam
+    count = min(count, len(question_bank), MAX_QUESTIONS)
+    descriptor = ExamDescriptor(count, secrets.randbits(64) if seed is None else seed,
+                                bytes.fromhex(question_bank.version()), blueprint_digest(blueprint))
+    return descriptor, _draw(question_bank, count, blueprint, descriptor.rng())
+
+
+def regenerate(question_bank, descriptor: ExamDescriptor, blueprint: Optional[Blueprint] = None) -> List[Question]:
+    # Replays the draws of create_exam; only the bank and blueprint it was made with give the same exam
+    if descriptor.bank_version != bytes.fromhex(question_bank.version()):
+        raise DescriptorError("The exam code was made for a different version of the question bank")
+    if descriptor.blueprint != blueprint_digest(blueprint):
+        raise DescriptorError("The exam code was made with a different exam blueprint")
+    return _draw(question_bank, descriptor.count, blueprint, descriptor.rng())
@@ -0,0 +1,128 @@
+# mock_exam_simulator/core/irt.py
+import random
+from statistics import NormalDist
+from typing import List, Set
+import numpy as np
+from ..models.question import Question
+from .item_analysis import MIN_RESPONSES
+
+# Ability scale covered by the information tables and the ability estimate
+THETA_MIN = -4.0
+THETA_MAX = 4.0
+THETA_STEP = 0.1
+THETA_GRID = np.linspace(THETA_MIN, THETA_MAX, int(round((THETA_MAX - THETA_MIN) / THETA_STEP)) + 1)
+# Scales the normal-ogive parameters from the classical statistics to the logistic model
+LOGISTIC_SCALE = 1.702
+# Questions without enough answers to calibrate get these parameters
+DEFAULT_DISCRIMINATION = 1.0
+DIFFICULTY_LEVELS = {"easy": -1.0, "medium": 0.0, "hard": 1.0}
+# Biserial correlations are clipped so a question never gets a zero or infinite discrimination
+MIN_BISERIAL = 0.05
+MAX_BISERIAL = 0.95
+# Most informative questions kept per ability grid point
+TOP_ITEMS = 256
+# Exposure control: the next question is drawn from this many of the most informative
+RANDOMESQUE = 5
+
+
+def probability(theta, discrimination, difficulty):
+    # Two-parameter logistic model: chance of a correct answer at ability theta
+    return 1.0 / (1.0 + np.exp(-discrimination * (theta - difficulty)))
+
+
+def information(theta, discrimination, difficulty):
+    p = probability(theta, discrimination, difficulty)
+    return discrimination ** 2 * p * (1.0 - p)
+
+
+def calibrate(p_values, point_biserials):
+    # Approximate 2PL parameters from classical item statistics (Lord's conversion through the
+    # biserial correlation); good enough to order questions until a proper calibration exists.
+    p = np.clip(np.asarray(p_values, dtype=float), 0.01, 0.99)
+    normal = NormalDist()
+    z = np.array([normal.inv_cdf(value) for value in p.tolist()])
+    density = np.exp(-0.5 * z ** 2) / np.sqrt(2 * np.pi)
+    biserial = np.clip(np.asarray(point_biserials, dtype=float) * np.sqrt(p * (1 - p)) / density,
+                       MIN_BISERIAL, MAX_BISERIAL)
+    discrimination = LOGISTIC_SCALE * biserial / np.sqrt(1 - biserial ** 2)
+    difficulty = np.clip(-z / biserial, THETA_MIN, THETA_MAX)
+    return discrimination, difficulty
+
+
+def grid_point(theta: float) -> int:
+    return min(max(int(round((theta - THETA_MIN) / THETA_STEP)), 0), len(THETA_GRID) - 1)
+
+
+class AbilityEstimate:
+    # Expected a posteriori ability on THETA_GRID under a standard normal prior, updated in
+    # O(grid) per answer
+    def __init__(self):
+        self.log_posterior = -0.5 * THETA_GRID ** 2
+
+    def update(self, discrimination: float, difficulty: float, correct: bool):
+        p = probability(THETA_GRID, discrimination, difficulty)
+        self.log_posterior = self.log_posterior + np.log(np.maximum(p if correct else 1.0 - p, 1e-300))
+
+    def _weights(self) -> np.ndarray:
+        weights = np.exp(self.log_posterior - self.log_posterior.max())
+        return weights / weights.sum()
+
+    @property
+    def theta(self) -> float:
+        return float(self._weights() @ THETA_GRID)
+
+    @property
+    def standard_error(self) -> float:
+        weights = self._weights()
+        mean = weights @ THETA_GRID
+        return float(np.sqrt(weights @ (THETA_GRID - mean) ** 2))
+
+
+class ItemPool:
+    # The TOP_ITEMS most informative questions at each ability grid point, precomputed once,
+    # so picking a question never scans the bank.
+    def __init__(self, questions: List[Question], discrimination, difficulty):
+        self.questions = questions
+        self.discrimination = np.asarray(discrimination, dtype=float)
+        self.difficulty = np.asarray(difficulty, dtype=float)
+        keep = min(TOP_ITEMS, len(questions))
+        self.top: List[List[int]] = []
+        for theta in THETA_GRID:
+            info = information(theta, self.discrimination, self.difficulty)
+            best = np.argpartition(-info, keep - 1)[:keep] if 0 < keep < len(info) else np.arange(len(info))
+            self.top.append(best[np.argsort(-info[best], kind="stable")].tolist())
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+    def select(self, theta: float, exclude: Set[int], rng=random) -> int:
+        # O(RANDOMESQUE + excluded questions met on the way) from the table; a full scan only
+        # when the whole top list of the grid point has been used
+        point = grid_point(theta)
+        candidates = []
+        for position in self.top[point]:
+            if position not in exclude:
+                candidates.append(position)
+                if len(candidates) == RANDOMESQUE:
+                    break
+        if not candidates:
+            info = information(THETA_GRID[point], self.discrimination, self.difficulty)
+            info[list(exclude)] = -1.0
+            candidates.append(int(np.argmax(info)))
+        return rng.choice(candidates)
+
+
+def item_pool(question_bank, history=None) -> ItemPool:
+    # Questions with at least MIN_RESPONSES recorded answers are calibrated from the history;
+    # the others take their difficulty from the difficulty column.
+    questions = question_bank.questions
+    discrimination = np.full(len(questions), DEFAULT_DISCRIMINATION)
+    difficulty = np.array([DIFFICULTY_LEVELS.get((q.difficulty or "").casefold(), 0.0) for q in questions])
+    if history is not None:
+        ids, p_values, point_biserials = history.classical_parameters(MIN_RESPONSES)
+        lookup = question_bank.id_lookup()
+        known = [(lookup[question_id], i) for i, question_id in enumerate(ids) if question_id in lookup]
+        if known:
+            targets, sources = (np.array(column) for column in zip(*known))
+            discrimination[targets], difficulty[targets] = calibrate(p_values[sources], point_biserials[sources])
+    return ItemPool(questions, discrimination, difficulty)
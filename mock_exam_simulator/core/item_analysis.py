@@ -0,0 +1,99 @@
+# mock_exam_simulator/core/item_analysis.py
+import json
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from .scoring import ExamResult
+
+# Thresholds for questions worth reviewing, in line with common item-analysis practice
+MIN_RESPONSES = 30
+TOO_HARD = 0.2
+TOO_EASY = 0.95
+LOW_DISCRIMINATION = 0.2
+
+
+@dataclass
+class ItemStats:
+    question_id: str
+    answers: int
+    correct: int
+    skipped: int
+    discrimination: float
+    option_counts: List[int]
+
+    @property
+    def p_value(self) -> float:
+        return self.correct / self.answers if self.answers else 0.0
+
+    def problems(self) -> List[str]:
+        if self.answers < MIN_RESPONSES:
+            return []
+        found = []
+        if self.p_value < TOO_HARD:
+            found.append("too hard")
+        if self.p_value > TOO_EASY:
+            found.append("too easy")
+        if self.discrimination < 0:
+            found.append("negative discrimination")
+        elif self.discrimination < LOW_DISCRIMINATION:
+            found.append("low discrimination")
+        return found
+
+
+def point_biserial(n, sum_x, sum_y, sum_yy, sum_xy):
+    # Correlation of a 0/1 item score x with the rest score y from running sums; x*x == x.
+    n, sum_x, sum_y = np.asarray(n, dtype=float), np.asarray(sum_x, dtype=float), np.asarray(sum_y, dtype=float)
+    covariance = n * np.asarray(sum_xy, dtype=float) - sum_x * sum_y
+    spread = (n * sum_x - sum_x ** 2) * (n * np.asarray(sum_yy, dtype=float) - sum_y ** 2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(spread > 0, covariance / np.sqrt(np.maximum(spread, 0)), 0.0)
+
+
+def rest_scores(correct, attempt_correct, attempt_total):
+    # Share of the attempt's other questions answered correctly, so an item is not
+    # correlated with itself.
+    correct = np.asarray(correct, dtype=float)
+    others = np.asarray(attempt_total, dtype=float) - 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(others > 0, (np.asarray(attempt_correct) - correct) / others, 0.0)
+
+
+def attempt_item_rows(result: ExamResult, question_ids: Sequence[str]) -> Tuple[list, list]:
+    # Increments for one attempt, in O(questions in the exam)
+    correct = np.array(result.correct, dtype=float)
+    rest = rest_scores(correct, result.correct_count, result.total)
+    item_rows, option_rows = [], []
+    for question_id, state, x, y in zip(question_ids, result.states, correct.tolist(), rest.tolist()):
+        item_rows.append((question_id, int(x), int(not state.user_answers), y, y * y, x * y))
+        option_rows.extend((question_id, option) for option in state.user_answers or [])
+    return item_rows, option_rows
+
+
+def item_sums(question_codes: np.ndarray, correct: np.ndarray, skipped: np.ndarray, attempt_correct: np.ndarray,
+              attempt_total: np.ndarray, count: int) -> np.ndarray:
+    # Batch counterpart of attempt_item_rows: one row of
+    # (answers, correct, skipped, sum y, sum y*y, sum x*y) per question code.
+    x = correct.astype(float)
+    y = rest_scores(x, attempt_correct, attempt_total)
+    return np.column_stack([np.bincount(question_codes, minlength=count),
+                            np.bincount(question_codes, weights=x, minlength=count),
+                            np.bincount(question_codes, weights=skipped.astype(float), minlength=count),
+                            np.bincount(question_codes, weights=y, minlength=count),
+                            np.bincount(question_codes, weights=y * y, minlength=count),
+                            np.bincount(question_codes, weights=x * y, minlength=count)])
+
+
+def chosen_options(question_codes: np.ndarray, chosen: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # Expands the stored JSON answer lists into one (question code, option) pair per chosen
+    # option. Only the distinct answer strings are parsed, and there are few of them.
+    codes, uniques = pd.factorize(chosen)
+    parsed = [json.loads(value) for value in uniques]
+    lengths = np.array([len(options) for options in parsed] + [0], dtype=np.int64)
+    flat = np.array([option for options in parsed for option in options], dtype=np.int64)
+    offsets = np.cumsum(lengths) - lengths
+    # factorize marks missing answers with -1, which picks the trailing zero length
+    counts = lengths[codes]
+    starts = np.repeat(offsets[codes] - (np.cumsum(counts) - counts), counts)
+    options = flat[starts + np.arange(counts.sum())] if len(flat) else np.empty(0, dtype=np.int64)
+    return np.repeat(question_codes, counts), options
@@ -0,0 +1,218 @@
+# mock_exam_simulator/core/packed_bank.py
+import struct
+import sys
+from typing import List, Optional, Sequence
+from ..models.question import Question
+from .errors import QuestionImportError
+
+# Layout (little-endian u64 arrays read in place through memoryview casts, every
+# section 8-byte aligned):
+#   header            MAGIC, version, question count, option count, blob size
+#   question_offsets  u64[count + 1]    question text spans in the blob
+#   option_starts     u64[count + 1]    option index spans per question
+#   option_offsets    u64[options + 1]  option text spans in the blob
+#   correct_masks     u64[count]        bit i set when option i is correct
+#   <field>_offsets   u64[count + 1]    spans of each optional text field (empty when missing)
+#   blob              UTF-8 question texts, then option texts, then each optional field in turn
+MAGIC = b"MEXBANK\x00"
+LAYOUT_VERSION = 3
+HEADER = struct.Struct("<8sIIQQ")
+MAX_OPTIONS = 64
+BANK_EXTENSION = ".bank"
+OPTIONAL_FIELDS = ("explanation", "topic", "difficulty")
+
+
+def _align(size: int) -> int:
+    return (size + 7) & ~7
+
+
+def _sections(count: int, options: int, blob_size: int):
+    offset = _align(HEADER.size)
+    sections = {}
+    for name, length in (("question_offsets", (count + 1) * 8),
+                         ("option_starts", (count + 1) * 8),
+                         ("option_offsets", (options + 1) * 8),
+                         ("correct_masks", count * 8),
+                         *((f"{field}_offsets", (count + 1) * 8) for field in OPTIONAL_FIELDS),
+                         ("blob", blob_size)):
+        sections[name] = (offset, length)
+        offset = _align(offset + length)
+    return sections, offset
+
+
+class PackedLayout:
+    def __init__(self, questions: Sequence[Question]):
+        self.count = len(questions)
+        self.question_texts: List[bytes] = []
+        self.option_texts: List[bytes] = []
+        self.field_texts = {field: [] for field in OPTIONAL_FIELDS}
+        self.option_counts: List[int] = []
+        self.masks: List[int] = []
+        for q in questions:
+            if len(q.options) > MAX_OPTIONS:
+                raise QuestionImportError(f"Packed banks support at most {MAX_OPTIONS} options per question")
+            self.question_texts.append(q.text.encode("utf-8"))
+            self.option_texts.extend(opt.encode("utf-8") for opt in q.options)
+            self.option_counts.append(len(q.options))
+            for field, texts in self.field_texts.items():
+                texts.append((getattr(q, field) or "").encode("utf-8"))
+            mask = 0
+            for idx in q.correct_indices:
+                mask |= 1 << idx
+            self.masks.append(mask)
+        self.options = sum(self.option_counts)
+        self.blob_size = sum(map(len, self.question_texts)) + sum(map(len, self.option_texts)) \
+            + sum(sum(map(len, texts)) for texts in self.field_texts.values())
+        self.sections, self.size = _sections(self.count, self.options, self.blob_size)
+
+    def write_into(self, buffer):
+        if sys.byteorder != "little":
+            raise QuestionImportError("Packed banks require a little-endian platform")
+        view = memoryview(buffer)
+        HEADER.pack_into(view, 0, MAGIC, LAYOUT_VERSION, self.count, self.options, self.blob_size)
+        question_offsets = view[self._span("question_offsets")].cast("Q")
+        option_starts = view[self._span("option_starts")].cast("Q")
+        option_offsets = view[self._span("option_offsets")].cast("Q")
+        correct_masks = view[self._span("correct_masks")].cast("Q")
+        blob_start = self.sections["blob"][0]
+
+        cursor = 0
+        for i, text in enumerate(self.question_texts):
+            question_offsets[i] = cursor
+            view[blob_start + cursor:blob_start + cursor + len(text)] = text
+            cursor += len(text)
+            correct_masks[i] = self.masks[i]
+        question_offsets[self.count] = cursor
+
+        option_cursor = 0
+        for i, option_count in enumerate(self.option_counts):
+            option_starts[i] = option_cursor
+            option_cursor += option_count
+        option_starts[self.count] = option_cursor
+
+        for i, option in enumerate(self.option_texts):
+            option_offsets[i] = cursor
+            view[blob_start + cursor:blob_start + cursor + len(option)] = option
+            cursor += len(option)
+        option_offsets[self.options] = cursor
+
+        for field, texts in self.field_texts.items():
+            field_offsets = view[self._span(f"{field}_offsets")].cast("Q")
+            for i, text in enumerate(texts):
+                field_offsets[i] = cursor
+                view[blob_start + cursor:blob_start + cursor + len(text)] = text
+                cursor += len(text)
+            field_offsets[self.count] = cursor
+            field_offsets.release()
+        for section in (question_offsets, option_starts, option_offsets, correct_masks):
+            section.release()
+        view.release()
+
+    def _span(self, name: str) -> slice:
+        offset, length = self.sections[name]
+        return slice(offset, offset + length)
+
+    def to_bytes(self) -> bytes:
+        buffer = bytearray(self.size)
+        self.write_into(buffer)
+        return bytes(buffer)
+
+
+class PackedBank:
+    def __init__(self, buffer):
+        self.buffer = memoryview(buffer)
+        if sys.byteorder != "little":
+            raise QuestionImportError("Packed banks require a little-endian platform")
+        if len(self.buffer) < HEADER.size:
+            raise QuestionImportError("Packed bank is truncated")
+        magic, version, count, options, blob_size = HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC:
+            raise QuestionImportError("Not a packed question bank")
+        if version != LAYOUT_VERSION:
+            raise QuestionImportError(f"Unsupported packed bank version: {version}")
+        sections, size = _sections(count, options, blob_size)
+        if len(self.buffer) < size:
+            raise QuestionImportError("Packed bank is truncated")
+
+        def section(name):
+            offset, length = sections[name]
+            return self.buffer[offset:offset + length]
+
+        self.count = count
+        self.question_offsets = section("question_offsets").cast("Q")
+        self.option_starts = section("option_starts").cast("Q")
+        self.option_offsets = section("option_offsets").cast("Q")
+        self.correct_masks = section("correct_masks").cast("Q")
+        self.field_offsets = {field: section(f"{field}_offsets").cast("Q") for field in OPTIONAL_FIELDS}
+        self.blob = section("blob")
+
+    def __len__(self) -> int:
+        return self.count
+
+    def text(self, index: int) -> str:
+        return str(self.blob[self.question_offsets[index]:self.question_offsets[index + 1]], "utf-8")
+
+    def options(self, index: int) -> List[str]:
+        first, last = self.option_starts[index], self.option_starts[index + 1]
+        offsets = self.option_offsets
+        blob = self.blob
+        return [str(blob[offsets[i]:offsets[i + 1]], "utf-8") for i in range(first, last)]
+
+    def option_count(self, index: int) -> int:
+        return self.option_starts[index + 1] - self.option_starts[index]
+
+    def correct_indices(self, index: int) -> List[int]:
+        mask = self.correct_masks[index]
+        return [bit for bit in range(self.option_count(index)) if mask >> bit & 1]
+
+    def field(self, name: str, index: int) -> Optional[str]:
+        offsets = self.field_offsets[name]
+        start, stop = offsets[index], offsets[index + 1]
+        return str(self.blob[start:stop], "utf-8") if stop > start else None
+
+    def explanation(self, index: int) -> Optional[str]:
+        return self.field("explanation", index)
+
+    def __getitem__(self, index: int) -> Question:
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        correct = self.correct_indices(index)
+        return Question(
+            text=self.text(index),
+            options=self.options(index),
+            correct_indices=correct,
+            is_multiple_choice=len(correct) > 1,
+            explanation=self.field("explanation", index),
+            topic=self.field("topic", index),
+            difficulty=self.field("difficulty", index)
+        )
+
+    def release(self):
+        for view in (self.question_offsets, self.option_starts, self.option_offsets,
+                     self.correct_masks, *self.field_offsets.values(), self.blob):
+            view.release()
+        self.buffer.release()
+
+
+def write_bank_file(questions: Sequence[Question], file_path: str):
+    data = PackedLayout(questions).to_bytes()
+    try:
+        with open(file_path, "wb") as f:
+            f.write(data)
+    except OSError as e:
+        raise QuestionImportError(f"Cannot write compiled bank {file_path}: {e.strerror}")
+
+
+def read_bank_file(file_path: str) -> List[Question]:
+    try:
+        with open(file_path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        raise QuestionImportError(f"Compiled bank not found: {file_path}")
+    except OSError as e:
+        raise QuestionImportError(f"Cannot read compiled bank {file_path}: {e.strerror}")
+    bank = PackedBank(data)
+    try:
+        return [bank[i] for i in range(len(bank))]
+    finally:
+        bank.release()
@@ -1,106 +1,367 @@
+import numpy as np
 import pandas as pd
 import ast
-from typing import List
-from tkinter import messagebox
+import hashlib
+import os
+import re
+import time
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 from ..models.question import Question
+from .blueprint import Blueprint, StrataIndex, generate
+from .exam_descriptor import BANK_VERSION_BYTES
+from .errors import ImportCancelled, QuestionImportError, QuestionSelectionError
+from .search_index import DEFAULT_LIMIT, SearchHit, SearchIndex, load_index, save_index
+from .weighted_sampling import FenwickTree
 import random
 
+PROGRESS_INTERVAL = 500
+
+# What an ImportProgress counts: CSV rows, questions checked for near-duplicates, or the
+# search index being built (reported once, without a count)
+PHASE_ROWS = "rows"
+PHASE_DUPLICATES = "duplicates"
+PHASE_INDEX = "index"
+
+LAYOUT_LIST = "list"
+LAYOUT_WIDE = "wide"
+REQUIRED_COLUMNS = ["question", "options", "correct"]
+OPTIONAL_COLUMNS = ["explanation", "topic", "difficulty"]
+WIDE_OPTION_COLUMN = re.compile(r"option(\d+)")
+
+
+@dataclass
+class ImportProgress:
+    rows_total: int
+    rows_parsed: int = 0
+    rows_rejected: int = 0
+    elapsed: float = 0.0
+    phase: str = PHASE_ROWS
+
+    @property
+    def eta(self) -> Optional[float]:
+        if not self.rows_parsed or not self.elapsed:
+            return None
+        rate = self.rows_parsed / self.elapsed
+        return (self.rows_total - self.rows_parsed) / rate
+
+
+@dataclass
+class ImportResult:
+    questions: List[Question]
+    rejected: List[str] = field(default_factory=list)
+    index: Optional[SearchIndex] = None
+    duplicates: List[List[int]] = field(default_factory=list)
+    # Whether the near-duplicates were collapsed into the first question of each group
+    collapsed: bool = False
+    exact_duplicates: int = 0
+
+
+def parse_row(question, raw_options, raw_correct, raw_explanation=None, raw_topic=None,
+              raw_difficulty=None) -> Question:
+    try:
+        options = ast.literal_eval(raw_options)
+        if not isinstance(options, list) or not all(isinstance(opt, str) for opt in options):
+            raise ValueError("Options must be a list of strings")
+    except (ValueError, SyntaxError):
+        raise ValueError(f"Invalid options format for question: {question}")
+
+    if not options:
+        raise ValueError(f"No valid options for question: {question}")
+
+    try:
+        if pd.isna(raw_correct):
+            raise ValueError("Correct answer indices cannot be empty")
+        correct_indices = [int(idx.strip()) for idx in str(raw_correct).split(",")]
+        for idx in correct_indices:
+            if idx < 0 or idx >= len(options):
+                raise ValueError(f"Correct index {idx} out of range for options")
+        correct_indices = list(set(correct_indices))
+        if len(correct_indices) > 6:
+            raise ValueError("Maximum 6 correct answers allowed")
+        if not correct_indices:
+            raise ValueError("At least one correct answer required")
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid correct answer indices for question: {question}: {str(e)}")
+
+    return Question(
+        text=str(question),
+        options=options,
+        correct_indices=sorted(correct_indices),
+        is_multiple_choice=len(correct_indices) > 1,
+        explanation=parse_optional_text(raw_explanation),
+        topic=parse_optional_text(raw_topic),
+        difficulty=parse_optional_text(raw_difficulty)
+    )
+
+
+def parse_optional_text(raw) -> Optional[str]:
+    if raw is None or pd.isna(raw) or not str(raw).strip():
+        return None
+    return str(raw).strip()
+
+
+def wide_option_columns(columns) -> List[str]:
+    numbered = []
+    for column in columns:
+        match = WIDE_OPTION_COLUMN.fullmatch(str(column))
+        if match:
+            numbered.append((int(match.group(1)), column))
+    return [column for _, column in sorted(numbered)]
+
+
+def detect_layout(columns) -> Optional[str]:
+    if all(col in columns for col in REQUIRED_COLUMNS):
+        return LAYOUT_LIST
+    if "question" in columns and "correct_answer" in columns and wide_option_columns(columns):
+        return LAYOUT_WIDE
+    return None
+
+
+def blank_to_none(column: pd.Series) -> np.ndarray:
+    stripped = column.str.strip()
+    return stripped.where(stripped.notna() & stripped.ne(""), None).to_numpy(dtype=object)
+
+
+def keep_non_blank(column: pd.Series) -> np.ndarray:
+    return np.where(pd.notna(blank_to_none(column)), column.to_numpy(dtype=object), None)
+
+
+def wide_rows(df: pd.DataFrame):
+    # Stack option1..optionN into one matrix and match every answer against its row in one
+    # comparison; only building the per-row option lists is left to the Python loop.
+    option_columns = wide_option_columns(df.columns)
+    options = np.column_stack([blank_to_none(df[column]) for column in option_columns])
+    present = pd.notna(options)
+    answers = blank_to_none(df["correct_answer"])
+    matches = (options == answers[:, None]) & present
+    found = matches.any(axis=1)
+    # Position of the first matching option among the options actually present in the row
+    positions = present.cumsum(axis=1)[np.arange(len(df)), matches.argmax(axis=1)] - 1
+    questions = keep_non_blank(df["question"])
+    explanations, topics, difficulties = optional_columns(df)
+
+    for i, (question, answer, explanation, topic, difficulty) in enumerate(
+            zip(questions, answers, keep_non_blank(explanations), blank_to_none(topics), blank_to_none(difficulties))):
+        yield (question, options[i][present[i]].tolist(), int(positions[i]) if found[i] else None, answer,
+               explanation, topic, difficulty)
+
+
+def optional_columns(df: pd.DataFrame):
+    missing = pd.Series([None] * len(df), index=df.index, dtype=object)
+    return tuple(df[name] if name in df.columns else missing for name in OPTIONAL_COLUMNS)
+
+
+def parse_wide_row(question, options, correct_index, answer, explanation=None, topic=None,
+                   difficulty=None) -> Question:
+    if question is None:
+        raise ValueError("Question text cannot be empty")
+    if not options:
+        raise ValueError(f"No valid options for question: {question}")
+    if answer is None:
+        raise ValueError(f"Correct answer cannot be empty for question: {question}")
+    if correct_index is None:
+        raise ValueError(f"Correct answer '{answer}' does not match any option for question: {question}")
+    return Question(
+        text=question,
+        options=options,
+        correct_indices=[correct_index],
+        is_multiple_choice=False,
+        explanation=explanation,
+        topic=topic,
+        difficulty=difficulty
+    )
+
+
+def parse_csv(file_path: str,
+              progress: Optional[Callable[[ImportProgress], None]] = None,
+              cancel_event: Optional[threading.Event] = None) -> ImportResult:
+    try:
+        df = pd.read_csv(file_path, dtype=str)
+    except FileNotFoundError:
+        raise QuestionImportError(f"CSV file not found: {file_path}")
+    except pd.errors.EmptyDataError:
+        raise QuestionImportError("CSV file is empty")
+    except pd.errors.ParserError:
+        raise QuestionImportError("Invalid CSV format")
+
+    layout = detect_layout(df.columns)
+    if layout == LAYOUT_LIST:
+        parse, rows = parse_row, zip(df["question"], df["options"], df["correct"], *optional_columns(df))
+    elif layout == LAYOUT_WIDE:
+        parse, rows = parse_wide_row, wide_rows(df)
+    else:
+        raise QuestionImportError("CSV missing required columns: 'question', 'options', 'correct' "
+                                  "(or 'question', 'option1'..'optionN', 'correct_answer')")
+
+    state = ImportProgress(rows_total=len(df))
+    result = ImportResult(questions=[])
+    started = time.monotonic()
+    for row_number, row in enumerate(rows, start=2):
+        try:
+            result.questions.append(parse(*row))
+        except Exception as e:
+            state.rows_rejected += 1
+            result.rejected.append(f"Row {row_number}: {str(e)}")
+        state.rows_parsed += 1
+
+        if state.rows_parsed % PROGRESS_INTERVAL == 0:
+            if cancel_event is not None and cancel_event.is_set():
+                raise ImportCancelled()
+            if progress:
+                state.elapsed = time.monotonic() - started
+                progress(state)
+
+    if progress:
+        state.elapsed = time.monotonic() - started
+        progress(state)
+    if not result.questions:
+        raise QuestionImportError("No valid questions found in CSV")
+    return result
+
+
+def parse_compiled(file_path: str) -> ImportResult:
+    from .packed_bank import read_bank_file
+    questions = read_bank_file(file_path)
+    if not questions:
+        raise QuestionImportError("No questions found in compiled bank")
+    return ImportResult(questions=questions, index=load_index(file_path))
+
+
+def parse_file(file_path: str,
+               progress: Optional[Callable[[ImportProgress], None]] = None,
+               cancel_event: Optional[threading.Event] = None) -> ImportResult:
+    from .packed_bank import BANK_EXTENSION
+    if file_path.lower().endswith(BANK_EXTENSION):
+        return parse_compiled(file_path)
+    return parse_csv(file_path, progress=progress, cancel_event=cancel_event)
+
+
+def merge_results(results: Sequence[Tuple[str, ImportResult]]) -> ImportResult:
+    # Files are merged in order and the first copy of every question ID wins, so exact
+    # duplicates within and across files are dropped.
+    merged = ImportResult(questions=[])
+    seen = set()
+    for file_path, result in results:
+        for question in result.questions:
+            question_id = question.question_id
+            if question_id in seen:
+                merged.exact_duplicates += 1
+                continue
+            seen.add(question_id)
+            merged.questions.append(question)
+        name = os.path.basename(file_path)
+        merged.rejected.extend(f"{name}: {reason}" if len(results) > 1 else reason for reason in result.rejected)
+    if len(results) == 1 and not merged.exact_duplicates:
+        merged.index = results[0][1].index
+    return merged
+
+
 class QuestionBank:
     def __init__(self):
         self.questions: List[Question] = []
+        self.index: Optional[SearchIndex] = None
+        self.by_id: Optional[Dict[str, int]] = None
+        self.strata: Optional[StrataIndex] = None
+        self.version_hash: Optional[str] = None
 
-    def load_from_csv(self, file_path: str) -> bool:
-        try:
-            # Try reading the CSV file
-            try:
-                df = pd.read_csv(file_path)
-            except FileNotFoundError:
-                messagebox.showerror("Error", f"CSV file not found: {file_path}")
-                return False
-            except pd.errors.EmptyDataError:
-                messagebox.showerror("Error", "CSV file is empty")
-                return False
-            except pd.errors.ParserError:
-                messagebox.showerror("Error", "Invalid CSV format")
-                return False
-
-            # Check for required columns
-            required_columns = ["question", "options", "correct"]
-            if not all(col in df.columns for col in required_columns):
-                messagebox.showerror("Error", "CSV missing required columns: 'question', 'options', 'correct'")
-                return False
-            
-            self.questions = []
-            for _, row in df.iterrows():
-                try:
-                    # Parse options
-                    try:
-                        options = ast.literal_eval(row["options"])
-                        if not isinstance(options, list) or not all(isinstance(opt, str) for opt in options):
-                            raise ValueError("Options must be a list of strings")
-                    except (ValueError, SyntaxError) as e:
-                        messagebox.showerror("Error", f"Invalid options format for question: {row['question']}")
-                        return False
-                    
-                    if not options:
-                        messagebox.showerror("Error", f"No valid options for question: {row['question']}")
-                        return False
-                    
-                    # Parse correct answers
-                    try:
-                        if pd.isna(row["correct"]):
-                            raise ValueError("Correct answer indices cannot be empty")
-                        correct_indices = [int(idx.strip()) for idx in str(row["correct"]).split(",")]
-                        for idx in correct_indices:
-                            if idx < 0 or idx >= len(options):
-                                raise ValueError(f"Correct index {idx} out of range for options")
-                        correct_indices = list(set(correct_indices))
-                        if len(correct_indices) > 6:
-                            raise ValueError("Maximum 6 correct answers allowed")
-                        if not correct_indices:
-                            raise ValueError("At least one correct answer required")
-                        correct_answers = [options[idx] for idx in correct_indices]
-                    except (ValueError, TypeError) as e:
-                        messagebox.showerror("Error", f"Invalid correct answer indices for question: {row['question']}: {str(e)}")
-                        return False
-                    
-                    self.questions.append(
-                        Question(
-                            text=str(row["question"]),
-                            options=options,
-                            correct_answers=correct_answers,
-                            is_multiple_choice=len(correct_answers) > 1,
-                            user_answers=None,
-                            answer_viewed=False,
-                            flagged=False,
-                            translated_text=None,
-                            translated_options=None
-                        )
-                    )
-                except Exception as e:
-                    messagebox.showerror("Error", f"Failed to process question: {row.get('question', 'Unknown')}: {str(e)}")
-                    return False
-            return True
-        except Exception as e:
-            messagebox.showerror("Error", f"Unexpected error while importing questions: {str(e)}")
-            return False
+    def replace(self, questions: List[Question], index: Optional[SearchIndex] = None):
+        self.questions = questions
+        self.index = index if index is not None and len(index) == len(questions) else None
+        self.by_id = None
+        self.strata = None
+        self.version_hash = None
 
-    def get_random_questions(self, count: int) -> List[Question]:
+    def share(self, name: Optional[str] = None):
+        from .shared_bank import SharedQuestionBank
+        return SharedQuestionBank.create(self.questions, name)
+
+    def load_from_csv(self, file_path: str, strict: bool = True) -> ImportResult:
+        result = parse_csv(file_path)
+        if strict and result.rejected:
+            raise QuestionImportError(result.rejected[0])
+        self.replace(result.questions)
+        return result
+
+    def load_compiled(self, file_path: str) -> ImportResult:
+        result = parse_compiled(file_path)
+        self.replace(result.questions, result.index)
+        return result
+
+    def load_files(self, file_paths: Sequence[str], strict: bool = True) -> ImportResult:
+        results = [(file_path, parse_file(file_path)) for file_path in file_paths]
+        result = merge_results(results)
+        if strict and result.rejected:
+            raise QuestionImportError(result.rejected[0])
+        self.replace(result.questions, result.index)
+        return result
+
+    def save_compiled(self, file_path: str):
+        from .packed_bank import write_bank_file
+        write_bank_file(self.questions, file_path)
         try:
-            sample_size = min(len(self.questions), count)
-            if sample_size <= 0:
-                raise ValueError("No questions available or invalid count")
-            selected_questions = random.sample(self.questions, sample_size)
-            for q in selected_questions:
-                q.user_answers = None
-                q.answer_viewed = False
-                q.flagged = False
-                q.translated_text = None
-                q.translated_options = None
-            return selected_questions
-        except ValueError as e:
-            messagebox.showerror("Error", f"Cannot select questions: {str(e)}")
-            return []
-        except Exception as e:
-            messagebox.showerror("Error", f"Unexpected error while selecting questions: {str(e)}")
-            return []
\ No newline at end of file
+            save_index(self.search_index(), file_path)
+        except OSError as e:
+            raise QuestionImportError(f"Cannot write search index for {file_path}: {e.strerror}")
+
+    def search_index(self) -> SearchIndex:
+        if self.index is None:
+            self.index = SearchIndex.build(self.questions)
+        return self.index
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT) -> List[SearchHit]:
+        return self.search_index().search(query, limit)
+
+    def version(self) -> str:
+        # Hash of the question IDs in bank order: seeded exams draw the same questions only
+        # from a bank with the same version
+        if self.version_hash is None:
+            digest = hashlib.sha256()
+            for q in self.questions:
+                digest.update(q.question_id.encode("ascii"))
+            self.version_hash = digest.hexdigest()[:2 * BANK_VERSION_BYTES]
+        return self.version_hash
+
+    def strata_index(self) -> StrataIndex:
+        if self.strata is None:
+            self.strata = StrataIndex(self.questions)
+        return self.strata
+
+    def id_lookup(self) -> Dict[str, int]:
+        # Maps every question ID to the position of its first question
+        if self.by_id is None:
+            self.by_id = {}
+            for i, question in enumerate(self.questions):
+                self.by_id.setdefault(question.question_id, i)
+        return self.by_id
+
+    def get_question(self, question_id: str) -> Optional[Question]:
+        position = self.id_lookup().get(question_id)
+        return self.questions[position] if position is not None else None
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+    def get_random_questions(self, count: int, topic: Optional[str] = None,
+                             difficulty: Optional[str] = None, rng=random) -> List[Question]:
+        pool = self.questions
+        if topic is not None or difficulty is not None:
+            pool = [q for q in pool if (topic is None or q.topic == topic)
+                    and (difficulty is None or q.difficulty == difficulty)]
+        sample_size = min(len(pool), count)
+        if sample_size <= 0:
+            raise QuestionSelectionError("Cannot select questions: No questions available or invalid count")
+        return rng.sample(pool, sample_size)
+
+    def get_weighted_questions(self, count: int, weights: FenwickTree) -> List[Question]:
+        # weights holds one weight per question position; O(count log n)
+        if len(weights) != len(self.questions):
+            raise QuestionSelectionError("Question weights do not match the question bank")
+        positions = weights.sample(count) if count > 0 else []
+        if not positions:
+            raise QuestionSelectionError("Cannot select questions: No questions available or invalid count")
+        return [self.questions[i] for i in positions]
+
+    def get_blueprint_questions(self, count: int, blueprint: Blueprint, rng=random) -> List[Question]:
+        return [self.questions[i] for i in generate(self.strata_index(), count, blueprint, rng)]
@@ -0,0 +1,180 @@
+# mock_exam_simulator/core/question_store.py
+import json
+import os
+import sqlite3
+from typing import Iterator, List, Optional, Sequence, Tuple
+from ..models.question import Question
+from .errors import QuestionImportError, QuestionSelectionError
+from .packed_bank import BANK_EXTENSION
+from .question_bank import ImportResult, parse_compiled, parse_csv
+
+SCHEMA_VERSION = 2
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS questions (
+    id INTEGER PRIMARY KEY,
+    text TEXT NOT NULL,
+    options TEXT NOT NULL,
+    correct TEXT NOT NULL,
+    explanation TEXT,
+    topic TEXT,
+    difficulty TEXT,
+    content_hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS question_sources (
+    question_id INTEGER NOT NULL REFERENCES questions (id),
+    source_file TEXT NOT NULL,
+    PRIMARY KEY (source_file, question_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_questions_topic_difficulty ON questions (topic, difficulty);
+CREATE INDEX IF NOT EXISTS idx_questions_difficulty ON questions (difficulty);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_questions_content_hash ON questions (content_hash);
+CREATE INDEX IF NOT EXISTS idx_question_sources_question ON question_sources (question_id);
+"""
+# Version 1 kept a single source_file per question, so a question shared by two files only remembered the first
+MIGRATE_V1 = """
+CREATE TABLE question_sources (
+    question_id INTEGER NOT NULL REFERENCES questions (id),
+    source_file TEXT NOT NULL,
+    PRIMARY KEY (source_file, question_id)
+) WITHOUT ROWID;
+INSERT INTO question_sources (question_id, source_file)
+    SELECT id, source_file FROM questions WHERE source_file IS NOT NULL;
+DROP INDEX IF EXISTS idx_questions_source_file;
+ALTER TABLE questions DROP COLUMN source_file;
+"""
+COLUMNS = "text, options, correct, explanation, topic, difficulty"
+FACETS = ("topic", "difficulty", "source_file")
+# Stay well under SQLite's bound-parameter limit when fetching rows by id
+FETCH_CHUNK = 500
+
+
+def _row_to_question(row) -> Question:
+    text, options, correct, explanation, topic, difficulty = row
+    correct_indices = json.loads(correct)
+    return Question(
+        text=text,
+        options=json.loads(options),
+        correct_indices=correct_indices,
+        is_multiple_choice=len(correct_indices) > 1,
+        explanation=explanation,
+        topic=topic,
+        difficulty=difficulty
+    )
+
+
+def _where(topic: Optional[str], difficulty: Optional[str], source_file: Optional[str]) -> Tuple[str, list]:
+    clauses, params = [], []
+    for column, value in (("topic", topic), ("difficulty", difficulty)):
+        if value is not None:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    if source_file is not None:
+        clauses.append("id IN (SELECT question_id FROM question_sources WHERE source_file = ?)")
+        params.append(source_file)
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+class QuestionStore:
+    def __init__(self, path: str):
+        self.path = path
+        try:
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+            if version not in (0, 1, SCHEMA_VERSION):
+                raise QuestionImportError(f"Unsupported question store version: {version}")
+            if version == 1:
+                self.conn.executescript(f"BEGIN; {MIGRATE_V1} PRAGMA user_version = {SCHEMA_VERSION}; COMMIT;")
+            self.conn.executescript(SCHEMA)
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        except sqlite3.DatabaseError as e:
+            raise QuestionImportError(f"Cannot open question store {path}: {e}")
+
+    def add_questions(self, questions: Sequence[Question], source_file: Optional[str] = None) -> int:
+        rows = ((q.text, json.dumps(q.options, ensure_ascii=False), json.dumps(q.correct_indices),
+                 q.explanation, q.topic, q.difficulty, q.content_hash) for q in questions)
+        with self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                f"INSERT OR IGNORE INTO questions ({COLUMNS}, content_hash) VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            added = self.conn.total_changes - before
+            if source_file is not None:
+                # Questions that were already stored are linked too, so every file that contains them is recorded
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO question_sources (question_id, source_file) "
+                    "SELECT id, ? FROM questions WHERE content_hash = ?",
+                    ((source_file, q.content_hash) for q in questions))
+        return added
+
+    def import_file(self, file_path: str) -> Tuple[ImportResult, int]:
+        if file_path.lower().endswith(BANK_EXTENSION):
+            result = parse_compiled(file_path)
+        else:
+            result = parse_csv(file_path)
+        return result, self.add_questions(result.questions, os.path.basename(file_path))
+
+    def remove_source(self, source_file: str) -> int:
+        # Questions another file still contains stay in the store; only their link to this file goes
+        with self.conn:
+            removed = self.conn.execute(
+                "DELETE FROM questions WHERE id IN (SELECT question_id FROM question_sources WHERE source_file = ?) "
+                "AND NOT EXISTS (SELECT 1 FROM question_sources AS other "
+                "WHERE other.question_id = questions.id AND other.source_file != ?)",
+                (source_file, source_file)).rowcount
+            self.conn.execute("DELETE FROM question_sources WHERE source_file = ?", (source_file,))
+        return removed
+
+    def count(self, topic: Optional[str] = None, difficulty: Optional[str] = None,
+              source_file: Optional[str] = None) -> int:
+        where, params = _where(topic, difficulty, source_file)
+        return self.conn.execute(f"SELECT COUNT(*) FROM questions{where}", params).fetchone()[0]
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def facet(self, column: str) -> List[Tuple[Optional[str], int]]:
+        if column not in FACETS:
+            raise ValueError(f"Unknown facet: {column}")
+        if column == "source_file":
+            return self.conn.execute(
+                "SELECT source_file, COUNT(*) FROM question_sources GROUP BY source_file ORDER BY source_file"
+            ).fetchall()
+        return self.conn.execute(
+            f"SELECT {column}, COUNT(*) FROM questions GROUP BY {column} ORDER BY {column}").fetchall()
+
+    def sample_ids(self, count: int, topic: Optional[str] = None, difficulty: Optional[str] = None,
+                   source_file: Optional[str] = None) -> List[int]:
+        # Only ids are shuffled, and the filter columns are indexed, so the sort never touches the texts.
+        where, params = _where(topic, difficulty, source_file)
+        rows = self.conn.execute(f"SELECT id FROM questions{where} ORDER BY random() LIMIT ?", params + [count])
+        return [row[0] for row in rows]
+
+    def get(self, ids: Sequence[int]) -> List[Question]:
+        found = {}
+        for start in range(0, len(ids), FETCH_CHUNK):
+            chunk = list(ids[start:start + FETCH_CHUNK])
+            placeholders = ", ".join("?" * len(chunk))
+            for row in self.conn.execute(f"SELECT id, {COLUMNS} FROM questions WHERE id IN ({placeholders})", chunk):
+                found[row[0]] = _row_to_question(row[1:])
+        return [found[i] for i in ids if i in found]
+
+    def get_random_questions(self, count: int, topic: Optional[str] = None, difficulty: Optional[str] = None,
+                             source_file: Optional[str] = None) -> List[Question]:
+        ids = self.sample_ids(count, topic, difficulty, source_file) if count > 0 else []
+        if not ids:
+            raise QuestionSelectionError("Cannot select questions: No questions available or invalid count")
+        return self.get(ids)
+
+    def iter_questions(self, topic: Optional[str] = None, difficulty: Optional[str] = None,
+                       source_file: Optional[str] = None) -> Iterator[Question]:
+        where, params = _where(topic, difficulty, source_file)
+        for row in self.conn.execute(f"SELECT {COLUMNS} FROM questions{where} ORDER BY id", params):
+            yield _row_to_question(row)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,103 @@
+# mock_exam_simulator/core/scoring.py
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from ..models.question import Question, QuestionState
+
+VIEW_INCORRECT = "incorrect"
+VIEW_FLAGGED = "flagged"
+VIEW_FLAGGED_AND_INCORRECT = "flagged_and_incorrect"
+
+VIEW_TITLES = {
+    VIEW_INCORRECT: "Incorrect or Skipped",
+    VIEW_FLAGGED: "Flagged",
+    VIEW_FLAGGED_AND_INCORRECT: "Flagged and Incorrect",
+}
+
+
+def is_correct(question: Question, state: QuestionState) -> bool:
+    return bool(state.user_answers) and sorted(state.user_answers) == question.correct_indices
+
+
+@dataclass
+class ResultItem:
+    number: int
+    question: str
+    your_answers: str
+    correct_answers: str
+    answer_viewed: bool
+    flagged: bool
+    is_correct: bool
+    explanation: Optional[str] = None
+
+
+@dataclass
+class ExamResult:
+    questions: List[Question]
+    states: List[QuestionState]
+    correct: List[bool]
+    penalties: int
+    views: Dict[str, List[int]] = field(default_factory=dict)
+
+    @property
+    def total(self) -> int:
+        return len(self.questions)
+
+    @property
+    def correct_count(self) -> int:
+        return sum(self.correct)
+
+    @property
+    def score(self) -> int:
+        return max(self.correct_count - self.penalties, 0)
+
+    @property
+    def percentage(self) -> float:
+        return (self.score / self.total) * 100 if self.total > 0 else 0
+
+    def view_size(self, view: str) -> int:
+        return len(self.views[view])
+
+    def page_count(self, view: str, page_size: int) -> int:
+        return max((self.view_size(view) + page_size - 1) // page_size, 1)
+
+    def item(self, view: str, position: int) -> ResultItem:
+        index = self.views[view][position]
+        q = self.questions[index]
+        state = self.states[index]
+        return ResultItem(
+            # The question's number in the exam, not its place in the view
+            number=index + 1,
+            question=q.text,
+            your_answers=", ".join(q.option_texts(state.user_answers)) if state.user_answers else "Skipped or Viewed",
+            correct_answers=", ".join(q.correct_answers),
+            answer_viewed=state.answer_viewed,
+            flagged=state.flagged,
+            is_correct=self.correct[index],
+            explanation=q.explanation
+        )
+
+    def page(self, view: str, page_index: int, page_size: int) -> List[ResultItem]:
+        start = page_index * page_size
+        stop = min(start + page_size, self.view_size(view))
+        return [self.item(view, pos) for pos in range(start, stop)]
+
+    def iter_items(self, view: str):
+        for pos in range(self.view_size(view)):
+            yield self.item(view, pos)
+
+
+def grade(questions: List[Question], states: List[QuestionState], penalties: int) -> ExamResult:
+    correct = [is_correct(q, state) for q, state in zip(questions, states)]
+    incorrect = [i for i, ok in enumerate(correct) if not ok]
+    flagged = [i for i, state in enumerate(states) if state.flagged]
+    return ExamResult(
+        questions=questions,
+        states=states,
+        correct=correct,
+        penalties=penalties,
+        views={
+            VIEW_INCORRECT: incorrect,
+            VIEW_FLAGGED: flagged,
+            VIEW_FLAGGED_AND_INCORRECT: [i for i in incorrect if states[i].flagged],
+        }
+    )
@@ -0,0 +1,255 @@
+# mock_exam_simulator/core/search_index.py
+import hashlib
+import os
+import re
+import struct
+from bisect import bisect_left
+from dataclasses import dataclass
+from itertools import chain
+from typing import List, Optional, Sequence
+import numpy as np
+import pandas as pd
+from ..models.question import Question
+
+# Layout (little-endian, every section 8-byte aligned):
+#   header   MAGIC, version, question count, term count, posting count, terms size, bank digest
+#   starts   u64[terms + 1]  posting spans per term
+#   docs     u32[postings]   question indices, ascending within each term
+#   weights  f32[postings]   saturated term frequency of the term in the question
+#   terms    UTF-8 terms in sorted order, separated by newlines
+MAGIC = b"MEXINDEX"
+INDEX_VERSION = 1
+HEADER = struct.Struct("<8sIIQQQ32s")
+INDEX_EXTENSION = ".idx"
+TOKEN_PATTERN = re.compile(r"\w+")
+# A term in the question text counts twice as much as one in an option
+TEXT_WEIGHT = 2.0
+# Terms that only start with a query token rank below exact matches
+PREFIX_WEIGHT = 0.5
+MIN_PREFIX_LENGTH = 2
+# Rough cost of one binary-search lookup relative to one posting of a dense scan
+LOOKUP_COST = 20
+# Queries whose rarest token matches more than 1/DENSE_SHARE of the bank are scored densely
+DENSE_SHARE = 8
+DEFAULT_LIMIT = 20
+LAST_CHAR = "\U0010ffff"
+
+
+# Maps every ASCII byte that \w does not match to a space
+ASCII_SEPARATORS = bytes(c if chr(c).isalnum() or chr(c) == "_" else 32 for c in range(256))
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.casefold())
+
+
+def encoded_tokens(text: str) -> List[bytes]:
+    # Same tokens as tokenize, but ASCII text is split as bytes, which is several times
+    # faster than the regex when indexing a whole bank.
+    if text.isascii():
+        return text.encode("ascii").lower().translate(ASCII_SEPARATORS).split()
+    return [token.encode("utf-8") for token in tokenize(text)]
+
+
+def _align(size: int) -> int:
+    return (size + 7) & ~7
+
+
+def _sections(terms: int, postings: int, terms_size: int):
+    offset = _align(HEADER.size)
+    sections = {}
+    for name, length in (("starts", (terms + 1) * 8),
+                         ("docs", postings * 4),
+                         ("weights", postings * 4),
+                         ("terms", terms_size)):
+        sections[name] = (offset, length)
+        offset = _align(offset + length)
+    return sections, offset
+
+
+@dataclass
+class SearchHit:
+    index: int
+    score: float
+
+
+class SearchIndex:
+    def __init__(self, count: int, terms: List[str], starts: np.ndarray, docs: np.ndarray,
+                 weights: np.ndarray):
+        self.count = count
+        self.terms = terms
+        self.starts = starts
+        self.docs = docs
+        self.weights = weights
+        frequencies = np.diff(starts)
+        self.idf = np.log1p(count / np.maximum(frequencies, 1))
+
+    @classmethod
+    def build(cls, questions: Sequence[Question]) -> "SearchIndex":
+        count = len(questions)
+        tokens = [encoded_tokens(q.text) for q in questions] + \
+            [encoded_tokens("\n".join(q.options)) for q in questions]
+        lengths = np.fromiter(map(len, tokens), dtype=np.int64, count=len(tokens))
+        codes, terms = pd.factorize(np.fromiter(chain.from_iterable(tokens), dtype=object, count=lengths.sum()))
+        del tokens
+        terms = [term.decode("utf-8") for term in terms]
+        # Renumber the terms in sorted order so prefixes are contiguous ranges
+        order = np.array(sorted(range(len(terms)), key=terms.__getitem__), dtype=np.int64)
+        ranks = np.empty_like(order)
+        ranks[order] = np.arange(len(order))
+
+        # One key per occurrence: term, then question, then whether it came from the question
+        # text in the lowest bit. Sorting the keys groups the postings without an argsort.
+        doc_ids = np.repeat(np.tile(np.arange(count, dtype=np.int64), 2), lengths)
+        from_text = np.repeat(np.repeat(np.array([1, 0], dtype=np.int64), count), lengths)
+        keys = np.sort((ranks[codes] * max(count, 1) + doc_ids) * 2 + from_text)
+        occurrence_weights = np.where(keys & 1, TEXT_WEIGHT, 1.0)
+        postings = keys >> 1
+        firsts = np.flatnonzero(np.r_[True, postings[1:] != postings[:-1]]) if len(postings) else postings
+        frequencies = np.add.reduceat(occurrence_weights, firsts) if len(firsts) else occurrence_weights
+        postings = postings[firsts]
+
+        starts = np.searchsorted(postings // max(count, 1), np.arange(len(terms) + 1)).astype(np.uint64)
+        return cls(count, [terms[i] for i in order], starts, (postings % max(count, 1)).astype(np.uint32),
+                   (frequencies / (frequencies + 1)).astype(np.float32))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _term_range(self, token: str):
+        first = bisect_left(self.terms, token)
+        if len(token) >= MIN_PREFIX_LENGTH:
+            last = bisect_left(self.terms, token + LAST_CHAR, first)
+        else:
+            last = first + (first < len(self.terms) and self.terms[first] == token)
+        return first, last
+
+    def _factors(self, token: str, first: int, last: int) -> np.ndarray:
+        factors = self.idf[first:last] * PREFIX_WEIGHT
+        if self.terms[first] == token:
+            factors[0] = self.idf[first]
+        return factors
+
+    def _dense_scores(self, token: str, first: int, last: int) -> np.ndarray:
+        # Sorted terms keep the postings of a prefix range contiguous
+        starts = self.starts[first:last + 1].astype(np.int64)
+        span = slice(starts[0], starts[-1])
+        weights = self.weights[span] * np.repeat(self._factors(token, first, last), np.diff(starts))
+        return np.bincount(self.docs[span], weights=weights, minlength=self.count)
+
+    def _candidate_scores(self, token: str, first: int, last: int, candidates: np.ndarray) -> np.ndarray:
+        scores = np.zeros(len(candidates))
+        for term, factor in zip(range(first, last), self._factors(token, first, last)):
+            start, stop = int(self.starts[term]), int(self.starts[term + 1])
+            docs = self.docs[start:stop]
+            positions = np.minimum(np.searchsorted(docs, candidates), len(docs) - 1)
+            found = docs[positions] == candidates
+            scores[found] += self.weights[start + positions[found]] * factor
+        return scores
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT) -> List[SearchHit]:
+        # Every query token has to match; the last one is usually still being typed, so
+        # tokens also match as prefixes of longer terms.
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens or not self.count or limit < 1:
+            return []
+        ranges = [(token, *self._term_range(token)) for token in tokens]
+        if any(first == last for _, first, last in ranges):
+            return []
+        ranges.sort(key=lambda r: int(self.starts[r[2]] - self.starts[r[1]]))
+
+        # Start from the token with the fewest postings. When even that one matches a large
+        # share of the bank every token is scored densely; otherwise the other tokens are
+        # only looked up for the questions still in the running.
+        token, first, last = ranges[0]
+        scores = self._dense_scores(token, first, last)
+        if int(self.starts[last] - self.starts[first]) * DENSE_SHARE > self.count:
+            matched = scores > 0
+            for token, first, last in ranges[1:]:
+                token_scores = self._dense_scores(token, first, last)
+                scores += token_scores
+                matched &= token_scores > 0
+            candidates = np.flatnonzero(matched)
+            scores = scores[candidates]
+        else:
+            candidates = np.flatnonzero(scores)
+            scores = scores[candidates]
+            for token, first, last in ranges[1:]:
+                postings = int(self.starts[last] - self.starts[first])
+                if len(candidates) * (last - first) * LOOKUP_COST < postings + self.count:
+                    token_scores = self._candidate_scores(token, first, last, candidates)
+                else:
+                    token_scores = self._dense_scores(token, first, last)[candidates]
+                keep = token_scores > 0
+                candidates, scores = candidates[keep], scores[keep] + token_scores[keep]
+
+        if len(candidates) > limit:
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            candidates, scores = candidates[top], scores[top]
+        ranked = sorted(zip(candidates.tolist(), scores.tolist()), key=lambda hit: (-hit[1], hit[0]))
+        return [SearchHit(index=index, score=score) for index, score in ranked]
+
+    def to_bytes(self, bank_digest: bytes = b"") -> bytes:
+        terms = "\n".join(self.terms).encode("utf-8")
+        sections, size = _sections(len(self.terms), len(self.docs), len(terms))
+        buffer = bytearray(size)
+        HEADER.pack_into(buffer, 0, MAGIC, INDEX_VERSION, self.count, len(self.terms), len(self.docs),
+                         len(terms), bank_digest)
+        for name, data in (("starts", self.starts.astype("<u8").tobytes()),
+                           ("docs", self.docs.astype("<u4").tobytes()),
+                           ("weights", self.weights.astype("<f4").tobytes()),
+                           ("terms", terms)):
+            offset, length = sections[name]
+            buffer[offset:offset + length] = data
+        return bytes(buffer)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, bank_digest: bytes = b"") -> Optional["SearchIndex"]:
+        if len(data) < HEADER.size:
+            return None
+        magic, version, count, terms, postings, terms_size, digest = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != INDEX_VERSION or digest != bank_digest.ljust(32, b"\x00"):
+            return None
+        sections, size = _sections(terms, postings, terms_size)
+        if len(data) < size:
+            return None
+
+        def section(name, dtype):
+            offset, length = sections[name]
+            return np.frombuffer(data, dtype=dtype, count=length // np.dtype(dtype).itemsize, offset=offset)
+
+        offset, length = sections["terms"]
+        term_list = data[offset:offset + length].decode("utf-8").split("\n") if terms else []
+        return cls(count, term_list, section("starts", "<u8"), section("docs", "<u4"),
+                   section("weights", "<f4"))
+
+
+def index_path(bank_path: str) -> str:
+    return os.path.splitext(bank_path)[0] + INDEX_EXTENSION
+
+
+def file_digest(file_path: str) -> bytes:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def save_index(index: SearchIndex, bank_path: str):
+    # The index records which bank it was built from, so a rewritten bank never
+    # picks up an outdated index.
+    data = index.to_bytes(file_digest(bank_path))
+    temp_path = index_path(bank_path) + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(data)
+    os.replace(temp_path, index_path(bank_path))
+
+
+def load_index(bank_path: str) -> Optional[SearchIndex]:
+    try:
+        with open(index_path(bank_path), "rb") as f:
+            data = f.read()
+        return SearchIndex.from_bytes(data, file_digest(bank_path))
+    except (OSError, UnicodeDecodeError):
+        return None
@@ -0,0 +1,178 @@
+# mock_exam_simulator/core/session.py
+import time
+from typing import Callable, List, Optional
+from ..models.question import Question, QuestionState
+from .errors import SessionError, TranslationError
+from .scoring import ExamResult, grade
+
+MODE_EXAM = "exam"
+MODE_PRACTICE = "practice"
+MODE_WEAKNESS = "weakness"
+MODE_ADAPTIVE = "adaptive"
+SESSION_MODES = (MODE_EXAM, MODE_PRACTICE, MODE_WEAKNESS, MODE_ADAPTIVE)
+# Option orders are kept as bytes, so questions with more options keep the bank order
+MAX_SHUFFLED_OPTIONS = 256
+
+class ExamSession:
+    def __init__(self, questions: List[Question], time_limit_seconds: int = 0,
+                 clock: Callable[[], float] = time.monotonic, descriptor: Optional[str] = None,
+                 option_rng=None):
+        if not questions:
+            raise SessionError("Cannot start an exam without questions")
+        self.questions = questions
+        # Shuffles the options of each question when given; the questions themselves are shared
+        # with the bank and never reordered, answers are stored as bank option indices.
+        self.option_rng = option_rng
+        self.states = [self._new_state(q) for q in questions]
+        self.current_index: int = 0
+        self.penalties: int = 0
+        self.time_remaining: int = time_limit_seconds
+        self.result: Optional[ExamResult] = None
+        self.clock = clock
+        self.visit_started = clock()
+        # Exam code the questions were drawn from, when they can be drawn again
+        self.descriptor = descriptor
+
+    @property
+    def total(self) -> int:
+        return len(self.questions)
+
+    @property
+    def length(self) -> int:
+        # Questions the exam will have once finished; sessions choosing them as they go grow to it
+        return self.total
+
+    @property
+    def current_question(self) -> Question:
+        return self.questions[self.current_index]
+
+    @property
+    def current_state(self) -> QuestionState:
+        return self.states[self.current_index]
+
+    @property
+    def submitted(self) -> bool:
+        return self.result is not None
+
+    @property
+    def is_first(self) -> bool:
+        return self.current_index == 0
+
+    @property
+    def is_last(self) -> bool:
+        return self.current_index == self.total - 1
+
+    def _new_state(self, question: Question) -> QuestionState:
+        state = QuestionState()
+        count = len(question.options)
+        if self.option_rng is not None and 1 < count <= MAX_SHUFFLED_OPTIONS:
+            order = list(range(count))
+            self.option_rng.shuffle(order)
+            positions = bytearray(count)
+            for position, index in enumerate(order):
+                positions[index] = position
+            state.option_order, state.option_positions = bytes(order), bytes(positions)
+        return state
+
+    def _check_open(self):
+        if self.submitted:
+            raise SessionError("Exam has already been submitted")
+
+    def _leave(self):
+        # Time counts towards the question on screen until the candidate moves on
+        now = self.clock()
+        if not self.submitted:
+            self.current_state.time_spent += now - self.visit_started
+        self.visit_started = now
+
+    def go_to(self, index: int):
+        if not 0 <= index < self.total:
+            raise SessionError(f"Question index {index} out of range")
+        if index != self.current_index:
+            self._leave()
+            self.current_index = index
+
+    def next(self) -> bool:
+        if self.is_last:
+            return False
+        self._leave()
+        self.current_index += 1
+        return True
+
+    def prev(self) -> bool:
+        if self.is_first:
+            return False
+        self._leave()
+        self.current_index -= 1
+        return True
+
+    def answer(self, indices: List[int], index: Optional[int] = None):
+        # indices are positions of the options as shown
+        self._check_open()
+        index = self.current_index if index is None else index
+        question = self.questions[index]
+        state = self.states[index]
+        if any(idx < 0 or idx >= len(question.options) for idx in indices):
+            raise SessionError(f"Answer out of range for question {index + 1}")
+        if not question.is_multiple_choice and len(indices) > 1:
+            raise SessionError(f"Question {index + 1} accepts a single answer")
+        state.user_answers = sorted({state.option_index(idx) for idx in indices}) if indices else None
+
+    def shown_answers(self, index: Optional[int] = None) -> Optional[List[int]]:
+        state = self.states[self.current_index if index is None else index]
+        if state.user_answers is None:
+            return None
+        return sorted(state.shown_position(idx) for idx in state.user_answers)
+
+    def skip(self, index: Optional[int] = None):
+        self._check_open()
+        self.states[self.current_index if index is None else index].user_answers = None
+
+    def toggle_flag(self, index: Optional[int] = None) -> bool:
+        self._check_open()
+        state = self.states[self.current_index if index is None else index]
+        state.flagged = not state.flagged
+        return state.flagged
+
+    def view_answer(self, index: Optional[int] = None) -> List[str]:
+        self._check_open()
+        index = self.current_index if index is None else index
+        state = self.states[index]
+        if not state.answer_viewed:
+            state.answer_viewed = True
+            self.penalties += 1
+        state.user_answers = []
+        return self.questions[index].correct_answers
+
+    def translate(self, translator, index: Optional[int] = None) -> QuestionState:
+        index = self.current_index if index is None else index
+        question = self.questions[index]
+        state = self.states[index]
+        if not state.translated_text or not state.translated_options:
+            try:
+                state.translated_text, state.translated_options = translator.translate_question(
+                    question.text, question.options)
+            except TranslationError:
+                state.translated_text = question.text
+                state.translated_options = question.options
+                raise
+        return state
+
+    def answer_summary(self, index: int) -> str:
+        state = self.states[index]
+        if not state.user_answers:
+            return "Skipped or Viewed"
+        return ", ".join(self.questions[index].option_texts(state.user_answers))
+
+    def unanswered(self) -> List[int]:
+        return [i for i, state in enumerate(self.states) if not state.user_answers and not state.answer_viewed]
+
+    def tick(self, seconds: int = 1) -> bool:
+        self.time_remaining = max(self.time_remaining - seconds, 0)
+        return self.time_remaining == 0
+
+    def submit(self) -> ExamResult:
+        if self.result is None:
+            self._leave()
+            self.result = grade(self.questions, self.states, self.penalties)
+        return self.result
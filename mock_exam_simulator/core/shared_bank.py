@@ -0,0 +1,88 @@
+# mock_exam_simulator/core/shared_bank.py
+import random
+import sys
+import threading
+from multiprocessing import resource_tracker, shared_memory
+from typing import List, Optional, Sequence
+from ..models.question import Question
+from .errors import QuestionSelectionError
+from .packed_bank import PackedBank, PackedLayout
+
+# Held around every segment creation and attach in this process, so no other thread
+# creates a segment while resource_tracker.register is swapped out
+_TRACKER_LOCK = threading.Lock()
+
+
+def _attach_untracked(name: str) -> shared_memory.SharedMemory:
+    # Attaching must not register the segment with the resource tracker: it would be
+    # unlinked when the worker exits, and only the creating process owns it.
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # Unregistering after the attach would drop the creator's entry too, as workers share its
+    # tracker; register is swapped out instead, and only while holding the creation lock.
+    with _TRACKER_LOCK:
+        register = resource_tracker.register
+        resource_tracker.register = lambda *args, **kwargs: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+class SharedQuestionBank:
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm = shm
+        self.owner = owner
+        self.bank = PackedBank(shm.buf)
+
+    @classmethod
+    def create(cls, questions: Sequence[Question], name: Optional[str] = None) -> "SharedQuestionBank":
+        layout = PackedLayout(questions)
+        with _TRACKER_LOCK:
+            shm = shared_memory.SharedMemory(name=name, create=True, size=max(layout.size, 1))
+        layout.write_into(shm.buf)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedQuestionBank":
+        return cls(_attach_untracked(name), owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def questions(self) -> PackedBank:
+        return self.bank
+
+    def __len__(self) -> int:
+        return len(self.bank)
+
+    def __getitem__(self, index: int) -> Question:
+        return self.bank[index]
+
+    def get_random_questions(self, count: int, topic: Optional[str] = None,
+                             difficulty: Optional[str] = None) -> List[Question]:
+        pool = range(len(self.bank))
+        if topic is not None or difficulty is not None:
+            field = self.bank.field
+            pool = [i for i in pool if (topic is None or field("topic", i) == topic)
+                    and (difficulty is None or field("difficulty", i) == difficulty)]
+        sample_size = min(len(pool), count)
+        if sample_size <= 0:
+            raise QuestionSelectionError("Cannot select questions: No questions available or invalid count")
+        return [self.bank[i] for i in random.sample(pool, sample_size)]
+
+    def close(self):
+        if self.bank is not None:
+            self.bank.release()
+            self.bank = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
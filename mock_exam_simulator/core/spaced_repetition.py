@@ -0,0 +1,186 @@
+# mock_exam_simulator/core/spaced_repetition.py
+import heapq
+import random
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+from ..models.question import Question, QuestionState
+from .errors import HistoryError, QuestionSelectionError
+from .scoring import ExamResult
+
+# Review state lives next to the attempt history; WITHOUT ROWID keeps each candidate's
+# rows together on disk, so loading one candidate is a single range read.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reviews (
+    candidate TEXT NOT NULL,
+    question_id TEXT NOT NULL,
+    repetitions INTEGER NOT NULL,
+    interval_days REAL NOT NULL,
+    ease REAL NOT NULL,
+    due REAL NOT NULL,
+    PRIMARY KEY (candidate, question_id)
+) WITHOUT ROWID;
+"""
+DAY = 86400.0
+# SM-2 parameters
+INITIAL_EASE = 2.5
+MIN_EASE = 1.3
+FIRST_INTERVAL_DAYS = 1.0
+SECOND_INTERVAL_DAYS = 6.0
+PASSING_QUALITY = 3
+# Random draws tried per new question before the session falls back to questions due soon
+NEW_QUESTION_TRIES = 4
+# The heap is rebuilt once stale entries outnumber the live ones
+COMPACT_RATIO = 2
+
+
+@dataclass
+class ReviewState:
+    repetitions: int = 0
+    interval_days: float = 0.0
+    ease: float = INITIAL_EASE
+    due: float = 0.0
+
+
+def answer_quality(correct: bool, state: QuestionState) -> int:
+    # SM-2 grades recall from 0 to 5; a flag means the candidate was unsure
+    if state.answer_viewed:
+        return 1
+    if not state.user_answers:
+        return 0
+    if correct:
+        return 4 if state.flagged else 5
+    return 2
+
+
+def schedule(review: ReviewState, quality: int, now: float) -> ReviewState:
+    if quality >= PASSING_QUALITY:
+        repetitions = review.repetitions + 1
+        if repetitions == 1:
+            interval = FIRST_INTERVAL_DAYS
+        elif repetitions == 2:
+            interval = SECOND_INTERVAL_DAYS
+        else:
+            interval = review.interval_days * review.ease
+    else:
+        repetitions, interval = 0, FIRST_INTERVAL_DAYS
+    ease = max(review.ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02), MIN_EASE)
+    return ReviewState(repetitions, interval, ease, now + interval * DAY)
+
+
+class ReviewQueue:
+    def __init__(self, states: Dict[str, ReviewState]):
+        self.states = states
+        self.rebuild()
+
+    def rebuild(self):
+        # A sorted list is already a valid heap
+        self.heap = sorted((state.due, question_id) for question_id, state in self.states.items())
+
+    def push(self, question_id: str, state: ReviewState):
+        # The previous entry of the question stays in the heap and is skipped once its due
+        # time no longer matches the state.
+        self.states[question_id] = state
+        heapq.heappush(self.heap, (state.due, question_id))
+        if len(self.heap) > COMPACT_RATIO * len(self.states):
+            self.rebuild()
+
+    def take(self, count: int, until: float, accept: Callable[[str], bool], exclude=()) -> List[str]:
+        # Pops up to count accepted questions due by `until`, most overdue first, and pushes
+        # them back: they stay due until they are actually reviewed. O(count log n) unless
+        # many entries are stale or rejected.
+        taken, popped = [], []
+        while self.heap and len(taken) < count and self.heap[0][0] <= until:
+            entry = heapq.heappop(self.heap)
+            due, question_id = entry
+            state = self.states.get(question_id)
+            if state is None or state.due != due:
+                continue
+            popped.append(entry)
+            if question_id not in exclude and accept(question_id):
+                taken.append(question_id)
+        for entry in popped:
+            heapq.heappush(self.heap, entry)
+        return taken
+
+
+class SpacedRepetition:
+    def __init__(self, path: str):
+        self.path = path
+        self.queues: Dict[str, ReviewQueue] = {}
+        try:
+            # The exam server uses each store from a single worker thread
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode = WAL")
+            self.conn.execute("PRAGMA synchronous = NORMAL")
+            self.conn.executescript(SCHEMA)
+        except sqlite3.DatabaseError as e:
+            raise HistoryError(f"Cannot open review state {path}: {e}")
+
+    def queue(self, candidate: str = "") -> ReviewQueue:
+        if candidate not in self.queues:
+            rows = self.conn.execute(
+                "SELECT question_id, repetitions, interval_days, ease, due FROM reviews WHERE candidate = ?",
+                (candidate,))
+            self.queues[candidate] = ReviewQueue({row[0]: ReviewState(*row[1:]) for row in rows})
+        return self.queues[candidate]
+
+    def due_count(self, candidate: str = "", now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        return self.conn.execute("SELECT COUNT(*) FROM reviews WHERE candidate = ? AND due <= ?",
+                                 (candidate, now)).fetchone()[0]
+
+    def practice_questions(self, question_bank, count: int, candidate: str = "",
+                           now: Optional[float] = None, rng=random) -> List[Question]:
+        # Due questions first, then questions never seen, then those coming due soonest
+        now = time.time() if now is None else now
+        queue = self.queue(candidate)
+        in_bank = lambda question_id: question_bank.get_question(question_id) is not None
+        chosen = queue.take(count, now, in_bank)
+
+        questions = question_bank.questions
+        picked = set(chosen)
+        for _ in range(min(count - len(chosen), len(questions)) * NEW_QUESTION_TRIES):
+            if len(chosen) == count:
+                break
+            question_id = questions[rng.randrange(len(questions))].question_id
+            if question_id not in queue.states and question_id not in picked:
+                chosen.append(question_id)
+                picked.add(question_id)
+        if len(chosen) < count:
+            chosen.extend(queue.take(count - len(chosen), float("inf"), in_bank, picked))
+
+        if not chosen:
+            raise QuestionSelectionError("Cannot select questions: No questions available or invalid count")
+        return [question_bank.get_question(question_id) for question_id in chosen]
+
+    def review(self, result: ExamResult, candidate: str = "", now: Optional[float] = None):
+        now = time.time() if now is None else now
+        queue = self.queue(candidate)
+        scheduled: Dict[str, ReviewState] = {}
+        for q, state, correct in zip(result.questions, result.states, result.correct):
+            question_id = q.question_id
+            previous = scheduled.get(question_id) or queue.states.get(question_id, ReviewState())
+            scheduled[question_id] = schedule(previous, answer_quality(correct, state), now)
+        rows = [(candidate, question_id, review.repetitions, review.interval_days, review.ease, review.due)
+                for question_id, review in scheduled.items()]
+        try:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO reviews (candidate, question_id, repetitions, interval_days, ease, due) "
+                    "VALUES (?, ?, ?, ?, ?, ?)", rows)
+        except sqlite3.DatabaseError as e:
+            raise HistoryError(f"Cannot save review state in {self.path}: {e}")
+        # Only saved reviews reach the queue, so a failed save cannot leave it ahead of the database
+        for question_id, review in scheduled.items():
+            queue.push(question_id, review)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,19 +1,25 @@
+from typing import List, Tuple
 from deep_translator import GoogleTranslator
-from tkinter import messagebox
+from .errors import TranslationError
 
 class Translator:
     def __init__(self, source_lang: str, target_lang: str):
         try:
             self.translator = GoogleTranslator(source=source_lang, target=target_lang)
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to initialize translator: {str(e)}")
-            raise
+            raise TranslationError(f"Failed to initialize translator: {str(e)}") from e
 
     def translate(self, text: str) -> str:
+        if not text or not isinstance(text, str):
+            raise TranslationError("Failed to translate text: Invalid text for translation")
         try:
-            if not text or not isinstance(text, str):
-                raise ValueError("Invalid text for translation")
             return self.translator.translate(text)
         except Exception as e:
-            messagebox.showerror("Translation Error", f"Failed to translate text: {str(e)}")
-            return text  # Return original text as fallback
\ No newline at end of file
+            raise TranslationError(f"Failed to translate text: {str(e)}") from e
+
+    def translate_question(self, text: str, options: List[str]) -> Tuple[str, List[str]]:
+        translated_text = self.translate(text)
+        translated_options = [self.translate(opt) for opt in options]
+        if not translated_options or None in translated_options or len(translated_options) != len(options):
+            raise TranslationError("Incomplete or invalid translation of options")
+        return translated_text, translated_options
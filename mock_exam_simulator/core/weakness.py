@@ -0,0 +1,118 @@
+# mock_exam_simulator/core/weakness.py
+import sqlite3
+import time
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from ..models.question import Question
+from .errors import HistoryError
+from .scoring import ExamResult
+from .weighted_sampling import FenwickTree
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS weakness (
+    candidate TEXT NOT NULL,
+    question_id TEXT NOT NULL,
+    errors REAL NOT NULL,
+    answers REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (candidate, question_id)
+) WITHOUT ROWID;
+"""
+DAY = 86400.0
+# Answers lose half their weight every HALF_LIFE_DAYS, so recent mistakes count the most
+HALF_LIFE_DAYS = 14.0
+# A question never answered counts as one error in two answers
+PRIOR_ERRORS = 1.0
+PRIOR_ANSWERS = 2.0
+# Questions answered reliably still turn up now and then
+MIN_WEIGHT = 0.05
+
+
+def decay(age_seconds):
+    return np.exp2(-np.maximum(age_seconds, 0.0) / (HALF_LIFE_DAYS * DAY))
+
+
+def error_weight(errors, answers):
+    return MIN_WEIGHT + (errors + PRIOR_ERRORS) / (answers + PRIOR_ANSWERS)
+
+
+class WeaknessModel:
+    def __init__(self, path: str):
+        self.path = path
+        self.counts: Dict[str, Dict[str, Tuple[float, float, float]]] = {}
+        self.trees: Dict[str, tuple] = {}
+        try:
+            # The exam server uses each store from a single worker thread
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode = WAL")
+            self.conn.execute("PRAGMA synchronous = NORMAL")
+            self.conn.executescript(SCHEMA)
+        except sqlite3.DatabaseError as e:
+            raise HistoryError(f"Cannot open weakness state {path}: {e}")
+
+    def _counts(self, candidate: str) -> Dict[str, Tuple[float, float, float]]:
+        if candidate not in self.counts:
+            rows = self.conn.execute(
+                "SELECT question_id, errors, answers, updated_at FROM weakness WHERE candidate = ?", (candidate,))
+            self.counts[candidate] = {row[0]: tuple(row[1:]) for row in rows}
+        return self.counts[candidate]
+
+    def weights(self, question_bank, candidate: str = "", now: Optional[float] = None) -> FenwickTree:
+        # One tree per candidate and bank, built in O(n). Afterwards only the questions of each
+        # recorded attempt are reweighted; the slow drift of the others back towards the prior
+        # is picked up the next time the tree is built.
+        cached = self.trees.get(candidate)
+        if cached and cached[0] is question_bank and cached[1] is question_bank.questions:
+            return cached[2]
+        now = time.time() if now is None else now
+        weights = np.full(len(question_bank.questions), error_weight(0.0, 0.0))
+        lookup = question_bank.id_lookup()
+        known = [(lookup[question_id], *counts) for question_id, counts in self._counts(candidate).items()
+                 if question_id in lookup]
+        if known:
+            positions, errors, answers, updated_at = (np.array(column) for column in zip(*known))
+            factor = decay(now - updated_at)
+            weights[positions.astype(np.int64)] = error_weight(errors * factor, answers * factor)
+        tree = FenwickTree(weights)
+        self.trees[candidate] = (question_bank, question_bank.questions, tree)
+        return tree
+
+    def weak_questions(self, question_bank, count: int, candidate: str = "",
+                       now: Optional[float] = None) -> List[Question]:
+        return question_bank.get_weighted_questions(count, self.weights(question_bank, candidate, now))
+
+    def update(self, result: ExamResult, candidate: str = "", now: Optional[float] = None):
+        # O(questions in the exam x log n)
+        now = time.time() if now is None else now
+        counts = self._counts(candidate)
+        cached = self.trees.get(candidate)
+        if cached and cached[1] is not cached[0].questions:
+            cached = None
+        rows = []
+        for q, correct in zip(result.questions, result.correct):
+            question_id = q.question_id
+            errors, answers, updated_at = counts.get(question_id, (0.0, 0.0, now))
+            factor = float(decay(now - updated_at))
+            errors, answers = errors * factor + (not correct), answers * factor + 1
+            counts[question_id] = (errors, answers, now)
+            rows.append((candidate, question_id, errors, answers, now))
+            if cached:
+                position = cached[0].id_lookup().get(question_id)
+                if position is not None:
+                    cached[2].set(position, error_weight(errors, answers))
+        try:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO weakness (candidate, question_id, errors, answers, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?)", rows)
+        except sqlite3.DatabaseError as e:
+            raise HistoryError(f"Cannot save weakness state in {self.path}: {e}")
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
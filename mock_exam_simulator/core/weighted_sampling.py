@@ -0,0 +1,75 @@
+# mock_exam_simulator/core/weighted_sampling.py
+import random
+from typing import List, Optional
+import numpy as np
+
+
+class FenwickTree:
+    # Binary indexed tree over non-negative weights: O(log n) updates, prefix sums and
+    # weighted draws, so neither sampling nor reweighting touches the whole bank.
+    def __init__(self, weights):
+        self.weights = np.array(weights, dtype=float)
+        n = len(self.weights)
+        # Node i holds the sum of the lowbit(i) weights ending at i; built from prefix sums in O(n)
+        prefix = np.r_[0.0, np.cumsum(self.weights)]
+        nodes = np.arange(1, n + 1)
+        self.tree = np.r_[0.0, prefix[nodes] - prefix[nodes - (nodes & -nodes)]].tolist()
+        self.top = 1 << (n.bit_length() - 1) if n else 0
+
+    def __len__(self) -> int:
+        return len(self.weights)
+
+    def add(self, index: int, delta: float):
+        self.weights[index] += delta
+        tree, i = self.tree, index + 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    def set(self, index: int, weight: float):
+        self.add(index, weight - self.weights[index])
+
+    def prefix_sum(self, count: int) -> float:
+        total, i = 0.0, count
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    @property
+    def total(self) -> float:
+        return self.prefix_sum(len(self.weights))
+
+    def find(self, value: float) -> int:
+        # Index of the weight that covers `value` on the cumulative scale; zero weights are
+        # never returned for values below the total.
+        tree, position, step = self.tree, 0, self.top
+        while step:
+            following = position + step
+            if following < len(tree) and tree[following] <= value:
+                value -= tree[following]
+                position = following
+            step >>= 1
+        return position
+
+    def sample(self, count: int, rng: Optional[random.Random] = None) -> List[int]:
+        # Draws without replacement by zeroing each drawn weight until all draws are done
+        rng = rng or random
+        drawn, saved = [], []
+        while len(drawn) < count:
+            total = self.total
+            if total <= 0:
+                break
+            index = self.find(rng.random() * total)
+            if index >= len(self.weights) or self.weights[index] <= 0:
+                # Rounding can carry a draw just past the last positive weight
+                positive = np.flatnonzero(self.weights > 0)
+                if not len(positive):
+                    break
+                index = int(positive[-1])
+            drawn.append(index)
+            saved.append(self.weights[index])
+            self.set(index, 0.0)
+        for index, weight in zip(drawn, saved):
+            self.set(index, weight)
+        return drawn
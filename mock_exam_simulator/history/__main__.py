@@ -0,0 +1,113 @@
+# mock_exam_simulator/history/__main__.py
+import argparse
+import os
+import sys
+import time
+from ..core.attempt_history import AttemptHistory
+from ..core.errors import ExamEngineError
+from ..core.item_analysis import MIN_RESPONSES
+
+
+def format_time(timestamp: float) -> str:
+    return time.strftime("%Y-%m-%d %H:%M", time.localtime(timestamp))
+
+
+def cmd_questions(history: AttemptHistory, args) -> int:
+    stats = history.question_stats(args.ids).values() if args.ids else \
+        history.weakest_questions(args.limit, args.min_answers)
+    for s in stats:
+        print(f"{s.question_id}  {s.accuracy:6.1%} of {s.answers} answers, {s.flagged} flagged, "
+              f"{s.viewed} viewed, {s.mean_time:.0f}s average")
+    return 0
+
+
+def cmd_items(history: AttemptHistory, args) -> int:
+    items = history.item_stats(args.ids).values() if args.ids else \
+        history.least_discriminating(args.limit, args.min_answers)
+    for item in items:
+        problems = ", ".join(item.problems())
+        print(f"{item.question_id}  p={item.p_value:.2f}  r_pb={item.discrimination:+.2f}  n={item.answers}  "
+              f"skipped={item.skipped}  options={item.option_counts}" + (f"  [{problems}]" if problems else ""))
+    return 0
+
+
+def cmd_rebuild(history: AttemptHistory, args) -> int:
+    history.rebuild_item_stats()
+    print("Rebuilt item statistics from the recorded responses")
+    return 0
+
+
+def cmd_topics(history: AttemptHistory, args) -> int:
+    for day in history.topic_trend(args.topic, args.since):
+        print(f"{day.topic if day.topic is not None else '(none)'}  {day.day}  "
+              f"{day.accuracy:6.1%} of {day.answers} answers")
+    return 0
+
+
+def cmd_candidates(history: AttemptHistory, args) -> int:
+    for candidate, attempts, last in history.candidates():
+        print(f"{candidate or '(anonymous)'}: {attempts} attempts, last {format_time(last)}")
+    return 0
+
+
+def cmd_progress(history: AttemptHistory, args) -> int:
+    for attempt in history.candidate_progress(args.candidate, args.limit):
+        print(f"{format_time(attempt.finished_at)}  {attempt.score}/{attempt.total} ({attempt.percentage:.1f}%), "
+              f"{attempt.penalties} penalties, {attempt.time_spent / 60:.0f} min"
+              + (f", exam code {attempt.exam}" if attempt.exam else ""))
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query the attempt history")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    questions_parser = commands.add_parser("questions", help="Per-question accuracy, weakest questions first")
+    questions_parser.add_argument("db")
+    questions_parser.add_argument("ids", nargs="*", help="Only these question IDs")
+    questions_parser.add_argument("--limit", type=int, default=20)
+    questions_parser.add_argument("--min-answers", type=int, default=5)
+    questions_parser.set_defaults(handler=cmd_questions)
+
+    items_parser = commands.add_parser("items", help="Item analysis, least discriminating questions first")
+    items_parser.add_argument("db")
+    items_parser.add_argument("ids", nargs="*", help="Only these question IDs")
+    items_parser.add_argument("--limit", type=int, default=20)
+    items_parser.add_argument("--min-answers", type=int, default=MIN_RESPONSES)
+    items_parser.set_defaults(handler=cmd_items)
+
+    rebuild_parser = commands.add_parser("rebuild-items", help="Recompute the item statistics from every response")
+    rebuild_parser.add_argument("db")
+    rebuild_parser.set_defaults(handler=cmd_rebuild)
+
+    topics_parser = commands.add_parser("topics", help="Daily accuracy per topic")
+    topics_parser.add_argument("db")
+    topics_parser.add_argument("--topic")
+    topics_parser.add_argument("--since", help="First day to show, as YYYY-MM-DD")
+    topics_parser.set_defaults(handler=cmd_topics)
+
+    candidates_parser = commands.add_parser("candidates", help="List candidates with their attempt counts")
+    candidates_parser.add_argument("db")
+    candidates_parser.set_defaults(handler=cmd_candidates)
+
+    progress_parser = commands.add_parser("progress", help="Scores of a candidate's attempts over time")
+    progress_parser.add_argument("db")
+    progress_parser.add_argument("candidate")
+    progress_parser.add_argument("--limit", type=int, help="Only the most recent attempts")
+    progress_parser.set_defaults(handler=cmd_progress)
+
+    args = parser.parse_args(argv)
+    if not os.path.isfile(args.db):
+        # Opening the history would create an empty database in its place
+        print(f"Error: No attempt history at {args.db}", file=sys.stderr)
+        return 1
+    try:
+        with AttemptHistory(args.db) as history:
+            return args.handler(history, args)
+    except ExamEngineError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
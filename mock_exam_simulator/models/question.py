@@ -1,15 +1,67 @@
 # mock_exam_simulator/models/question.py
+import hashlib
 from dataclasses import dataclass
+from functools import cached_property
 from typing import List, Optional
 
+# Hex digits of the content hash kept as the question ID (64 bits)
+ID_LENGTH = 16
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(text.split()).casefold()
+
 @dataclass
 class Question:
     text: str
     options: List[str]
-    correct_answers: List[str]
+    correct_indices: List[int]
     is_multiple_choice: bool
-    user_answers: Optional[List[str]] = None
+    explanation: Optional[str] = None
+    topic: Optional[str] = None
+    difficulty: Optional[str] = None
+
+    @property
+    def correct_answers(self) -> List[str]:
+        return [self.options[idx] for idx in self.correct_indices]
+
+    # Questions are not changed once parsed, so the hash is computed on first use and kept
+    @cached_property
+    def content_hash(self) -> str:
+        # Whitespace, case and option order do not change the hash; the answer does.
+        digest = hashlib.sha256(normalize_text(self.text).encode("utf-8"))
+        for part in sorted(normalize_text(opt) for opt in self.options):
+            digest.update(b"\x1f" + part.encode("utf-8"))
+        for part in sorted(normalize_text(opt) for opt in self.correct_answers):
+            digest.update(b"\x1e" + part.encode("utf-8"))
+        return digest.hexdigest()
+
+    @cached_property
+    def question_id(self) -> str:
+        return self.content_hash[:ID_LENGTH]
+
+    def option_texts(self, indices: List[int]) -> List[str]:
+        return [self.options[idx] for idx in indices]
+
+@dataclass
+class QuestionState:
+    user_answers: Optional[List[int]] = None
     answer_viewed: bool = False
     flagged: bool = False
     translated_text: Optional[str] = None
-    translated_options: Optional[List[str]] = None
\ No newline at end of file
+    translated_options: Optional[List[str]] = None
+    time_spent: float = 0.0
+    # Options in the order this session shows them: option_order[position] is the option's
+    # index in the bank and option_positions[index] where it is shown. None keeps the bank order.
+    option_order: Optional[bytes] = None
+    option_positions: Optional[bytes] = None
+
+    @property
+    def answered(self) -> bool:
+        return bool(self.user_answers)
+
+    def option_index(self, position: int) -> int:
+        return position if self.option_order is None else self.option_order[position]
+
+    def shown_position(self, index: int) -> int:
+        return index if self.option_positions is None else self.option_positions[index]
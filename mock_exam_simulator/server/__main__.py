@@ -0,0 +1,90 @@
+# mock_exam_simulator/server/__main__.py
+import argparse
+import asyncio
+import sys
+from ..config.config_loader import load_config_or_default
+from ..core.attempt_history import AttemptHistory
+from ..core.blueprint import blueprint_from_config
+from ..core.dedup import DUPLICATE_MODES, DUPLICATES_COLLAPSE, DUPLICATES_OFF, collapse_duplicates, \
+    duplicate_summary, find_near_duplicates
+from ..core.errors import ExamEngineError
+from ..core.question_bank import QuestionBank
+from ..core.question_store import QuestionStore
+from ..core.spaced_repetition import SpacedRepetition
+from ..core.weakness import WeaknessModel
+from .exam_server import ExamServer
+
+
+async def serve(question_bank, config, host: str, port: int, history=None, spaced_repetition=None,
+                weakness=None, blueprint=None):
+    exam_server = ExamServer(question_bank, config, history, spaced_repetition, weakness, blueprint)
+    server = await exam_server.start(host, port)
+    print(f"Serving {len(question_bank)} questions on http://{host}:{port}", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await exam_server.stop()
+
+
+def main(argv=None):
+    config = load_config_or_default()
+    parser = argparse.ArgumentParser(description="Local multi-candidate mock exam server")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--bank", nargs="+",
+                        help="CSV or compiled banks merged into one bank shared by every session")
+    source.add_argument("--store", help="SQLite question store to sample sessions from")
+    parser.add_argument("--host", default=config['server']['host'])
+    parser.add_argument("--port", type=int, default=config['server']['port'])
+    parser.add_argument("--max-sessions", type=int, default=config['server']['max_sessions'])
+    parser.add_argument("--duplicates", choices=DUPLICATE_MODES, default=config['duplicates']['mode'],
+                        help="Near-duplicate handling for --bank; ask only reports, as nobody is there to answer")
+    parser.add_argument("--history", default=config['history']['path'] if config['history']['enabled'] else None,
+                        help="SQLite attempt history every submitted session is recorded in; "
+                             "also keeps the state of practice and weakness sessions")
+    parser.add_argument("--no-history", dest="history", action="store_const", const=None,
+                        help="Do not record submitted sessions")
+    args = parser.parse_args(argv)
+    config['server']['max_sessions'] = args.max_sessions
+
+    try:
+        blueprint = blueprint_from_config(config['blueprint'])
+        if args.store:
+            question_bank = QuestionStore(args.store)
+            if blueprint is not None:
+                print("The exam blueprint needs --bank; sessions from --store ignore it", file=sys.stderr)
+        else:
+            question_bank = QuestionBank()
+            result = question_bank.load_files(args.bank, strict=False)
+            if result.rejected:
+                print(f"Skipped {len(result.rejected)} invalid rows", file=sys.stderr)
+            if result.exact_duplicates:
+                print(f"Dropped {result.exact_duplicates} exact duplicate questions", file=sys.stderr)
+            if args.duplicates != DUPLICATES_OFF:
+                clusters = find_near_duplicates(question_bank.questions, config['duplicates']['threshold'])
+                if clusters and args.duplicates == DUPLICATES_COLLAPSE:
+                    question_bank.replace(collapse_duplicates(question_bank.questions, clusters))
+                    print(f"Collapsed {duplicate_summary(clusters)}", file=sys.stderr)
+                elif clusters:
+                    print(f"Found {duplicate_summary(clusters)}", file=sys.stderr)
+            question_bank.search_index()
+            question_bank.version()
+            if blueprint is not None:
+                question_bank.strata_index()
+        history = AttemptHistory(args.history) if args.history else None
+        spaced_repetition = SpacedRepetition(args.history) if args.history else None
+        weakness = WeaknessModel(args.history) if args.history else None
+    except ExamEngineError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    try:
+        asyncio.run(serve(question_bank, config, args.host, args.port, history, spaced_repetition,
+                          weakness, blueprint))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
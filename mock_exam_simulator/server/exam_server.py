@@ -0,0 +1,391 @@
+# mock_exam_simulator/server/exam_server.py
+import asyncio
+import random
+import sys
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Optional
+from ..core.adaptive import AdaptiveSession
+from ..core.attempt_history import AttemptHistory
+from ..core.blueprint import Blueprint
+from ..core.exam_descriptor import ExamDescriptor, create_exam, regenerate
+from ..core.errors import DescriptorError, ExamEngineError, HistoryError, SessionError
+from ..core.irt import ItemPool, item_pool
+from ..core.question_bank import QuestionBank
+from ..core.scoring import ExamResult, VIEW_FLAGGED, VIEW_INCORRECT
+from ..core.search_index import DEFAULT_LIMIT
+from ..core.session import MODE_ADAPTIVE, MODE_EXAM, MODE_PRACTICE, MODE_WEAKNESS, SESSION_MODES, ExamSession
+from ..core.spaced_repetition import SpacedRepetition
+from ..core.weakness import WeaknessModel
+from .http import HttpError, Request, serve_connection
+
+MAX_SEARCH_RESULTS = 100
+
+
+@dataclass
+class CandidateSession:
+    session_id: str
+    candidate: str
+    session: ExamSession
+    deadline: float
+    timer: Optional[asyncio.TimerHandle] = None
+    auto_submitted: bool = False
+
+
+def result_payload(result: ExamResult) -> dict:
+    return {
+        "correct": result.correct_count,
+        "total": result.total,
+        "penalties": result.penalties,
+        "score": result.score,
+        "percentage": round(result.percentage, 2),
+        "incorrect": result.views[VIEW_INCORRECT],
+        "flagged": result.views[VIEW_FLAGGED],
+    }
+
+
+class ExamServer:
+    def __init__(self, question_bank: QuestionBank, config, history: Optional[AttemptHistory] = None,
+                 spaced_repetition: Optional[SpacedRepetition] = None, weakness: Optional[WeaknessModel] = None,
+                 blueprint: Optional[Blueprint] = None):
+        self.question_bank = question_bank
+        self.blueprint = blueprint
+        self.item_pool: Optional[ItemPool] = None
+        self.history = history
+        self.spaced_repetition = spaced_repetition
+        self.weakness = weakness
+        self.config = config
+        self.max_sessions = config['server']['max_sessions']
+        self.results_retention = config['server']['results_retention_minutes'] * 60
+        self.sessions: Dict[str, CandidateSession] = {}
+        # Only sessions still being taken count towards max_sessions; finished ones stay
+        # readable for results_retention_minutes and are then dropped.
+        self.open_sessions = 0
+        # The SQLite stores are used from this one thread only, so their reads and writes run
+        # in order without blocking the event loop.
+        self.stores = ThreadPoolExecutor(max_workers=1, thread_name_prefix="exam-stores")
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str, port: int):
+        self.server = await asyncio.start_server(
+            lambda r, w: serve_connection(r, w, self.handle), host, port)
+        return self.server
+
+    async def stop(self):
+        for record in self.sessions.values():
+            if record.timer:
+                record.timer.cancel()
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+        # Lets the attempts still queued be recorded
+        await asyncio.get_running_loop().run_in_executor(None, self.stores.shutdown)
+
+    def time_remaining(self, record: CandidateSession) -> int:
+        if record.session.submitted:
+            return 0
+        remaining = max(int(record.deadline - asyncio.get_running_loop().time()), 0)
+        record.session.time_remaining = remaining
+        return remaining
+
+    def expire(self, session_id: str):
+        record = self.sessions.get(session_id)
+        if record and not record.session.submitted:
+            record.auto_submitted = True
+            record.session.time_remaining = 0
+            self.finish(record)
+
+    def finish(self, record: CandidateSession):
+        result = record.session.submit()
+        self.open_sessions -= 1
+        record.timer = asyncio.get_running_loop().call_later(self.results_retention, self.evict, record.session_id)
+        self.stores.submit(self.record_result, result, record.candidate, record.session.descriptor)
+
+    def record_result(self, result: ExamResult, candidate: str, exam: Optional[str]):
+        # Runs on the stores thread
+        try:
+            if self.history is not None:
+                self.history.record(result, candidate, exam=exam)
+            if self.spaced_repetition is not None:
+                self.spaced_repetition.review(result, candidate)
+            if self.weakness is not None:
+                self.weakness.update(result, candidate)
+        except HistoryError as e:
+            # The exam is graded either way; losing its history entry must not fail the request
+            print(f"Error: {e}", file=sys.stderr)
+
+    def evict(self, session_id: str):
+        self.sessions.pop(session_id, None)
+
+    def lookup(self, session_id: str) -> CandidateSession:
+        record = self.sessions.get(session_id)
+        if record is None:
+            raise HttpError(404, f"Unknown session: {session_id}")
+        return record
+
+    def open_session(self, record: CandidateSession) -> ExamSession:
+        if not record.session.submitted and self.time_remaining(record) == 0:
+            self.expire(record.session_id)
+        if record.session.submitted:
+            raise HttpError(409, "Exam has already been submitted")
+        return record.session
+
+    def question_index(self, session: ExamSession, raw: str) -> int:
+        try:
+            index = int(raw)
+        except ValueError:
+            raise HttpError(400, f"Invalid question index: {raw}")
+        if not 0 <= index < session.length:
+            raise HttpError(404, f"Question index {index} out of range")
+        return index
+
+    def status_payload(self, record: CandidateSession) -> dict:
+        session = record.session
+        payload = {
+            "session_id": record.session_id,
+            "candidate": record.candidate,
+            "total": session.length,
+            "time_remaining": self.time_remaining(record),
+            "answered": sum(1 for state in session.states if state.answered),
+            "submitted": session.submitted,
+            "auto_submitted": record.auto_submitted,
+        }
+        if session.descriptor is not None:
+            payload["exam"] = session.descriptor
+        if isinstance(session, AdaptiveSession):
+            payload["ability"] = round(session.ability.theta, 3)
+            payload["standard_error"] = round(session.ability.standard_error, 3)
+        if session.submitted:
+            payload["result"] = result_payload(session.result)
+        return payload
+
+    def question_payload(self, session: ExamSession, index: int) -> dict:
+        question = session.questions[index]
+        state = session.states[index]
+        return {
+            "index": index,
+            "id": question.question_id,
+            "text": question.text,
+            # Options in the order this session shows them; answers refer to these positions
+            "options": [question.options[state.option_index(position)] for position in range(len(question.options))],
+            "multiple_choice": question.is_multiple_choice,
+            "answers": session.shown_answers(index),
+            "flagged": state.flagged,
+            "answer_viewed": state.answer_viewed,
+        }
+
+    async def create_session(self, request: Request):
+        if self.open_sessions >= self.max_sessions:
+            raise HttpError(503, "Session limit reached")
+        body = request.json()
+        exam_config = self.config['exam']
+        try:
+            count = int(body.get("questions", exam_config['default_questions']))
+            minutes = int(body.get("time_limit_minutes", exam_config['default_time_limit_minutes']))
+        except (TypeError, ValueError):
+            raise HttpError(400, "questions and time_limit_minutes must be integers")
+        if count < 1 or minutes < 1:
+            raise HttpError(400, "questions and time_limit_minutes must be positive")
+
+        mode = body.get("mode", MODE_EXAM)
+        if mode not in SESSION_MODES:
+            raise HttpError(400, f"mode must be one of {', '.join(SESSION_MODES)}")
+        if mode != MODE_EXAM and not hasattr(self.question_bank, "get_question"):
+            raise HttpError(404, f"{mode.capitalize()} mode needs --bank")
+        if mode in (MODE_PRACTICE, MODE_WEAKNESS) and self.history is None:
+            raise HttpError(404, f"{mode.capitalize()} mode needs an attempt history")
+        candidate = str(body.get("candidate", ""))
+        if mode == MODE_EXAM and hasattr(self.question_bank, "version"):
+            session = self.new_session(mode, count, minutes * 60, candidate, body)
+        else:
+            # Practice, weakness and adaptive sessions read the stores, and a question store draws in SQL
+            session = await asyncio.get_running_loop().run_in_executor(
+                self.stores, self.new_session, mode, count, minutes * 60, candidate, body)
+        if self.open_sessions >= self.max_sessions:
+            # Other sessions may have started while this one was being drawn
+            raise HttpError(503, "Session limit reached")
+        session_id = uuid.uuid4().hex
+        loop = asyncio.get_running_loop()
+        record = CandidateSession(
+            session_id=session_id,
+            candidate=candidate,
+            session=session,
+            deadline=loop.time() + minutes * 60,
+        )
+        record.timer = loop.call_later(minutes * 60, self.expire, session_id)
+        self.sessions[session_id] = record
+        self.open_sessions += 1
+        return 201, self.status_payload(record)
+
+    def new_session(self, mode: str, count: int, seconds: int, candidate: str, body: dict) -> ExamSession:
+        if mode == MODE_ADAPTIVE:
+            if self.item_pool is None:
+                self.item_pool = item_pool(self.question_bank, self.history)
+            return AdaptiveSession(self.item_pool, count, seconds, option_rng=self.option_rng())
+        if mode == MODE_PRACTICE:
+            return ExamSession(self.spaced_repetition.practice_questions(self.question_bank, count, candidate), seconds,
+                               option_rng=self.option_rng())
+        if mode == MODE_WEAKNESS:
+            return ExamSession(self.weakness.weak_questions(self.question_bank, count, candidate), seconds,
+                               option_rng=self.option_rng())
+        filters = {key: str(body[key]) for key in ("topic", "difficulty") if body.get(key) is not None}
+        seeded = hasattr(self.question_bank, "version")
+        if body.get("exam") is not None:
+            # Another candidate's exam code gives the same questions again
+            if not seeded:
+                raise HttpError(404, "Exam codes need --bank")
+            descriptor = ExamDescriptor.decode(str(body["exam"]))
+            questions = regenerate(self.question_bank, descriptor, self.blueprint)
+        elif seeded and not filters:
+            descriptor, questions = create_exam(self.question_bank, count, self.blueprint)
+        else:
+            return ExamSession(self.question_bank.get_random_questions(count, **filters), seconds,
+                               option_rng=self.option_rng())
+        return ExamSession(questions, seconds, descriptor=descriptor.encode(), option_rng=self.option_rng(descriptor))
+
+    def option_rng(self, descriptor: Optional[ExamDescriptor] = None):
+        # Exams from a code show their options in the same order every time
+        if not self.config['exam']['shuffle_options']:
+            return None
+        return random if descriptor is None else descriptor.option_rng()
+
+    async def search(self, request: Request):
+        if not hasattr(self.question_bank, "search"):
+            raise HttpError(404, "Search is not available for this question bank")
+        query = request.query.get("q", "")
+        try:
+            limit = int(request.query.get("limit", DEFAULT_LIMIT))
+        except ValueError:
+            raise HttpError(400, "limit must be an integer")
+        if not 1 <= limit <= MAX_SEARCH_RESULTS:
+            raise HttpError(400, f"limit must be between 1 and {MAX_SEARCH_RESULTS}")
+        results = []
+        for hit in self.question_bank.search(query, limit):
+            question = self.question_bank.questions[hit.index]
+            results.append({
+                "index": hit.index,
+                "id": question.question_id,
+                "score": round(hit.score, 4),
+                "text": question.text,
+                "options": question.options,
+                "topic": question.topic,
+                "difficulty": question.difficulty,
+            })
+        return 200, {"query": query, "results": results}
+
+    async def question_by_id(self, question_id: str):
+        if not hasattr(self.question_bank, "get_question"):
+            raise HttpError(404, "Question IDs are not available for this question bank")
+        question = self.question_bank.get_question(question_id)
+        if question is None:
+            raise HttpError(404, f"Unknown question: {question_id}")
+        return 200, {
+            "id": question_id,
+            "text": question.text,
+            "options": question.options,
+            "topic": question.topic,
+            "difficulty": question.difficulty,
+        }
+
+    async def handle(self, request: Request):
+        try:
+            return await self.route(request)
+        except HttpError as e:
+            return e.status, {"error": e.message}
+        except (SessionError, DescriptorError) as e:
+            return 400, {"error": str(e)}
+        except ExamEngineError as e:
+            return 409, {"error": str(e)}
+        except Exception as e:
+            return 500, {"error": f"Unexpected server error: {str(e)}"}
+
+    async def route(self, request: Request):
+        parts = [part for part in request.path.split("/") if part]
+        method = request.method
+
+        if parts == ["health"]:
+            return 200, {"status": "ok", "questions": len(self.question_bank),
+                         "sessions": len(self.sessions)}
+        if parts == ["search"]:
+            if method != "GET":
+                raise HttpError(405, "Use GET to search")
+            return await self.search(request)
+        if parts[:1] == ["questions"] and len(parts) == 2:
+            if method != "GET":
+                raise HttpError(405, "Use GET to look up a question")
+            return await self.question_by_id(parts[1])
+        if not parts or parts[0] != "sessions":
+            raise HttpError(404, f"Unknown path: {request.path}")
+        if len(parts) == 1:
+            if method != "POST":
+                raise HttpError(405, "Use POST to create a session")
+            return await self.create_session(request)
+
+        record = self.lookup(parts[1])
+        if len(parts) == 2:
+            if method == "GET":
+                return 200, self.status_payload(record)
+            if method == "DELETE":
+                if record.timer:
+                    record.timer.cancel()
+                if not record.session.submitted:
+                    self.open_sessions -= 1
+                del self.sessions[record.session_id]
+                return 200, {"deleted": record.session_id}
+            raise HttpError(405, "Use GET or DELETE on a session")
+
+        if parts[2:] == ["submit"]:
+            if method != "POST":
+                raise HttpError(405, "Use POST to submit")
+            session = self.open_session(record)
+            if record.timer:
+                record.timer.cancel()
+            self.finish(record)
+            return 200, self.status_payload(record)
+
+        if parts[2] == "questions" and len(parts) in (4, 5):
+            if len(parts) == 4 and method == "GET":
+                # Reading a question never moves the session; submitted exams read in any order
+                session = record.session
+                index = self.question_index(session, parts[3])
+                if index >= session.total:
+                    raise HttpError(404, f"Question {index} has not been given yet; POST visit to go on to it")
+                return 200, self.question_payload(session, index)
+
+            if method != "POST":
+                raise HttpError(405, "Use POST for question actions")
+            session = self.open_session(record)
+            index = self.question_index(session, parts[3])
+            action = parts[4] if len(parts) == 5 else None
+            if action == "visit":
+                # Time is counted against the question visited last; adaptive exams choose
+                # their next question when it is visited
+                session.go_to(index)
+            elif action == "answer":
+                if index >= session.total:
+                    raise HttpError(404, f"Question {index} has not been given yet; POST visit to go on to it")
+                answers = request.json().get("answers", [])
+                options = len(session.questions[index].options)
+                # bool is an int subclass, so true/false would otherwise pass as option 1 or 0
+                if not isinstance(answers, list) or not all(
+                        isinstance(a, int) and not isinstance(a, bool) and 0 <= a < options for a in answers):
+                    raise HttpError(400, f"answers must be a list of option indices from 0 to {options - 1}")
+                session.answer(answers, index)
+            elif action == "skip":
+                session.skip(index)
+            elif action == "flag":
+                session.toggle_flag(index)
+            elif action == "view-answer":
+                session.view_answer(index)
+                payload = self.question_payload(session, index)
+                state = session.states[index]
+                payload["correct_answers"] = sorted(state.shown_position(idx)
+                                                    for idx in session.questions[index].correct_indices)
+                payload["explanation"] = session.questions[index].explanation
+                return 200, payload
+            else:
+                raise HttpError(404, f"Unknown question action: {action}")
+            return 200, self.question_payload(session, index)
+
+        raise HttpError(404, f"Unknown path: {request.path}")
@@ -0,0 +1,186 @@
+# mock_exam_simulator/server/loadgen.py
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+from ..config.config_loader import load_config_or_default
+
+
+@dataclass
+class LoadReport:
+    candidates: int
+    requests: int = 0
+    errors: int = 0
+    elapsed: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+
+    @property
+    def requests_per_second(self) -> float:
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    def percentile(self, pct: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        rank = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+        return ordered[rank]
+
+    def summary(self) -> dict:
+        return {
+            "candidates": self.candidates,
+            "requests": self.requests,
+            "errors": self.errors,
+            "elapsed_s": round(self.elapsed, 3),
+            "requests_per_s": round(self.requests_per_second, 1),
+            "p50_ms": round(self.percentile(50) * 1000, 3),
+            "p95_ms": round(self.percentile(95) * 1000, 3),
+            "p99_ms": round(self.percentile(99) * 1000, 3),
+        }
+
+
+class Connection:
+    def __init__(self, host: str, port: int, report: LoadReport):
+        self.host = host
+        self.port = port
+        self.report = report
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def open(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def close(self):
+        if self.writer:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def request(self, method: str, path: str, payload=None):
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        head = (f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n")
+        started = time.perf_counter()
+        self.writer.write(head.encode("latin-1") + body)
+        await self.writer.drain()
+
+        header_block = await self.reader.readuntil(b"\r\n\r\n")
+        lines = header_block.decode("latin-1").split("\r\n")
+        status = int(lines[0].split(" ", 2)[1])
+        length = 0
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value.strip())
+        data = await self.reader.readexactly(length) if length else b""
+        self.report.latencies.append(time.perf_counter() - started)
+        self.report.requests += 1
+        if status >= 400:
+            self.report.errors += 1
+        return status, json.loads(data) if data else None
+
+
+async def run_candidate(number: int, host: str, port: int, questions: int, report: LoadReport,
+                        rng: random.Random):
+    connection = Connection(host, port, report)
+    await connection.open()
+    try:
+        status, session = await connection.request(
+            "POST", "/sessions", {"candidate": f"candidate-{number}", "questions": questions})
+        if status != 201:
+            return
+        base = f"/sessions/{session['session_id']}"
+        for index in range(session["total"]):
+            status, question = await connection.request("POST", f"{base}/questions/{index}/visit")
+            if status != 200:
+                continue
+            roll = rng.random()
+            if roll < 0.05:
+                await connection.request("POST", f"{base}/questions/{index}/view-answer")
+            elif roll < 0.10:
+                await connection.request("POST", f"{base}/questions/{index}/skip")
+            else:
+                pick = rng.randrange(len(question["options"]))
+                await connection.request("POST", f"{base}/questions/{index}/answer", {"answers": [pick]})
+            if rng.random() < 0.1:
+                await connection.request("POST", f"{base}/questions/{index}/flag")
+        await connection.request("POST", f"{base}/submit")
+        await connection.request("DELETE", base)
+    finally:
+        await connection.close()
+
+
+async def run_load(host: str, port: int, candidates: int, questions: int, seed: int = 0) -> LoadReport:
+    report = LoadReport(candidates=candidates)
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        run_candidate(n, host, port, questions, report, random.Random(rng.random()))
+        for n in range(candidates)
+    ))
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+async def wait_for_server(host: str, port: int, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            connection = Connection(host, port, LoadReport(candidates=0))
+            await connection.open()
+            await connection.request("GET", "/health")
+            await connection.close()
+            return
+        except (OSError, asyncio.IncompleteReadError):
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Exam server on {host}:{port} did not come up")
+            await asyncio.sleep(0.2)
+
+
+def main(argv=None):
+    server_config = load_config_or_default()['server']
+    parser = argparse.ArgumentParser(description="Load generator for the mock exam server")
+    parser.add_argument("--host", default=server_config['host'])
+    parser.add_argument("--port", type=int, default=server_config['port'])
+    parser.add_argument("--candidates", type=int, default=server_config['loadgen']['candidates'])
+    parser.add_argument("--questions", type=int, default=server_config['loadgen']['questions'])
+    parser.add_argument("--target-rps", type=float, default=server_config['loadgen']['target_requests_per_second'])
+    parser.add_argument("--target-p99-ms", type=float, default=server_config['loadgen']['target_p99_ms'])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--bank", help="Start a local exam server on this CSV bank before running the load")
+    args = parser.parse_args(argv)
+
+    server_process = None
+    if args.bank:
+        server_process = subprocess.Popen([
+            sys.executable, "-m", "mock_exam_simulator.server",
+            "--bank", args.bank, "--host", args.host, "--port", str(args.port),
+            "--max-sessions", str(max(args.candidates, server_config['max_sessions'])),
+            "--no-history",
+        ])
+    try:
+        asyncio.run(wait_for_server(args.host, args.port))
+        report = asyncio.run(run_load(args.host, args.port, args.candidates, args.questions, args.seed))
+    finally:
+        if server_process:
+            server_process.terminate()
+            server_process.wait()
+
+    summary = report.summary()
+    summary["target_requests_per_s"] = args.target_rps
+    summary["target_p99_ms"] = args.target_p99_ms
+    summary["passed"] = (report.errors == 0
+                         and report.requests_per_second >= args.target_rps
+                         and report.percentile(99) * 1000 <= args.target_p99_ms)
+    print(json.dumps(summary, indent=2))
+    return 0 if summary["passed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+# mock_exam_simulator/store/__main__.py
+import argparse
+import sys
+from ..core.errors import ExamEngineError
+from ..core.packed_bank import write_bank_file
+from ..core.question_store import FACETS, QuestionStore
+
+
+def cmd_import(store: QuestionStore, args) -> int:
+    for file_path in args.files:
+        result, added = store.import_file(file_path)
+        unique = len({q.content_hash for q in result.questions})
+        print(f"{file_path}: {added} added, {unique - added} already stored, "
+              f"{len(result.questions) - unique} repeated in the file, {len(result.rejected)} invalid rows")
+    return 0
+
+
+def cmd_remove(store: QuestionStore, args) -> int:
+    for source_file in args.sources:
+        print(f"{source_file}: {store.remove_source(source_file)} questions removed")
+    return 0
+
+
+def cmd_stats(store: QuestionStore, args) -> int:
+    print(f"{len(store)} questions")
+    for column in FACETS:
+        print(f"\n{column}:")
+        for value, count in store.facet(column):
+            print(f"  {value if value is not None else '(none)'}: {count}")
+    return 0
+
+
+def cmd_sample(store: QuestionStore, args) -> int:
+    questions = store.get_random_questions(args.count, args.topic, args.difficulty, args.source)
+    if args.output:
+        write_bank_file(questions, args.output)
+        print(f"Wrote {len(questions)} questions to {args.output}")
+    else:
+        for q in questions:
+            print(q.text)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage a SQLite question store")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="Add CSV or compiled banks to the store")
+    import_parser.add_argument("db")
+    import_parser.add_argument("files", nargs="+")
+    import_parser.set_defaults(handler=cmd_import)
+
+    remove_parser = commands.add_parser(
+        "remove", help="Remove imported files; questions another file also contains are kept")
+    remove_parser.add_argument("db")
+    remove_parser.add_argument("sources", nargs="+", help="File names as shown by stats")
+    remove_parser.set_defaults(handler=cmd_remove)
+
+    stats_parser = commands.add_parser("stats", help="Show question counts per topic, difficulty and source")
+    stats_parser.add_argument("db")
+    stats_parser.set_defaults(handler=cmd_stats)
+
+    sample_parser = commands.add_parser("sample", help="Draw a random, optionally filtered, selection")
+    sample_parser.add_argument("db")
+    sample_parser.add_argument("--count", type=int, default=50)
+    sample_parser.add_argument("--topic")
+    sample_parser.add_argument("--difficulty")
+    sample_parser.add_argument("--source", help="Only questions imported from this file name")
+    sample_parser.add_argument("--output", help="Write the selection as a compiled .bank file")
+    sample_parser.set_defaults(handler=cmd_sample)
+
+    args = parser.parse_args(argv)
+    try:
+        with QuestionStore(args.db) as store:
+            return args.handler(store, args)
+    except ExamEngineError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
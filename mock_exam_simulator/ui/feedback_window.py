@@ -0,0 +1,131 @@
+# mock_exam_simulator/ui/feedback_window.py
+import tkinter as tk
+from tkinter import ttk, Toplevel
+import platform
+try:
+    if platform.system() == "Darwin":
+        from tkmacosx import Button as MacButton
+    else:
+        MacButton = None
+except ImportError:
+    MacButton = None
+from ..core.scoring import ExamResult, VIEW_INCORRECT, VIEW_TITLES
+
+class FeedbackWindow:
+    def __init__(self, root: tk.Tk, config, result: ExamResult, view: str = VIEW_INCORRECT):
+        self.root = root
+        self.config = config
+        self.result = result
+        self.is_macos = platform.system() == "Darwin" and MacButton is not None
+        self.page_size = max(int(config['feedback']['page_size']), 1)
+        self.view = view
+        self.page_index = 0
+        self.view_names = {VIEW_TITLES[key]: key for key in result.views}
+
+        self.window = Toplevel(root)
+        self.window.geometry("800x700")
+        self.window.configure(bg=config['window']['background'])
+        self.setup_ui()
+        self.render_page()
+
+    def make_button(self, parent, text, command):
+        style_config = self.config['styles']
+        if self.is_macos:
+            return MacButton(parent,
+                             text=text,
+                             command=command,
+                             font=tuple(style_config['button']['font']),
+                             background=style_config['button']['default_background'],
+                             foreground=style_config['button']['default_foreground'],
+                             activebackground=style_config['button']['active_background'],
+                             activeforeground=style_config['button']['active_foreground'],
+                             disabledbackground=style_config['button']['disabled_background'],
+                             disabledforeground=style_config['button']['disabled_foreground'],
+                             borderwidth=style_config['button']['borderwidth'],
+                             relief=style_config['button']['relief'])
+        return ttk.Button(parent, text=text, command=command)
+
+    def setup_ui(self):
+        background = self.config['window']['background']
+
+        header_frame = tk.Frame(self.window, bg=background)
+        header_frame.pack(fill="x", padx=15, pady=(15, 0))
+
+        tk.Label(header_frame, text="Show:", font=("Segoe UI", 12),
+                 bg=background, fg="#2d2d2d").pack(side="left")
+        self.view_var = tk.StringVar(value=VIEW_TITLES[self.view])
+        view_selector = ttk.Combobox(header_frame, textvariable=self.view_var, state="readonly",
+                                     values=list(self.view_names), width=25)
+        view_selector.pack(side="left", padx=10)
+        view_selector.bind("<<ComboboxSelected>>", lambda e: self.switch_view(self.view_names[self.view_var.get()]))
+
+        self.count_label = tk.Label(header_frame, text="", font=("Segoe UI", 12),
+                                    bg=background, fg="#2d2d2d")
+        self.count_label.pack(side="right")
+
+        list_frame = tk.Frame(self.window, bg=background)
+        list_frame.pack(fill="both", expand=True, pady=15, padx=15)
+
+        self.listbox = tk.Listbox(list_frame, width=100, height=30, font=("Segoe UI", 12),
+                                  bg=background, fg="#2d2d2d")
+        scrollbar = tk.Scrollbar(list_frame, orient="vertical", command=self.listbox.yview)
+        scrollbar.pack(side="right", fill="y")
+        self.listbox.pack(side="left", fill="both", expand=True)
+        self.listbox.config(yscrollcommand=scrollbar.set)
+
+        pager_frame = tk.Frame(self.window, bg=background)
+        pager_frame.pack(pady=5)
+
+        self.prev_page_button = self.make_button(pager_frame, "Prev Page", self.prev_page)
+        self.prev_page_button.pack(side="left", padx=8)
+        self.page_label = tk.Label(pager_frame, text="", font=("Segoe UI", 12),
+                                   bg=background, fg="#2d2d2d")
+        self.page_label.pack(side="left", padx=8)
+        self.next_page_button = self.make_button(pager_frame, "Next Page", self.next_page)
+        self.next_page_button.pack(side="left", padx=8)
+
+        self.make_button(self.window, "Close", self.window.destroy).pack(pady=10)
+
+    def switch_view(self, view: str):
+        if view != self.view:
+            self.view = view
+            self.page_index = 0
+            self.render_page()
+
+    def prev_page(self):
+        if self.page_index > 0:
+            self.page_index -= 1
+            self.render_page()
+
+    def next_page(self):
+        if self.page_index < self.result.page_count(self.view, self.page_size) - 1:
+            self.page_index += 1
+            self.render_page()
+
+    def render_page(self):
+        self.window.title(f"Feedback: {VIEW_TITLES[self.view]} Questions")
+        self.listbox.delete(0, tk.END)
+        items = self.result.page(self.view, self.page_index, self.page_size)
+        if not items:
+            self.listbox.insert(tk.END, f"No {VIEW_TITLES[self.view].lower()} questions.")
+
+        for item in items:
+            self.listbox.insert(tk.END, f"Q{item.number}: {item.question[:100]}...")
+            self.listbox.insert(tk.END, f"  Your Answers: {item.your_answers}")
+            if item.answer_viewed:
+                self.listbox.insert(tk.END, f"  (Marked incorrect because answer was viewed; 1 point deducted)")
+            if item.flagged:
+                self.listbox.insert(tk.END, f"  (Flagged)")
+            self.listbox.insert(tk.END, f"  Correct Answers: {item.correct_answers}")
+            if item.flagged:
+                self.listbox.insert(tk.END, f"  Status: {'Correct' if item.is_correct else 'Incorrect'}")
+            if item.explanation:
+                self.listbox.insert(tk.END, f"  Explanation: {' '.join(item.explanation.split())[:100]}...")
+            self.listbox.insert(tk.END, "")
+
+        page_count = self.result.page_count(self.view, self.page_size)
+        self.count_label.config(text=f"{self.result.view_size(self.view)} question(s)")
+        self.page_label.config(text=f"Page {self.page_index + 1}/{page_count}")
+        self.prev_page_button.config(state="normal" if self.page_index > 0 else "disabled")
+        self.next_page_button.config(state="normal" if self.page_index < page_count - 1 else "disabled")
+        self.listbox.yview_moveto(0)
@@ -11,7 +11,7 @@ try:
         MacButton = None
 except ImportError:
     MacButton = None
-from ..models.question import Question
+from ..models.question import Question, QuestionState
 
 class UIManager:
     def __init__(self, root: tk.Tk, config):
@@ -267,10 +267,10 @@ class UIManager:
         self.option_widgets = []
         self.option_frames = []
 
-    def display_question(self, question: Question, current_index: int):
-        if self.is_translated and question.translated_text and question.translated_options:
-            question_text = f"Question {current_index + 1}\n{question.translated_text}"
-            options = question.translated_options
+    def display_question(self, question: Question, state: QuestionState, current_index: int):
+        if self.is_translated and state.translated_text and state.translated_options:
+            question_text = f"Question {current_index + 1}\n{state.translated_text}"
+            options = state.translated_options
         else:
             question_text = f"Question {current_index + 1}\n{question.text}"
             options = question.options
@@ -282,19 +282,11 @@ class UIManager:
         if not question.is_multiple_choice:
             self.selected_answer.set("")
 
-        displayed_selections = []
-        if question.user_answers:
-            for ans in question.user_answers:
-                try:
-                    idx = question.options.index(ans)
-                    if self.is_translated and question.translated_options and idx < len(question.translated_options):
-                        displayed_selections.append(question.translated_options[idx])
-                    else:
-                        displayed_selections.append(ans)
-                except (ValueError, IndexError):
-                    continue
-
-        for option in options:
+        selected = set(state.user_answers or [])
+
+        # idx is the position the option is shown at; answers are kept as bank option indices
+        for idx in range(len(options)):
+            option = options[state.option_index(idx)]
             option_frame = tk.Frame(self.options_inner_frame, bg=self.config['window']['background'], relief="solid", borderwidth=1,
                                   highlightbackground="#dee2e6", highlightthickness=1)
             option_frame.pack(fill="x", pady=5)
@@ -302,13 +294,13 @@ class UIManager:
             option_frame.bind("<Leave>", lambda e, f=option_frame: f.config(bg=self.config['window']['background']))
 
             if question.is_multiple_choice:
-                var = tk.BooleanVar(value=option in displayed_selections)
-                self.selected_answers[option] = var
+                var = tk.BooleanVar(value=state.option_index(idx) in selected)
+                self.selected_answers[idx] = var
                 widget = ttk.Checkbutton(option_frame, text=option, variable=var, style="Option.TCheckbutton")
             else:
-                widget = ttk.Radiobutton(option_frame, text=option, variable=self.selected_answer, value=option, style="Option.TRadiobutton")
-                if option in displayed_selections:
-                    self.selected_answer.set(option)
+                widget = ttk.Radiobutton(option_frame, text=option, variable=self.selected_answer, value=str(idx), style="Option.TRadiobutton")
+                if state.option_index(idx) in selected:
+                    self.selected_answer.set(str(idx))
 
             widget.pack(anchor="w", padx=15, pady=10)
             self.option_widgets.append(widget)
@@ -317,6 +309,12 @@ class UIManager:
         self.update_scrollbar_visibility()
         self.update_question_scrollbar_visibility()
 
+    def get_selected_indices(self, question: Question) -> List[int]:
+        if question.is_multiple_choice:
+            return [idx for idx, var in self.selected_answers.items() if var.get()]
+        answer = self.selected_answer.get()
+        return [int(answer)] if answer else []
+
     def update_scrollbar_visibility(self):
         self.root.update_idletasks()
         canvas_height = self.options_canvas.winfo_height()
@@ -362,22 +360,22 @@ class UIManager:
             btn.grid(row=0, column=i, padx=0, pady=0)
             self.nav_buttons.append(btn)
 
-    def update_navigation_buttons(self, questions: List[Question], current_index: int):
+    def update_navigation_buttons(self, states: List[QuestionState], current_index: int):
         style_config = self.config['styles']
         for i, btn in enumerate(self.nav_buttons):
-            question = questions[i]
+            state = states[i]
             
             if self.is_macos:
                 if i == current_index:
                     btn.config(background=style_config['active_button']['background'],
                               foreground=style_config['button']['active_foreground'])
-                elif question.flagged:
+                elif state.flagged:
                     btn.config(background=style_config['flagged_button']['background'],
                               foreground=style_config['button']['default_foreground'])
-                elif question.user_answers:
+                elif state.user_answers:
                     btn.config(background=style_config['answered_button']['background'],
                               foreground=style_config['button']['default_foreground'])
-                elif question.answer_viewed:
+                elif state.answer_viewed:
                     btn.config(background=style_config['viewed_button']['background'],
                               foreground=style_config['button']['default_foreground'])
                 else:
@@ -386,16 +384,16 @@ class UIManager:
             else:
                 if i == current_index:
                     btn.config(style="Active.TButton")
-                elif question.flagged:
+                elif state.flagged:
                     btn.config(style="Flagged.TButton")
-                elif question.user_answers:
+                elif state.user_answers:
                     btn.config(style="Answered.TButton")
-                elif question.answer_viewed:
+                elif state.answer_viewed:
                     btn.config(style="Viewed.TButton")
                 else:
                     btn.config(style="TButton")
             
-            if question.flagged:
+            if state.flagged:
                 btn.config(text=f"{i+1} ⚑")
             else:
                 btn.config(text=str(i+1))
\ No newline at end of file
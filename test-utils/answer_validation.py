@@ -1,17 +1,232 @@
-import pandas as pd
-import sys
-
-csv_file = sys.argv[1]  # Replace with your CSV file path
-df = pd.read_csv(csv_file)
-
-# Print all values in the 'correct' column
-print("Correct column values:", df["correct"].tolist())
-
-# Find and print 2-based indices where 'correct' is nan
-nan_indices = df.index[pd.isna(df["correct"])].tolist()
-if nan_indices:
-    # Add 2 to each index for 2-based indexing
-    nan_indices_2_based = [idx + 2 for idx in nan_indices]
-    print("Rows with nan in 'correct' column:", nan_indices_2_based)
-else:
-    print("No nan values found in 'correct' column.")
\ No newline at end of file
+"""Lint question bank CSV files and report every problem with its row number."""
+
+import argparse  # For command-line argument parsing
+import ast  # For parsing the option lists the same way the importer does
+import os  # For walking directories of banks
+import re  # For recognising the wide option1..optionN layout
+import sys  # For the exit status
+from concurrent.futures import ProcessPoolExecutor  # For linting several files at once
+
+import numpy as np  # For boolean row masks
+import pandas as pd  # For reading the banks and checking whole columns at once
+
+# Columns the importer requires
+REQUIRED_COLUMNS = ["question", "options", "correct"]
+# Most correct answers the importer accepts for one question
+MAX_CORRECT = 6
+# Option columns of the wide layout (option1, option2, ...)
+WIDE_OPTION_COLUMN = re.compile(r"option(\d+)")
+# A list of quoted strings without escapes, whose value literal_eval would return verbatim
+SIMPLE_LIST_PATTERN = r"\[(?:\s*(?:'[^'\\]*'|\"[^\"\\]*\")\s*,)*(?:\s*(?:'[^'\\]*'|\"[^\"\\]*\"))?\s*\]"
+# One quoted string of such a list (single- or double-quoted)
+SIMPLE_ITEM_PATTERN = r"'([^'\\]*)'|\"([^\"\\]*)\""
+# A single correct index as the importer's int() accepts it
+INDEX_PATTERN = r"\s*[+-]?\d+\s*"
+
+
+def parse_options(raw):
+    """Return the option list of one cell, or None when it is not a list of strings."""
+    # literal_eval is what the importer runs on every options cell
+    try:
+        options = ast.literal_eval(raw)
+    except (ValueError, SyntaxError, TypeError):
+        return None
+    if not isinstance(options, list) or not all(isinstance(option, str) for option in options):
+        return None
+    return options
+
+
+def parse_option_column(raw):
+    """Parse a whole options column, giving None for cells that are not a list of strings.
+
+    Plain lists of quoted strings, which is what exporters write, are split with two regex
+    passes over the column; only the remaining cells go through literal_eval one by one.
+    """
+    text = raw.astype(str)
+    simple = raw.notna() & text.str.fullmatch(SIMPLE_LIST_PATTERN)
+    # findall yields one (single-quoted, double-quoted) pair per item with the other side empty
+    fast = [[single or double for single, double in items]
+            for items in text[simple].str.findall(SIMPLE_ITEM_PATTERN)]
+    slow = raw[~simple].map(parse_options)
+    return pd.concat([pd.Series(fast, index=text.index[simple], dtype=object), slow]).reindex(raw.index)
+
+
+def wide_option_columns(columns):
+    """Return the option1..optionN columns in numeric order."""
+    numbered = []
+    for column in columns:
+        match = WIDE_OPTION_COLUMN.fullmatch(str(column))
+        if match:
+            numbered.append((int(match.group(1)), column))
+    return [column for _, column in sorted(numbered)]
+
+
+def detect_layout(columns):
+    """Return "list" for question/options/correct banks, "wide" for option1..N banks, or None."""
+    if all(column in columns for column in REQUIRED_COLUMNS):
+        return "list"
+    if "question" in columns and "correct_answer" in columns and wide_option_columns(columns):
+        return "wide"
+    return None
+
+
+def stripped_values(column):
+    """Return the column stripped of surrounding whitespace, with blank cells as NaN."""
+    stripped = column.str.strip()
+    return stripped.where(stripped.ne(""))
+
+
+def lint_frame(df):
+    """Return sorted (row, message) pairs for every problem in a question/options/correct bank."""
+    problems = []
+    # Row numbers as a spreadsheet shows them: the header is row 1
+    rows = df.index + 2
+
+    def report(mask, message):
+        # Record one problem for every row selected by the boolean mask
+        problems.extend((int(row), message) for row in rows[np.asarray(mask, dtype=bool)])
+
+    # Empty question text
+    question = df["question"]
+    report(question.isna() | question.astype(str).str.strip().eq(""), "empty question text")
+
+    # Option lists: malformed, empty, or with the same option twice
+    options = parse_option_column(df["options"])
+    malformed = options.isna()
+    report(malformed, "options are not a list of strings")
+    option_counts = options.map(len, na_action="ignore")
+    report(option_counts.eq(0), "no options")
+    flat = options[~malformed].explode().dropna()
+    pairs = pd.DataFrame({"row": flat.index, "option": flat.to_numpy()})
+    duplicated = pairs.loc[pairs.duplicated(), "row"].unique()
+    report(df.index.isin(duplicated), "duplicate options")
+
+    # Correct answers: missing, not integers, out of range, or too many
+    correct = df["correct"]
+    missing = correct.isna() | correct.astype(str).str.strip().eq("")
+    report(missing, "no correct answer")
+    parts = correct[~missing].astype(str).str.split(",").explode()
+    not_integer = ~parts.str.fullmatch(INDEX_PATTERN)
+    report(df.index.isin(parts.index[not_integer.to_numpy()]), "correct answers must be comma-separated integers")
+    indices = parts[~not_integer].astype(int)
+    counts = option_counts.reindex(indices.index)
+    out_of_range = counts.gt(0) & ((indices < 0) | (indices >= counts))
+    for index, value, count in zip(indices.index[out_of_range], indices[out_of_range], counts[out_of_range]):
+        problems.append((int(index) + 2, f"correct index {value} out of range for {int(count)} options"))
+    too_many = indices.groupby(level=0).nunique() > MAX_CORRECT
+    report(df.index.isin(too_many.index[too_many.to_numpy()]), f"more than {MAX_CORRECT} correct answers")
+
+    problems.sort()
+    return problems
+
+
+def lint_wide_frame(df):
+    """Return sorted (row, message) pairs for every problem in an option1..N / correct_answer bank."""
+    problems = []
+    # Row numbers as a spreadsheet shows them: the header is row 1
+    rows = df.index + 2
+
+    def report(mask, message):
+        # Record one problem for every row selected by the boolean mask
+        problems.extend((int(row), message) for row in rows[np.asarray(mask, dtype=bool)])
+
+    # Empty question text
+    report(stripped_values(df["question"]).isna(), "empty question text")
+
+    # Stack the option columns into one matrix, blank cells being absent options
+    options = np.column_stack([stripped_values(df[column]).to_numpy(dtype=object)
+                               for column in wide_option_columns(df.columns)])
+    present = pd.notna(options)
+    has_options = present.any(axis=1)
+    report(~has_options, "no options")
+    # Compare every pair of option columns; banks have only a handful of them
+    duplicated = np.zeros(len(df), dtype=bool)
+    for first in range(options.shape[1]):
+        for second in range(first + 1, options.shape[1]):
+            duplicated |= (options[:, first] == options[:, second]) & present[:, first] & present[:, second]
+    report(duplicated, "duplicate options")
+
+    # The answer must be the text of one of the options
+    answers = stripped_values(df["correct_answer"])
+    report(answers.isna(), "no correct answer")
+    matched = ((options == answers.to_numpy(dtype=object)[:, None]) & present).any(axis=1)
+    unmatched = ~matched & has_options & answers.notna().to_numpy()
+    for row, answer in zip(rows[unmatched], answers[unmatched]):
+        problems.append((int(row), f"correct answer {answer!r} does not match any option"))
+
+    problems.sort()
+    return problems
+
+
+def lint_file(path):
+    """Lint one bank and return (path, rows checked, problems); row 0 marks file-level problems."""
+    try:
+        # Read every cell as text, as the importer does
+        df = pd.read_csv(path, dtype=str)
+    except FileNotFoundError:
+        return path, 0, [(0, "file not found")]
+    except pd.errors.EmptyDataError:
+        return path, 0, [(0, "file is empty")]
+    except (pd.errors.ParserError, UnicodeDecodeError) as error:
+        return path, 0, [(0, f"invalid CSV: {error}")]
+
+    layout = detect_layout(df.columns)
+    if layout == "wide":
+        return path, len(df), lint_wide_frame(df)
+    if layout is None:
+        missing = [column for column in REQUIRED_COLUMNS if column not in df.columns]
+        return path, len(df), [(1, "missing required columns: " + ", ".join(missing) +
+                                   " (or question, option1..optionN, correct_answer)")]
+    return path, len(df), lint_frame(df)
+
+
+def collect_files(paths):
+    """Expand directories into the CSV files they contain, in a stable order."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, subdirectories, names in os.walk(path):
+                subdirectories.sort()
+                files.extend(os.path.join(directory, name) for name in sorted(names)
+                             if name.lower().endswith(".csv"))
+        else:
+            files.append(path)
+    return files
+
+
+def main():
+    """Lint the given banks and exit with status 1 when any problem is found."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("paths", nargs="+", help="CSV banks or directories containing them")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="number of files linted in parallel (default: CPU count)")
+    args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    files = collect_files(args.paths)
+    if not files:
+        print("No CSV files found.")
+        sys.exit(1)
+
+    # Lint the files on a process pool; results come back in input order
+    if args.jobs > 1 and len(files) > 1:
+        with ProcessPoolExecutor(max_workers=min(args.jobs, len(files))) as executor:
+            results = list(executor.map(lint_file, files))
+    else:
+        results = [lint_file(path) for path in files]
+
+    total_rows = total_problems = failing_files = 0
+    for path, row_count, problems in results:
+        total_rows += row_count
+        total_problems += len(problems)
+        failing_files += bool(problems)
+        for row, message in problems:
+            print(f"{path}:{row}: {message}" if row else f"{path}: {message}")
+
+    print(f"{total_problems} problem(s) in {failing_files} of {len(files)} file(s), {total_rows} rows checked.")
+    sys.exit(1 if total_problems else 0)
+
+
+if __name__ == "__main__":
+    main()
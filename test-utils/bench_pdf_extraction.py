@@ -0,0 +1,114 @@
+"""Benchmark serial versus parallel page extraction on a generated DumpsPanda-style PDF."""
+
+import argparse  # For command-line argument parsing
+import os  # For building temporary file paths
+import random  # For generating varied question content
+import tempfile  # For a scratch directory holding the generated PDF
+import time  # For timing each run
+
+import parse_dumpspanda_pdf  # The parser under test (same directory)
+
+# Number of text lines placed on each generated page
+LINES_PER_PAGE = 60
+
+
+def escape_pdf_text(text):
+    """Escape the characters that are special inside a PDF string literal."""
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def generate_question_lines(num_questions, seed):
+    """Generate the text lines of a DumpsPanda-style dump."""
+    # Use a fixed seed so every run benchmarks the same document
+    rng = random.Random(seed)
+    lines = []
+    # Build each question block line by line
+    for number in range(1, num_questions + 1):
+        lines.append(f"Question: {number}")
+        # Question text over one to three lines
+        lines.extend(f"Which configuration satisfies requirement {number}.{part} for the workload?"
+                     for part in range(rng.randint(1, 3)))
+        # Between two and six options
+        letters = "ABCDEF"[:rng.randint(2, 6)]
+        lines.extend(f"{letter}. Use option {letter} with setting {rng.randint(1, 999)}" for letter in letters)
+        lines.append(f"Answer: {rng.choice(letters)}")
+        # Most questions carry a short explanation
+        if rng.random() < 0.7:
+            lines.append("Explanation:")
+            lines.extend(f"Reason {part} why the answer to {number} is correct." for part in range(rng.randint(1, 4)))
+    return lines
+
+
+def write_pdf(path, lines, lines_per_page=LINES_PER_PAGE):
+    """Write the lines into a minimal multi-page PDF, letting question blocks span page breaks."""
+    # Split the text into pages, each starting with the header lines the parser strips out
+    pages = []
+    for start in range(0, len(lines), lines_per_page):
+        page_number = len(pages) + 1
+        header = ["www.dumpspanda.com Questions and Answers PDF", f"{page_number}/210"]
+        pages.append(header + lines[start:start + lines_per_page])
+
+    # Objects 1-3 are the catalog, the page tree and the font; each page adds a page and a content object
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [{}] /Count {} >>".format(
+            " ".join(f"{4 + 2 * i} 0 R" for i in range(len(pages))), len(pages)),
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, page_lines in enumerate(pages):
+        # Draw each line with the text leading operator so extraction sees one line per row
+        content = "BT /F1 8 Tf 30 810 Td 12 TL " + " ".join(
+            f"({escape_pdf_text(line)}) Tj T*" for line in page_lines) + " ET"
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>")
+        objects.append(f"<< /Length {len(content)} >>\nstream\n{content}\nendstream")
+
+    # Serialize the objects and the cross-reference table
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref_offset = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    output += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    output += (f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+               f"startxref\n{xref_offset}\n%%EOF\n").encode("latin-1")
+    with open(path, "wb") as file:
+        file.write(output)
+    return len(pages)
+
+
+def time_run(pdf_path, jobs):
+    """Parse the PDF with the given number of jobs and return (seconds, questions)."""
+    started = time.perf_counter()
+    questions = list(parse_dumpspanda_pdf.iter_exam_questions(pdf_path, jobs))
+    return time.perf_counter() - started, questions
+
+
+def main():
+    """Generate the benchmark PDF and compare extraction times across job counts."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--questions", type=int, default=2000, help="questions in the generated dump")
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1],
+                        help="job counts to benchmark (default: 1 2 4 and the CPU count)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = os.path.join(tmp, "benchmark_dump.pdf")
+        num_pages = write_pdf(pdf_path, generate_question_lines(args.questions, args.seed))
+        print(f"Generated {num_pages} pages with {args.questions} questions on {os.cpu_count()} CPUs")
+
+        # The serial run is the reference for both speed and output
+        serial_time, reference = time_run(pdf_path, 1)
+        print(f"jobs=1: {serial_time:.2f}s ({len(reference)} questions)")
+        for jobs in sorted(set(args.jobs) - {1}):
+            elapsed, questions = time_run(pdf_path, jobs)
+            # Parallel extraction must not change what gets parsed
+            status = "identical output" if questions == reference else "OUTPUT DIFFERS"
+            print(f"jobs={jobs}: {elapsed:.2f}s, speedup {serial_time / elapsed:.2f}x, {status}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,15 @@
 """Script to parse a DumpsPanda PDF and output questions to a JSON or CSV file."""
 
+import argparse  # For command-line argument parsing
 import csv  # For writing CSV files
+import hashlib  # For hashing page content streams in the ingestion cache
+import io  # For holding the PDF bytes in each worker process
 import json  # For writing JSON files
 import os  # For handling file paths and directories
 import re  # For regular expression pattern matching and text cleaning
 import sys  # For command-line argument handling and exiting
+from collections import deque  # For keeping a bounded window of in-flight page ranges
+from concurrent.futures import ProcessPoolExecutor  # For extracting page ranges on several cores
 
 import PyPDF2  # For reading and extracting text from PDF files
 
@@ -12,120 +17,432 @@ import PyPDF2  # For reading and extracting text from PDF files
 PAGE_REGEX = r"\d+/210"  # Matches page numbers like "16/210"
 PANDA_URL_REGEX = r"www\.dumpspanda\.com"  # Matches the URL "www.dumpspanda.com"
 QUESTION_ANSWER_REGEX = r"Questions\sand\sAnswers\sPDF"  # Matches the "Questions and Answers PDF" text
+# Compile the cleaning patterns once into a single alternation so each line is scanned one time
+CLEAN_PATTERN = re.compile("|".join((PAGE_REGEX, PANDA_URL_REGEX, QUESTION_ANSWER_REGEX)))
+# Number of pages each worker extracts per task in parallel mode
+PAGES_PER_TASK = 8
+# Format version of the ingestion cache file written by --cache
+CACHE_VERSION = 2
+# Marks the first line of a question block
+QUESTION_START = "Question: "
+# Marker lines recognised by the question parser
+QUESTION_LINE = re.compile(r"Question: (\d+)")
+ANSWER_LINE = re.compile(r"Answer: ([A-Z]+)")
+ANSWER_START = "Answer:"
+EXPLANATION_START = "Explanation:"
+
+
+def iter_page_texts(pdf_path):
+    """Yield the extracted text of each PDF page, one page at a time."""
+    # Open the PDF file in binary read mode
+    with open(pdf_path, "rb") as file:
+        # Create a PDF reader object to process the file
+        reader = PyPDF2.PdfReader(file)
+        # Loop through each page in the PDF without keeping earlier pages around
+        for page in reader.pages:
+            # Extract the text from the page and end it with a newline so lines never merge across pages
+            yield page.extract_text() + "\n"
 
 
-def parse_pdf_full_text(pdf_path):
-    """Parse the full text of the PDF after cleaning unwanted patterns."""
+# PDF reader opened once per worker process by init_extraction_worker
+_worker_reader = None
+
+
+def init_extraction_worker(pdf_path):
+    """Open the PDF once when a worker process starts instead of once per page range."""
+    global _worker_reader
+    # Read the whole file into memory so the reader does not depend on an open file handle
+    with open(pdf_path, "rb") as file:
+        _worker_reader = PyPDF2.PdfReader(io.BytesIO(file.read()))
+
+
+def extract_page_range(start, stop):
+    """Extract the text of pages [start, stop) in a worker process."""
+    # Extract the requested pages, ending each with a newline like iter_page_texts does
+    return [_worker_reader.pages[page_num].extract_text() + "\n" for page_num in range(start, stop)]
+
+
+def count_pages(pdf_path):
+    """Return the number of pages in the PDF."""
     # Open the PDF file in binary read mode
     with open(pdf_path, "rb") as file:
-        # Create a PDF reader object to process the file
+        # Only the page tree is read here, no text is extracted
+        return len(PyPDF2.PdfReader(file).pages)
+
+
+def iter_page_texts_parallel(pdf_path, jobs, pages_per_task=PAGES_PER_TASK):
+    """Yield page texts in order while a process pool extracts page ranges ahead of the consumer."""
+    # Split the document into consecutive page ranges, at least a few per worker for load balancing
+    num_pages = count_pages(pdf_path)
+    pages_per_task = max(pages_per_task, num_pages // (jobs * 4))
+    ranges = iter([(start, min(start + pages_per_task, num_pages))
+                   for start in range(0, num_pages, pages_per_task)])
+    # Start the worker processes
+    with ProcessPoolExecutor(max_workers=jobs, initializer=init_extraction_worker,
+                             initargs=(pdf_path,)) as executor:
+        # Futures for the ranges currently being extracted, oldest first
+        pending = deque()
+        # Keep a couple of ranges queued per worker so no core sits idle, but never the whole document
+        for start, stop in ranges:
+            pending.append(executor.submit(extract_page_range, start, stop))
+            if len(pending) >= jobs * 2:
+                break
+        # Hand the pages back in document order as each range finishes
+        while pending:
+            # Wait for the oldest range so the output order matches the page order
+            page_texts = pending.popleft().result()
+            # Queue the next range before yielding to keep the workers busy
+            next_range = next(ranges, None)
+            if next_range is not None:
+                pending.append(executor.submit(extract_page_range, *next_range))
+            # Yield the pages of the finished range
+            yield from page_texts
+
+
+def page_content_hash(page):
+    """Return a hash of the page's content stream, which changes whenever the page is re-typeset."""
+    # Pages without a content stream (blank pages) hash as empty
+    contents = page.get_contents()
+    data = contents.get_data() if contents is not None else b""
+    return hashlib.sha256(data).hexdigest()
+
+
+def load_cache_index(cache_path):
+    """Return {content hash: byte offset of its line} for the cache saved by a previous run."""
+    # Only the offsets are kept; a page's text is read back from the file when it is needed.
+    # A missing, unreadable or outdated cache simply means every page is extracted again.
+    offsets = {}
+    try:
+        with open(cache_path, "rb") as file:
+            header = json.loads(file.readline())
+            if not isinstance(header, dict) or header.get("version") != CACHE_VERSION:
+                return {}
+            offset = file.tell()
+            for line in file:
+                offsets[json.loads(line)["hash"]] = offset
+                offset += len(line)
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}
+    return offsets
+
+
+def read_cached_text(file, offset):
+    """Read the text of the cache line starting at offset."""
+    file.seek(offset)
+    return json.loads(file.readline())["text"]
+
+
+def iter_missing_texts(pdf_path, reader, page_numbers, jobs):
+    """Yield the text of the given pages in order, extracting ahead on a process pool when several jobs are requested."""
+    if jobs > 1 and len(page_numbers) > 1:
+        numbers = iter(page_numbers)
+        with ProcessPoolExecutor(max_workers=jobs, initializer=init_extraction_worker,
+                                 initargs=(pdf_path,)) as executor:
+            # Each task extracts a single page, since the changed pages are rarely contiguous;
+            # a bounded window of them is in flight like in iter_page_texts_parallel
+            pending = deque()
+            for page_num in numbers:
+                pending.append(executor.submit(extract_page_range, page_num, page_num + 1))
+                if len(pending) >= jobs * 2:
+                    break
+            while pending:
+                page_texts = pending.popleft().result()
+                next_page = next(numbers, None)
+                if next_page is not None:
+                    pending.append(executor.submit(extract_page_range, next_page, next_page + 1))
+                yield from page_texts
+    else:
+        # Extract with the reader already open, ending each page with a newline like iter_page_texts does
+        for page_num in page_numbers:
+            yield reader.pages[page_num].extract_text() + "\n"
+
+
+class CacheStats:
+    """Counts of the pages read by cached_page_texts."""
+
+    def __init__(self):
+        # Pages yielded so far
+        self.pages = 0
+        # Pages whose text came from the cache instead of being extracted
+        self.reused = 0
+
+
+def cached_page_texts(pdf_path, cache_path, jobs=1, stats=None):
+    """Yield (content hash, page text) for each page, extracting only pages that are not in the cache.
+
+    Pages are matched by the hash of their content stream, so a re-published dump with a few
+    corrected, inserted or removed pages only pays text extraction for the pages that changed.
+    The new cache is written page by page as the texts are yielded and replaces the old one
+    once the whole PDF has been read, holding exactly the pages of this PDF.
+    """
+    stats = stats if stats is not None else CacheStats()
+    # Offsets of the pages earlier runs extracted
+    cached = load_cache_index(cache_path)
+    temp_path = cache_path + ".tmp"
+    with open(pdf_path, "rb") as file:
         reader = PyPDF2.PdfReader(file)
-        # Get the total number of pages in the PDF
-        num_pages = len(reader.pages)
-
-        # Initialize an empty string to store the full text of the PDF
-        full_text = ""
-        # Loop through each page in the PDF
-        for page_num in range(num_pages):
-            # Get the page object for the current page
-            page = reader.pages[page_num]
-            # Extract the text from the page and append it to full_text with a newline
-            full_text += page.extract_text() + "\n"
-
-    # Split the extracted text into individual lines for line-by-line cleaning
-    lines = full_text.splitlines()
-    # Initialize a list to store cleaned lines
-    cleaned_lines = []
-    # Process each line to remove unwanted patterns
+        # Hashing reads the content streams only, which is far cheaper than extracting the text
+        hashes = [page_content_hash(page) for page in reader.pages]
+        # Page numbers whose text has to be extracted (a page repeated in the PDF is extracted once)
+        missing = {}
+        for page_num, page_hash in enumerate(hashes):
+            if page_hash not in cached and page_hash not in missing:
+                missing[page_hash] = page_num
+        extracted = iter_missing_texts(pdf_path, reader, sorted(missing.values()), jobs)
+
+        old_cache = open(cache_path, "rb") if cached else None
+        new_cache = open(temp_path, "wb")
+        rereader = None
+        completed = False
+        try:
+            new_cache.write(json.dumps({"version": CACHE_VERSION}).encode("utf-8") + b"\n")
+            # Offsets of the pages already written to the new cache, for pages repeated in the PDF
+            written = {}
+            for page_hash in hashes:
+                # Every page but the first copy of a changed one comes from a cache
+                reused = True
+                if page_hash in written:
+                    # A repeated page: read its text back from the new cache
+                    if rereader is None:
+                        new_cache.flush()
+                        rereader = open(temp_path, "rb")
+                    text = read_cached_text(rereader, written[page_hash])
+                else:
+                    if page_hash in cached:
+                        text = read_cached_text(old_cache, cached[page_hash])
+                    else:
+                        text = next(extracted)
+                        reused = False
+                    written[page_hash] = new_cache.tell()
+                    new_cache.write(json.dumps({"hash": page_hash, "text": text}, ensure_ascii=False)
+                                    .encode("utf-8") + b"\n")
+                stats.pages += 1
+                stats.reused += reused
+                yield page_hash, text
+            completed = True
+        finally:
+            for handle in (old_cache, new_cache, rereader):
+                if handle is not None:
+                    handle.close()
+            # Replace the old cache only once it is complete, so an interrupted run never leaves a
+            # truncated cache behind
+            if completed:
+                os.replace(temp_path, cache_path)
+            else:
+                os.remove(temp_path)
+
+
+def iter_clean_lines(page_texts):
+    """Yield the non-empty lines of each page with the unwanted patterns removed."""
+    # Process the pages as they arrive
+    for page_text in page_texts:
+        # Split the page text into individual lines for line-by-line cleaning
+        for line in page_text.splitlines():
+            # Remove page numbers, the dumpspanda URL and the header text in one pass
+            cleaned_line = CLEAN_PATTERN.sub("", line)
+            # Only keep the line if it is not empty after cleaning
+            if cleaned_line.strip():
+                yield cleaned_line
+
+
+def is_option_line(line):
+    """Return True when the line starts an option such as "A. text"."""
+    # An option marker is a capital letter followed by a period at the start of the line
+    return len(line) > 1 and line[1] == "." and "A" <= line[0] <= "Z"
+
+
+def trim_block(lines):
+    """Trim a block of lines the way str.strip() trims the joined block text."""
+    # Skip whitespace-only lines at both ends of the block
+    start, end = 0, len(lines)
+    while start < end and not lines[start].strip():
+        start += 1
+    while end > start and not lines[end - 1].strip():
+        end -= 1
+    # Copy the remaining lines so the caller's list is left untouched
+    lines = lines[start:end]
+    # Strip the leading whitespace of the first line and the trailing whitespace of the last one
+    if lines:
+        lines[0] = lines[0].lstrip()
+        lines[-1] = lines[-1].rstrip()
+    return lines
+
+
+def iter_question_blocks(lines):
+    """Group cleaned lines into (question number, block lines) pairs.
+
+    A block starts after a "Question: <number>" line and runs until the next line starting
+    with "Question: ". A block that spans a page boundary is carried over until the next
+    question starts, so only one block is held in memory at a time.
+    """
+    # Number of the question being collected, or None before the first question line
+    question_number = None
+    # Lines of the block currently being collected
+    block = []
+    # Walk the cleaned lines in order
     for line in lines:
-        # Remove page numbers (e.g., "16/210") from the line
-        cleaned_line = re.sub(PAGE_REGEX, "", line)
-        # Remove the URL "www.dumpspanda.com" from the line
-        cleaned_line = re.sub(PANDA_URL_REGEX, "", cleaned_line)
-        # Remove the "Questions and Answers PDF" text from the line
-        cleaned_line = re.sub(QUESTION_ANSWER_REGEX, "", cleaned_line)
-        # Only add the line to cleaned_lines if it’s not empty after cleaning
-        if cleaned_line.strip():
-            cleaned_lines.append(cleaned_line)
+        # Any "Question: " line closes the block collected so far
+        if line.startswith(QUESTION_START):
+            # Emit the finished block (a question line with nothing after it is not a question)
+            if question_number is not None and block:
+                yield question_number, block
+            # Only a "Question: <number>" line opens a new block
+            match = QUESTION_LINE.fullmatch(line)
+            question_number = int(match.group(1)) if match else None
+            # Start collecting the next block
+            block = []
+        # Lines before the first question (or after a malformed question line) are skipped
+        elif question_number is not None:
+            block.append(line)
+    # Emit the last block once the input runs out
+    if question_number is not None and block:
+        yield question_number, block
+
+
+def parse_question_block(question_number, lines):
+    """Parse one question block with a single sweep over its lines.
+
+    The sweep is a small state machine: question text, then options, then the answer and
+    explanation, which runs to the end of the block. Each line is looked at once and only
+    lines that start with a marker are matched.
+    """
+    # Work on the trimmed block, as the regex parser did with the stripped block text
+    lines = trim_block(lines)
+    # Index of the first "A. " line, where the question text ends
+    text_end = None
+    # Options collected so far; a repeated letter replaces the earlier option
+    options = {}
+    # Letter and lines of the option currently being collected
+    option_letter = None
+    option_lines = []
+    # Answer letters and explanation text, if the block has them
+    answer = None
+    explanation = None
+
+    # Visit every line of the block once
+    for index, line in enumerate(lines):
+        # An option marker starts a new option
+        if is_option_line(line):
+            # Store the option collected so far
+            if option_letter is not None:
+                options[option_letter] = "\n".join(option_lines).strip()
+            # The question text ends at the first "A." line followed by whitespace
+            if text_end is None and index and line[0] == "A" and (
+                    line[2:3].isspace() or (len(line) == 2 and index + 1 < len(lines))):
+                text_end = index
+            # Start collecting the new option from the text after the marker
+            option_letter = line[0]
+            option_lines = [line[2:]]
+        # Answer and Explanation markers end the option being collected
+        elif line.startswith(ANSWER_START) or line.startswith(EXPLANATION_START):
+            # Store the last option
+            if option_letter is not None:
+                options[option_letter] = "\n".join(option_lines).strip()
+                option_letter = None
+            # The answer counts when the explanation or the end of the block follows it
+            if answer is None and (index + 1 == len(lines) or lines[index + 1].startswith(EXPLANATION_START)):
+                match = ANSWER_LINE.fullmatch(line)
+                if match:
+                    answer = match.group(1)
+            # A bare "Explanation:" line starts the explanation, which runs to the end of the block
+            if line == EXPLANATION_START and index + 1 < len(lines):
+                explanation = "\n".join(lines[index + 1:]).strip()
+                break
+        # Any other line continues the option being collected
+        elif option_letter is not None:
+            option_lines.append(line)
+    # Store the option still open when the block ends
+    if option_letter is not None:
+        options[option_letter] = "\n".join(option_lines).strip()
+
+    # The question text is everything before the first "A. " line (or the whole block without one)
+    question_text = "\n".join(lines[:text_end] if text_end is not None else lines).strip()
+
+    # Return the parsed question data
+    return {
+        "question_number": question_number,  # The question number as an integer
+        "question_text": question_text,  # Store the question text
+        "options": options,  # Store the options dictionary (e.g., {"A": "text", "B": "text"})
+        "answer": answer,  # Store the correct answer letters (e.g., "A" or "AC")
+        "explanation": explanation  # Store the explanation text
+    }
+
+
+def iter_exam_questions(pdf_path, jobs=1):
+    """Stream parsed questions from the PDF, page by page."""
+    # Extract pages serially, or on a process pool when more than one job is requested
+    page_texts = iter_page_texts_parallel(pdf_path, jobs) if jobs > 1 else iter_page_texts(pdf_path)
+    # Parse the pages as they are extracted
+    return iter_page_questions(page_texts)
+
+
+def iter_page_questions(page_texts):
+    """Stream parsed questions from an iterable of page texts."""
+    # Clean and split the pages lazily into question blocks
+    blocks = iter_question_blocks(iter_clean_lines(page_texts))
+    # Parse each block as soon as it is complete
+    for question_number, block in blocks:
+        yield parse_question_block(question_number, block)
+
 
+def parse_pdf_full_text(pdf_path):
+    """Parse the full text of the PDF after cleaning unwanted patterns."""
     # Rejoin the cleaned lines with newlines to form the final cleaned text
-    return "\n".join(cleaned_lines)
+    return "\n".join(iter_clean_lines(iter_page_texts(pdf_path)))
 
 
 def parse_exam_questions(full_text):
     """Parse questions, options, answers, and explanations from the cleaned text."""
-    # Define regex patterns for parsing different parts of a question block
-    # Matches "Question: <number>" followed by its content until the next question or end of text
-    question_pattern = r"Question: (\d+)\n(.*?)(?=\nQuestion: |\Z)"
-    # Matches options (e.g., "A. text") until the next option, Answer, Explanation, or Question
-    option_pattern = r"([A-Z])\.\s*(.*?)(?=\n[A-Z]\.|\nAnswer:|\nExplanation:|\nQuestion: |\Z)"
-    # Matches "Answer: <letter>" followed by Explanation, next Question, or end of text
-    answer_pattern = r"Answer: ([A-Z])(?=\nExplanation:|\nQuestion: |\Z)"
-    # Matches "Explanation:\n" followed by its content until the next Question or end of text
-    explanation_pattern = r"Explanation:\n(.*?)(?=\nQuestion: |\Z)"
-
-    # Initialize a list to store parsed question data
-    questions = []
-    # Find all question blocks in the cleaned text using the question_pattern
-    question_matches = re.finditer(question_pattern, full_text, re.DOTALL)
-
-    # Iterate over each question block found in the text
-    for q_match in question_matches:
-        # Extract the question number (e.g., "39")
-        question_number = q_match.group(1)
-        # Extract the entire question block content
-        question_block = q_match.group(2).strip()
-
-        # Extract the question text by splitting on the first "A. " (start of options)
-        question_text_split = re.split(r"\nA\.\s", question_block, maxsplit=1)
-        # The question text is everything before "A. ", stripped of whitespace
-        question_text = question_text_split[0].strip()
-
-        # Extract options (e.g., "A. text") from the question block
-        options_matches = re.finditer(option_pattern, question_block, re.DOTALL)
-        # Create a dictionary mapping option letters (e.g., "A") to their text (e.g., "text")
-        options = {opt.group(1): opt.group(2).strip() for opt in options_matches}
-
-        # Extract the correct answer letter (e.g., "A") using the answer_pattern
-        answer_match = re.search(answer_pattern, question_block, re.DOTALL)
-        # Store the answer letter if found, otherwise set to None
-        answer = answer_match.group(1) if answer_match else None
-
-        # Extract the explanation text using the explanation_pattern
-        explanation_match = re.search(explanation_pattern, question_block, re.DOTALL)
-        # Store the explanation text if found, otherwise set to None
-        explanation = explanation_match.group(1).strip() if explanation_match else None
-
-        # Create a dictionary with the parsed question data
-        question_data = {
-            "question_number": int(question_number),  # Convert question number to integer
-            "question_text": question_text,  # Store the question text
-            "options": options,  # Store the options dictionary (e.g., {"A": "text", "B": "text"})
-            "answer": answer,  # Store the correct answer letter (e.g., "A")
-            "explanation": explanation  # Store the explanation text
-        }
-        # Append the question data to the questions list
-        questions.append(question_data)
-
-    # Return the list of parsed questions
-    return questions
+    # Split the text into lines and parse every question block in one sweep
+    return [parse_question_block(question_number, block)
+            for question_number, block in iter_question_blocks(full_text.split("\n"))]
 
 
 def save_to_json(data, output_path):
-    """Save parsed questions data to a JSON file."""
+    """Save parsed questions data to a JSON file, writing each question as it arrives."""
     # Open the output file in write mode with UTF-8 encoding
     with open(output_path, "w", encoding="utf-8") as file:
-        # Write the parsed questions data to the file as JSON with indentation
-        # ensure_ascii=False allows non-ASCII characters (e.g., special characters) to be written correctly
-        json.dump(data, file, indent=4, ensure_ascii=False)
+        # Track whether anything has been written yet to place the separators correctly
+        first = True
+        # Write each question as one element of the JSON array
+        for entry in data:
+            # Open the array before the first element, otherwise separate from the previous one
+            file.write("[\n" if first else ",\n")
+            first = False
+            # Serialize the question with the same indentation json.dump would use inside a list
+            # ensure_ascii=False allows non-ASCII characters (e.g., special characters) to be written correctly
+            element = json.dumps(entry, indent=4, ensure_ascii=False)
+            file.write("\n".join("    " + line for line in element.splitlines()))
+        # Close the array (or write an empty one when no questions were parsed)
+        file.write("[]" if first else "\n]")
+
+
+def answer_indices(answer):
+    """Map answer letters (e.g., "AC") to 0-based option indices (A=0, B=1, ..., Z=25)."""
+    # A missing answer has no indices
+    if not answer:
+        return []
+    # Keep each letter once, in alphabetical order
+    return sorted({ord(letter) - ord("A") for letter in answer})
+
+
+def entry_fields(entry):
+    """Return (question, options, correct indices, explanation) for one parsed question."""
+    # Replace any newlines in the question text with spaces to ensure a single-line question
+    question = entry["question_text"].strip().replace("\n", " ")
+    # Create a list of option texts in alphabetical order of their letters
+    options_dict = entry["options"]
+    options_list = [options_dict[k] for k in sorted(options_dict)]
+    # Return the fields every output format needs
+    return question, options_list, answer_indices(entry.get("answer")), entry.get("explanation")
 
 
 def save_to_csv(data, output_path):
     """Save parsed questions data to a CSV file."""
     # Open the output file in write mode with UTF-8 encoding and no extra newlines
     with open(output_path, "w", newline="", encoding="utf-8") as csvfile:
-        # Define the CSV column headers
-        fieldnames = ["question", "options", "correct"]
+        # Define the CSV column headers (the explanation column is optional for the importer)
+        fieldnames = ["question", "options", "correct", "explanation"]
         # Create a CSV writer object with quoting for all fields
         writer = csv.DictWriter(csvfile, fieldnames=fieldnames, quoting=csv.QUOTE_ALL)
 
@@ -133,54 +450,113 @@ def save_to_csv(data, output_path):
         writer.writeheader()
         # Iterate over each parsed question entry
         for entry in data:
-            # Extract and clean the question text
-            question = entry["question_text"].strip()
-            # Replace any newlines in the question text with spaces to ensure a single-line question
-            question = question.replace("\n", " ")
-
-            # Get the options dictionary and sort the keys (e.g., ["A", "B", "C", ...])
-            options_dict = entry["options"]
-            sorted_keys = sorted(options_dict.keys())  # Ensures options are in alphabetical order
-            # Create a list of option texts in sorted order
-            options_list = [options_dict[k] for k in sorted_keys]
-
-            # Get the correct answer letter (e.g., "A")
-            correct_letter = entry.get("answer")
-            # Create a mapping of option letters to 0-based indices (A=0, B=1, ..., Z=25)
-            option_index_map = {chr(65 + i): i for i in range(26)}
-            # Initialize the correct index as None
-            correct_index = None
-            # If the correct letter exists in the map, assign its index
-            if correct_letter in option_index_map:
-                correct_index = option_index_map[correct_letter]
-
+            # Collect the fields of the question
+            question, options_list, correct_indices, explanation = entry_fields(entry)
             # Write the question data as a row in the CSV
             writer.writerow({
                 "question": question,  # Write the question text (now without newlines)
                 "options": json.dumps(options_list, ensure_ascii=False),  # Write options as a JSON-encoded list
-                "correct": str(correct_index) if correct_index is not None else ""  # Write the correct index as a string, or "" if None
+                "correct": ",".join(map(str, correct_indices)),  # Write the correct indices (e.g., "0,2"), or "" if None
+                "explanation": explanation or ""  # Write the explanation, or "" if None
             })
 
 
+def load_bank_writer():
+    """Import QuestionBank, which writes compiled banks, from the mock_exam_simulator package."""
+    try:
+        from mock_exam_simulator.core.question_bank import QuestionBank
+    except ImportError:
+        # Fall back to the repository checkout this script lives in
+        sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        from mock_exam_simulator.core.question_bank import QuestionBank
+    return QuestionBank
+
+
+def save_to_bank(data, output_path):
+    """Save parsed questions straight to a compiled question bank, skipping the CSV round-trip.
+
+    Questions the importer would reject (no options, no answer, or an answer letter without a
+    matching option) are left out. Returns the number of questions skipped.
+    """
+    # Load the writer before parsing so a missing package fails fast
+    QuestionBank = load_bank_writer()
+    from mock_exam_simulator.models.question import Question
+    # Questions accepted into the bank
+    questions = []
+    # Number of questions left out
+    skipped = 0
+    for entry in data:
+        # Collect the fields of the question
+        question, options_list, correct_indices, explanation = entry_fields(entry)
+        # Apply the same checks the CSV importer applies to each row
+        if not options_list or not correct_indices or correct_indices[-1] >= len(options_list) \
+                or len(correct_indices) > 6:
+            skipped += 1
+            continue
+        questions.append(Question(
+            text=question,
+            options=options_list,
+            correct_indices=correct_indices,
+            is_multiple_choice=len(correct_indices) > 1,
+            explanation=explanation or None
+        ))
+    # Write the whole bank in one go, with its search index alongside
+    bank = QuestionBank()
+    bank.replace(questions)
+    bank.save_compiled(output_path)
+    return skipped
+
+
+class CountingIterator:
+    """Wrap an iterator and count the items that pass through it."""
+
+    def __init__(self, iterable):
+        # Keep the underlying iterator
+        self.iterator = iter(iterable)
+        # Number of items produced so far
+        self.count = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        # Fetch the next item (StopIteration ends the loop as usual)
+        item = next(self.iterator)
+        # Count it before handing it on
+        self.count += 1
+        return item
+
+
 def main():
     """Main function to orchestrate parsing and saving exam questions."""
-    # Check if the correct number of command-line arguments is provided
-    if len(sys.argv) != 4:
-        # Print usage instructions and exit with an error code
-        print("Usage: python3 parse_dumpspanda_pdf.py <path_to_dumps_pdf> <path_to_output_file> <json|csv>")
-        sys.exit(1)
+    # Define the command-line arguments
+    parser = argparse.ArgumentParser(description="Parse a DumpsPanda PDF into a JSON, CSV or compiled question bank.")
+    parser.add_argument("pdf_path", help="path to the DumpsPanda PDF")
+    parser.add_argument("output_path", help="path to the output file")
+    parser.add_argument("output_format", help="json, csv or bank (compiled bank the app imports directly)")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="number of processes used to extract page text (default: 1)")
+    parser.add_argument("--cache", help="ingestion cache file; pages unchanged since the last run "
+                                        "are read from it instead of being extracted again")
+    args = parser.parse_args()
 
     # Get the absolute path of the input PDF file from command-line arguments
-    dumps_panda_path = os.path.abspath(sys.argv[1])
+    dumps_panda_path = os.path.abspath(args.pdf_path)
     # Get the absolute path of the output file
-    output_path = os.path.abspath(sys.argv[2])
+    output_path = os.path.abspath(args.output_path)
     # Get the output format ("json" or "csv") and convert to lowercase
-    output_format = sys.argv[3].lower()
+    output_format = args.output_format.lower()
+
+    # Validate the number of extraction jobs
+    if args.jobs < 1:
+        # Print an error message and exit if the job count is invalid
+        print("Error: --jobs must be at least 1.")
+        sys.exit(1)
 
     # Validate the output format
-    if output_format not in ("json", "csv"):
+    if output_format not in ("json", "csv", "bank"):
         # Print an error message and exit if the format is invalid
-        print("Error: Output format must be 'json' or 'csv'.")
+        print("Error: Output format must be 'json', 'csv' or 'bank'.")
         sys.exit(1)
 
     # Check if the input PDF file exists
@@ -196,19 +572,31 @@ def main():
         os.makedirs(output_dir)
 
     try:
-        # Parse the full text from the PDF, cleaning unwanted patterns
-        full_text = parse_pdf_full_text(dumps_panda_path)
-        # Parse the questions, options, answers, and explanations from the cleaned text
-        questions = parse_exam_questions(full_text)
+        if args.cache:
+            # Reuse the text of unchanged pages and extract only the pages that differ from the last run
+            cache_stats = CacheStats()
+            pages = cached_page_texts(dumps_panda_path, os.path.abspath(args.cache), args.jobs, cache_stats)
+            questions = CountingIterator(iter_page_questions(text for _, text in pages))
+        else:
+            # Stream the questions, options, answers, and explanations out of the PDF page by page
+            questions = CountingIterator(iter_exam_questions(dumps_panda_path, args.jobs))
 
         # Save the parsed questions based on the specified output format
         if output_format == "json":
             save_to_json(questions, output_path)
-        else:
+        elif output_format == "csv":
             save_to_csv(questions, output_path)
-
+        else:
+            skipped = save_to_bank(questions, output_path)
+            # Report the questions the bank could not take
+            if skipped:
+                print(f"Skipped {skipped} questions without options or a valid answer.")
+
+        if args.cache:
+            # Report how much of the extraction the cache saved
+            print(f"Reused {cache_stats.reused} of {cache_stats.pages} pages from the cache.")
         # Print a success message with the number of questions parsed and the output file path
-        print(f"Parsed {len(questions)} questions. Output written to {output_path}")
+        print(f"Parsed {questions.count} questions. Output written to {output_path}")
     except FileNotFoundError as error:
         # Handle file not found errors (e.g., if the PDF file cannot be accessed)
         print(f"Error: {error}")